@@ -363,6 +363,7 @@ const dispatcherFunction = new lambda.Function(stack, 'DispatcherFunction', {
     DYNAMODB_TABLE_NAME: eventsTable.tableName,
     SECRET_ARN: apiSecret.secretArn,
     MAX_EVENTS_PER_RUN: '100',
+    AWS_XRAY_CONTEXT_MISSING: 'IGNORE_ERROR',
   },
 });
 
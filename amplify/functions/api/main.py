@@ -3,31 +3,40 @@ Zapier Triggers API - FastAPI Backend
 Endpoints: POST /events, GET /inbox, POST /inbox/{id}/ack
 Includes JWT Bearer token authentication for API security.
 """
-from fastapi import FastAPI, HTTPException, status, Depends, Request
+from fastapi import FastAPI, HTTPException, status, Depends, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi.responses import StreamingResponse, JSONResponse
 from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
-from datetime import datetime, timedelta
+from typing import Optional, List, Dict, Any, Iterator, Tuple
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 import os
 import uuid
+import math
+from array import array
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 import json
+import threading
 import time
+import random
 import hmac
 import hashlib
 import csv
 import io
+import orjson
 import boto3
 from boto3.dynamodb.conditions import Key, Attr
 from botocore.exceptions import ClientError
 
 # AWS X-Ray instrumentation
-from aws_xray_sdk.core import xray_recorder, patch_all
+from aws_xray_sdk.core import patch
 
-# Patch all AWS SDK calls for automatic tracing
-patch_all()
+# Trace AWS SDK calls. boto3 is the only instrumented library the API uses,
+# so only botocore is patched rather than importing and patching every
+# library patch_all() supports at cold start.
+patch(('botocore',))
 
 # Import authentication utilities
 import auth
@@ -42,6 +51,8 @@ from auth import (
 dynamodb = boto3.resource('dynamodb', region_name=os.environ.get('AWS_REGION', 'us-east-2'))
 table_name = os.environ.get('DYNAMODB_TABLE_NAME', 'zapier-triggers-events')
 table = dynamodb.Table(table_name)
+# Events expire 90 days after creation (GDPR/CCPA retention)
+EVENT_TTL_SECONDS = 90 * 24 * 60 * 60
 
 # Initialize Secrets Manager client
 secrets_client = boto3.client('secretsmanager', region_name=os.environ.get('AWS_REGION', 'us-east-2'))
@@ -52,12 +63,17 @@ cloudwatch_client = boto3.client('cloudwatch', region_name=os.environ.get('AWS_R
 CLOUDWATCH_NAMESPACE = 'ZapierTriggersAPI'
 
 # Global cache for secrets (Lambda container reuse optimization)
-_secrets_cache: Dict[str, Any] = {}
+# Entries expire so rotated secrets are picked up by warm containers
+SECRETS_CACHE_TTL_SECONDS = int(os.environ.get('SECRETS_CACHE_TTL_SECONDS', 300))
+_secrets_cache: Dict[str, Dict[str, Any]] = {}
 
 def get_secret(secret_id: str) -> Dict[str, Any]:
     """
     Retrieve a secret from AWS Secrets Manager with caching.
 
+    Cached values are reused for SECRETS_CACHE_TTL_SECONDS (default 300s)
+    before Secrets Manager is called again.
+
     Args:
         secret_id: The ARN or name of the secret
 
@@ -67,9 +83,11 @@ def get_secret(secret_id: str) -> Dict[str, Any]:
     Raises:
         HTTPException: If secret retrieval fails
     """
-    # Return cached value if available
-    if secret_id in _secrets_cache:
-        return _secrets_cache[secret_id]
+    # Return cached value if available and not expired
+    now = time.time()
+    cached = _secrets_cache.get(secret_id)
+    if cached and now - cached["timestamp"] < SECRETS_CACHE_TTL_SECONDS:
+        return cached["data"]
 
     try:
         response = secrets_client.get_secret_value(SecretId=secret_id)
@@ -82,7 +100,10 @@ def get_secret(secret_id: str) -> Dict[str, Any]:
             secret_data = response['SecretBinary']
 
         # Cache the secret for future requests in this Lambda container
-        _secrets_cache[secret_id] = secret_data
+        _secrets_cache[secret_id] = {
+            "data": secret_data,
+            "timestamp": now
+        }
         return secret_data
 
     except ClientError as e:
@@ -273,7 +294,7 @@ def publish_request_metrics(endpoint: str, method: str, status_code: int, durati
     """
     try:
         metric_data = []
-        timestamp = datetime.utcnow()
+        timestamp = datetime.now(timezone.utc)
 
         # Common dimensions for all metrics
         dimensions = [
@@ -456,6 +477,36 @@ class InboxEvent(BaseModel):
             }
         }
 
+class AckRequest(BaseModel):
+    """Optional acknowledgment body sent by the dispatcher"""
+    attempts: int = 1
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "attempts": 2
+            }
+        }
+
+class BatchAckItem(BaseModel):
+    """One event in a batch acknowledgment"""
+    id: str
+    attempts: int = 1
+
+class BatchAckRequest(BaseModel):
+    """Batch acknowledgment request model"""
+    acks: List[BatchAckItem]
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "acks": [
+                    {"id": "550e8400-e29b-41d4-a716-446655440000", "attempts": 1},
+                    {"id": "550e8400-e29b-41d4-a716-446655440001", "attempts": 3}
+                ]
+            }
+        }
+
 
 class EventSummary(BaseModel):
     """Summary metrics for event monitoring dashboard"""
@@ -531,6 +582,45 @@ class ErrorMetrics(BaseModel):
         }
 
 
+class AllMetrics(BaseModel):
+    """Combined dashboard metrics computed from a single table scan"""
+    summary: EventSummary
+    latency: LatencyMetrics
+    throughput: ThroughputMetrics
+    errors: ErrorMetrics
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "summary": {
+                    "total": 1247,
+                    "pending": 23,
+                    "delivered": 1198,
+                    "failed": 26,
+                    "success_rate": 97.91
+                },
+                "latency": {
+                    "p50": 1.23,
+                    "p95": 3.45,
+                    "p99": 5.67,
+                    "sample_size": 1150
+                },
+                "throughput": {
+                    "events_per_minute": 2.5,
+                    "events_per_hour": 150.0,
+                    "total_events_24h": 3600,
+                    "time_range": "last_24_hours"
+                },
+                "errors": {
+                    "total_errors": 26,
+                    "error_rate": 2.09,
+                    "failed_deliveries": 26,
+                    "pending_retries": 5
+                }
+            }
+        }
+
+
 class WebhookLog(BaseModel):
     """Webhook log entry for receiver UI"""
     id: str
@@ -555,9 +645,35 @@ class WebhookLog(BaseModel):
         }
 
 
+# Scan parameters shared by the metrics endpoints, built once at import.
+# Treat as read-only: boto3 deep-copies DynamoDB request parameters before
+# serializing them, so passing the same objects on every call is safe.
+_STATUS_PROJECTION = "id, #status"
+_TIMESTAMPS_PROJECTION = "id, #status, created_at, updated_at"
+_CREATED_AT_PROJECTION = "id, created_at"
+_STATUS_NAMES = {"#status": "status"}
+_COMPLETED_FILTER = Attr("status").is_in(["delivered", "failed"])
+
 # In-memory cache for metrics with TTL
 metrics_cache: Dict[str, Dict[str, Any]] = {}
-CACHE_TTL_SECONDS = 30  # Cache metrics for 30 seconds
+
+
+def _load_cache_ttls(environ) -> Dict[str, int]:
+    """
+    Build the per-endpoint metrics cache TTLs from environment variables.
+
+    METRICS_CACHE_TTL_SECONDS sets the default and METRICS_TTL_<ENDPOINT>
+    overrides it for one endpoint, e.g. METRICS_TTL_LATENCY=60.
+    """
+    # Default TTL trades a few seconds of staleness for far fewer table scans
+    default_ttl = int(environ.get('METRICS_CACHE_TTL_SECONDS', 10))
+    return {
+        name: int(environ.get(f'METRICS_TTL_{name.upper()}', default_ttl))
+        for name in ("summary", "latency", "throughput", "errors", "all")
+    }
+
+
+METRICS_CACHE_TTLS: Dict[str, int] = _load_cache_ttls(os.environ)
 
 # In-memory cache for webhook logs (simulating CloudWatch logs for MVP)
 # In production, query CloudWatch Logs or store in DynamoDB
@@ -792,10 +908,11 @@ async def create_event(
     """
     # Generate unique event ID
     event_id = str(uuid.uuid4())
-    timestamp = datetime.utcnow().isoformat() + "Z"
+    now = time.time()
+    timestamp = datetime.fromtimestamp(now, tz=timezone.utc).isoformat().replace('+00:00', 'Z')
 
     # Calculate TTL for GDPR/CCPA compliance (90 days from now)
-    ttl_timestamp = int((datetime.utcnow() + timedelta(days=90)).timestamp())
+    ttl_timestamp = int(now) + EVENT_TTL_SECONDS
 
     # Store event in DynamoDB
     event_data = {
@@ -831,7 +948,7 @@ async def create_event(
                     'MetricName': 'EventsCreated',
                     'Value': 1,
                     'Unit': 'Count',
-                    'Timestamp': datetime.utcnow(),
+                    'Timestamp': datetime.now(timezone.utc),
                     'Dimensions': [
                         {'Name': 'EventType', 'Value': event.type},
                         {'Name': 'Source', 'Value': event.source}
@@ -849,12 +966,298 @@ async def create_event(
         timestamp=timestamp
     )
 
+# Metrics computation helpers
+# Scan pages are folded into running aggregates one page at a time, so memory
+# stays bounded by the page size (plus a fixed-size latency sample) rather
+# than the table size. The individual endpoints and GET /metrics/all share
+# the same aggregation and computation logic.
+LATENCY_SAMPLE_SIZE = 10000  # Reservoir size for latency percentiles
+
+# Tables larger than one scan page are read as a parallel scan, one segment
+# per MB of table data, capped at METRICS_SCAN_MAX_SEGMENTS
+METRICS_SCAN_MAX_SEGMENTS = int(os.environ.get('METRICS_SCAN_MAX_SEGMENTS', 16))
+# DynamoDB only refreshes TableSizeBytes about every six hours
+SCAN_SEGMENTS_TTL_SECONDS = 3600
+_scan_segments_cache: Dict[str, Any] = {"segments": 1, "timestamp": 0.0}
+_scan_executor = ThreadPoolExecutor(max_workers=METRICS_SCAN_MAX_SEGMENTS, thread_name_prefix="metrics-scan")
+# boto3 resources are not thread-safe, so each scan worker builds its own
+# from its own session
+_scan_local = threading.local()
+
+
+def _scan_segment_count() -> int:
+    """Return the number of parallel scan segments for the events table's current size."""
+    now = time.time()
+    if now - _scan_segments_cache["timestamp"] < SCAN_SEGMENTS_TTL_SECONDS:
+        return _scan_segments_cache["segments"]
+
+    try:
+        size_bytes = dynamodb.meta.client.describe_table(TableName=table_name)["Table"]["TableSizeBytes"]
+        segments = max(1, min(METRICS_SCAN_MAX_SEGMENTS, math.ceil(size_bytes / 1_048_576)))
+    except Exception as e:
+        # Fall back to a sequential scan if the table size is unavailable
+        print(f"[WARNING] Failed to read table size: {str(e)}")
+        segments = 1
+
+    _scan_segments_cache.update(segments=segments, timestamp=now)
+    return segments
+
+
+def _segment_table():
+    """Return the calling scan worker's own handle on the events table."""
+    if not hasattr(_scan_local, "table"):
+        session = boto3.session.Session()
+        resource = session.resource('dynamodb', region_name=os.environ.get('AWS_REGION', 'us-east-2'))
+        _scan_local.table = resource.Table(table_name)
+    return _scan_local.table
+
+
+def _scan_segment_page(scan_kwargs: Dict[str, Any], segment: int, total_segments: int,
+                       start_key: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Fetch one page of one parallel scan segment.
+
+    Runs on a scan worker thread, so it reads through that thread's own
+    table resource rather than the module-level one.
+    """
+    kwargs = {**scan_kwargs, "Segment": segment, "TotalSegments": total_segments}
+    if start_key:
+        kwargs["ExclusiveStartKey"] = start_key
+    return _segment_table().scan(**kwargs)
+
+
+def _scan_pages(**scan_kwargs) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Scan the events table, yielding the items of each page as it arrives.
+
+    Large tables are scanned in parallel segments: each round fetches the
+    next page of every unfinished segment concurrently, so at most one page
+    per segment is held in memory at a time.
+    """
+    total_segments = _scan_segment_count()
+
+    if total_segments == 1:
+        response = table.scan(**scan_kwargs)
+        yield response.get("Items", [])
+
+        # Handle pagination if more than 1MB of data
+        while "LastEvaluatedKey" in response:
+            response = table.scan(
+                **scan_kwargs,
+                ExclusiveStartKey=response["LastEvaluatedKey"]
+            )
+            yield response.get("Items", [])
+        return
+
+    start_keys: Dict[int, Optional[Dict[str, Any]]] = dict.fromkeys(range(total_segments))
+    while start_keys:
+        futures = {
+            segment: _scan_executor.submit(_scan_segment_page, scan_kwargs, segment, total_segments, start_key)
+            for segment, start_key in start_keys.items()
+        }
+        for segment, future in futures.items():
+            response = future.result()
+            yield response.get("Items", [])
+            if "LastEvaluatedKey" in response:
+                start_keys[segment] = response["LastEvaluatedKey"]
+            else:
+                del start_keys[segment]
+
+
+def _iso_to_epoch(timestamp: str) -> float:
+    """
+    Convert a stored ISO 8601 timestamp to epoch seconds.
+
+    Timestamps without an offset are treated as UTC, matching how they are
+    written.
+
+    Raises:
+        ValueError: If the timestamp is not valid ISO 8601
+    """
+    parsed = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class _MetricsAccumulator:
+    """Running aggregates over scanned events, updated page by page."""
+
+    def __init__(self, cutoff_iso: str = ""):
+        self.cutoff_iso = cutoff_iso
+        self.total = 0
+        self.status_counts: Counter = Counter()
+        self.recent_events = 0
+        self.latency_count = 0
+        # Packed doubles: 8 bytes per sample instead of a boxed float each
+        self.latency_sample = array('d')
+
+    def add_page(self, items: List[Dict[str, Any]]) -> None:
+        """Fold one page of scanned items into the aggregates."""
+        self.total += len(items)
+        self.status_counts.update(item.get("status") for item in items)
+
+        for item in items:
+            if item.get("created_at", "") >= self.cutoff_iso:
+                self.recent_events += 1
+
+            if item.get("status") not in ("delivered", "failed"):
+                continue
+            try:
+                latency = _iso_to_epoch(item["updated_at"]) - _iso_to_epoch(item["created_at"])
+            except (KeyError, ValueError):
+                # Skip events with missing or invalid timestamps
+                continue
+            self._add_latency(latency)
+
+    def _add_latency(self, latency: float) -> None:
+        """Keep a uniform fixed-size sample of latencies (reservoir sampling)."""
+        self.latency_count += 1
+        if len(self.latency_sample) < LATENCY_SAMPLE_SIZE:
+            self.latency_sample.append(latency)
+            return
+
+        slot = random.randrange(self.latency_count)
+        if slot < LATENCY_SAMPLE_SIZE:
+            self.latency_sample[slot] = latency
+
+
+def _scan_metrics(cutoff_iso: str = "", **scan_kwargs) -> _MetricsAccumulator:
+    """Scan the events table and aggregate each page as it is received."""
+    aggregates = _MetricsAccumulator(cutoff_iso)
+    for items in _scan_pages(**scan_kwargs):
+        aggregates.add_page(items)
+    return aggregates
+
+
+def _compute_summary(aggregates: _MetricsAccumulator) -> EventSummary:
+    """Derive event counts by status and the delivery success rate."""
+    counts = aggregates.status_counts
+    pending = counts["pending"]
+    delivered = counts["delivered"]
+    failed = counts["failed"]
+
+    # Calculate success rate
+    completed = delivered + failed
+    success_rate = (delivered / completed * 100) if completed > 0 else 0.0
+
+    return EventSummary(
+        total=aggregates.total,
+        pending=pending,
+        delivered=delivered,
+        failed=failed,
+        success_rate=round(success_rate, 2)
+    )
+
+
+def _compute_latency(aggregates: _MetricsAccumulator) -> LatencyMetrics:
+    """Compute P50/P95/P99 processing latency (seconds) for completed events."""
+    latencies = sorted(aggregates.latency_sample)
+
+    if not latencies:
+        # No completed events yet
+        return LatencyMetrics(p50=0.0, p95=0.0, p99=0.0, sample_size=0)
+
+    n = len(latencies)
+    p50_idx = int(n * 0.50)
+    p95_idx = int(n * 0.95)
+    p99_idx = int(n * 0.99)
+
+    return LatencyMetrics(
+        p50=round(latencies[p50_idx] if p50_idx < n else latencies[-1], 2),
+        p95=round(latencies[p95_idx] if p95_idx < n else latencies[-1], 2),
+        p99=round(latencies[p99_idx] if p99_idx < n else latencies[-1], 2),
+        sample_size=aggregates.latency_count
+    )
+
+
+def _compute_throughput(aggregates: _MetricsAccumulator) -> ThroughputMetrics:
+    """Compute event rates for events created at or after the cutoff (last 24h)."""
+    total_events = aggregates.recent_events
+
+    # Calculate rates
+    # 24 hours = 1440 minutes
+    events_per_minute = round(total_events / 1440.0, 2) if total_events > 0 else 0.0
+    events_per_hour = round(total_events / 24.0, 2) if total_events > 0 else 0.0
+
+    return ThroughputMetrics(
+        events_per_minute=events_per_minute,
+        events_per_hour=events_per_hour,
+        total_events_24h=total_events,
+        time_range="last_24_hours"
+    )
+
+
+def _compute_errors(aggregates: _MetricsAccumulator) -> ErrorMetrics:
+    """Compute failure counts and the error rate over completed events."""
+    counts = aggregates.status_counts
+    failed = counts["failed"]
+    delivered = counts["delivered"]
+    pending = counts["pending"]
+
+    # Calculate error rate
+    completed = delivered + failed
+    error_rate = (failed / completed * 100) if completed > 0 else 0.0
+
+    return ErrorMetrics(
+        total_errors=failed,
+        error_rate=round(error_rate, 2),
+        failed_deliveries=failed,
+        pending_retries=pending
+    )
+
+
+def _get_cached_metrics(cache_key: str, now: float) -> Optional[Dict[str, Any]]:
+    """Return the cache entry for cache_key if it is younger than its TTL."""
+    cached_data = metrics_cache.get(cache_key)
+    if cached_data and now - cached_data["timestamp"] < cached_data["ttl"]:
+        return cached_data
+    return None
+
+
+def _metrics_cache_entry(cache_key: str, result: BaseModel, now: float) -> Dict[str, Any]:
+    """Build a metrics cache entry holding the serialized body and its ETag."""
+    body = orjson.dumps(result.model_dump())
+    return {
+        "data": result,
+        "body": body,
+        "etag": f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"',
+        "timestamp": now,
+        "ttl": METRICS_CACHE_TTLS[cache_key]
+    }
+
+
+def _metrics_response(request: Request, entry: Dict[str, Any]) -> Response:
+    """
+    Serve a metrics cache entry with ETag and Cache-Control headers.
+
+    Returns 304 Not Modified without a body when the client's If-None-Match
+    header already carries the current ETag.
+    """
+    max_age = max(0, int(entry["ttl"] - (time.time() - entry["timestamp"])))
+    headers = {
+        "ETag": entry["etag"],
+        "Cache-Control": f"private, max-age={max_age}"
+    }
+
+    if_none_match = request.headers.get("If-None-Match", "")
+    if entry["etag"] in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=entry["body"], media_type="application/json", headers=headers)
+
+
+def _throughput_cutoff_iso() -> str:
+    """Return the ISO 8601 timestamp 24 hours before now."""
+    return (datetime.now(timezone.utc) - timedelta(hours=24)).isoformat().replace('+00:00', 'Z')
+
+
 # GET /metrics/summary - Get event summary metrics (protected endpoint)
 @app.get("/metrics/summary", response_model=EventSummary,
          tags=["Metrics"],
          summary="Get Event Summary Metrics",
          response_description="Summary of event counts and success rate")
-async def get_metrics_summary(current_user: User = Depends(get_authenticated_user)):
+async def get_metrics_summary(request: Request, current_user: User = Depends(get_authenticated_user)):
     """
     ## Get Event Summary Metrics
 
@@ -866,7 +1269,10 @@ async def get_metrics_summary(current_user: User = Depends(get_authenticated_use
     - **success_rate**: Percentage of successful deliveries (delivered / (delivered + failed))
 
     ### Caching
-    Results are cached for 30 seconds to reduce database load.
+    Results are cached for 10 seconds by default to reduce database load
+    (configurable with `METRICS_CACHE_TTL_SECONDS`). Responses carry
+    an `ETag`; send it back in `If-None-Match` to receive `304 Not Modified`
+    while the data is unchanged.
 
     ### Example
     ```bash
@@ -889,56 +1295,25 @@ async def get_metrics_summary(current_user: User = Depends(get_authenticated_use
     cache_key = "summary"
     now = time.time()
 
-    if cache_key in metrics_cache:
-        cached_data = metrics_cache[cache_key]
-        if now - cached_data["timestamp"] < CACHE_TTL_SECONDS:
-            return cached_data["data"]
+    cached_data = _get_cached_metrics(cache_key, now)
+    if cached_data:
+        return _metrics_response(request, cached_data)
 
     try:
         # Scan table to count events by status
         # Note: This is a full table scan which is acceptable for MVP
         # For production at scale, consider using DynamoDB Streams + Lambda aggregator
-        response = table.scan(
-            ProjectionExpression="id, #status",
-            ExpressionAttributeNames={"#status": "status"}
+        aggregates = _scan_metrics(
+            ProjectionExpression=_STATUS_PROJECTION,
+            ExpressionAttributeNames=_STATUS_NAMES
         )
 
-        events = response.get("Items", [])
-
-        # Handle pagination if more than 1MB of data
-        while "LastEvaluatedKey" in response:
-            response = table.scan(
-                ProjectionExpression="id, #status",
-                ExpressionAttributeNames={"#status": "status"},
-                ExclusiveStartKey=response["LastEvaluatedKey"]
-            )
-            events.extend(response.get("Items", []))
-
-        # Count events by status
-        total = len(events)
-        pending = sum(1 for e in events if e.get("status") == "pending")
-        delivered = sum(1 for e in events if e.get("status") == "delivered")
-        failed = sum(1 for e in events if e.get("status") == "failed")
-
-        # Calculate success rate
-        completed = delivered + failed
-        success_rate = (delivered / completed * 100) if completed > 0 else 0.0
-
-        result = EventSummary(
-            total=total,
-            pending=pending,
-            delivered=delivered,
-            failed=failed,
-            success_rate=round(success_rate, 2)
-        )
+        result = _compute_summary(aggregates)
 
         # Update cache
-        metrics_cache[cache_key] = {
-            "data": result,
-            "timestamp": now
-        }
+        metrics_cache[cache_key] = _metrics_cache_entry(cache_key, result, now)
 
-        return result
+        return _metrics_response(request, metrics_cache[cache_key])
 
     except ClientError as e:
         print(f"DynamoDB error: {str(e)}")
@@ -953,7 +1328,7 @@ async def get_metrics_summary(current_user: User = Depends(get_authenticated_use
          tags=["Metrics"],
          summary="Get Event Processing Latency Metrics",
          response_description="Latency percentiles (P50, P95, P99) for completed events")
-async def get_metrics_latency(current_user: User = Depends(get_authenticated_user)):
+async def get_metrics_latency(request: Request, current_user: User = Depends(get_authenticated_user)):
     """
     ## Get Event Processing Latency Metrics
 
@@ -967,7 +1342,10 @@ async def get_metrics_latency(current_user: User = Depends(get_authenticated_use
     and final status update (`updated_at`) for delivered and failed events.
 
     ### Caching
-    Results are cached for 30 seconds to reduce database load.
+    Results are cached for 10 seconds by default to reduce database load
+    (configurable with `METRICS_CACHE_TTL_SECONDS`). Responses carry
+    an `ETag`; send it back in `If-None-Match` to receive `304 Not Modified`
+    while the data is unchanged.
 
     ### Example
     ```bash
@@ -989,68 +1367,24 @@ async def get_metrics_latency(current_user: User = Depends(get_authenticated_use
     cache_key = "latency"
     now = time.time()
 
-    if cache_key in metrics_cache:
-        cached_data = metrics_cache[cache_key]
-        if now - cached_data["timestamp"] < CACHE_TTL_SECONDS:
-            return cached_data["data"]
+    cached_data = _get_cached_metrics(cache_key, now)
+    if cached_data:
+        return _metrics_response(request, cached_data)
 
     try:
         # Scan for completed events (delivered or failed) with timestamps
-        response = table.scan(
-            ProjectionExpression="id, #status, created_at, updated_at",
-            FilterExpression=Attr("status").is_in(["delivered", "failed"]),
-            ExpressionAttributeNames={"#status": "status"}
+        aggregates = _scan_metrics(
+            ProjectionExpression=_TIMESTAMPS_PROJECTION,
+            FilterExpression=_COMPLETED_FILTER,
+            ExpressionAttributeNames=_STATUS_NAMES
         )
 
-        events = response.get("Items", [])
-
-        # Handle pagination
-        while "LastEvaluatedKey" in response:
-            response = table.scan(
-                ProjectionExpression="id, #status, created_at, updated_at",
-                FilterExpression=Attr("status").is_in(["delivered", "failed"]),
-                ExpressionAttributeNames={"#status": "status"},
-                ExclusiveStartKey=response["LastEvaluatedKey"]
-            )
-            events.extend(response.get("Items", []))
-
-        # Calculate latencies in seconds
-        latencies = []
-        for event in events:
-            try:
-                created = datetime.fromisoformat(event["created_at"].replace("Z", "+00:00"))
-                updated = datetime.fromisoformat(event["updated_at"].replace("Z", "+00:00"))
-                latency = (updated - created).total_seconds()
-                latencies.append(latency)
-            except (KeyError, ValueError):
-                # Skip events with missing or invalid timestamps
-                continue
-
-        # Calculate percentiles
-        if latencies:
-            latencies.sort()
-            n = len(latencies)
-            p50_idx = int(n * 0.50)
-            p95_idx = int(n * 0.95)
-            p99_idx = int(n * 0.99)
-
-            result = LatencyMetrics(
-                p50=round(latencies[p50_idx] if p50_idx < n else latencies[-1], 2),
-                p95=round(latencies[p95_idx] if p95_idx < n else latencies[-1], 2),
-                p99=round(latencies[p99_idx] if p99_idx < n else latencies[-1], 2),
-                sample_size=n
-            )
-        else:
-            # No completed events yet
-            result = LatencyMetrics(p50=0.0, p95=0.0, p99=0.0, sample_size=0)
+        result = _compute_latency(aggregates)
 
         # Update cache
-        metrics_cache[cache_key] = {
-            "data": result,
-            "timestamp": now
-        }
+        metrics_cache[cache_key] = _metrics_cache_entry(cache_key, result, now)
 
-        return result
+        return _metrics_response(request, metrics_cache[cache_key])
 
     except ClientError as e:
         print(f"DynamoDB error: {str(e)}")
@@ -1065,7 +1399,7 @@ async def get_metrics_latency(current_user: User = Depends(get_authenticated_use
          tags=["Metrics"],
          summary="Get Event Throughput Metrics",
          response_description="Event throughput rates over the last 24 hours")
-async def get_metrics_throughput(current_user: User = Depends(get_authenticated_user)):
+async def get_metrics_throughput(request: Request, current_user: User = Depends(get_authenticated_user)):
     """
     ## Get Event Throughput Metrics
 
@@ -1076,7 +1410,10 @@ async def get_metrics_throughput(current_user: User = Depends(get_authenticated_
     - **time_range**: Time range description
 
     ### Caching
-    Results are cached for 30 seconds to reduce database load.
+    Results are cached for 10 seconds by default to reduce database load
+    (configurable with `METRICS_CACHE_TTL_SECONDS`). Responses carry
+    an `ETag`; send it back in `If-None-Match` to receive `304 Not Modified`
+    while the data is unchanged.
 
     ### Example
     ```bash
@@ -1098,55 +1435,27 @@ async def get_metrics_throughput(current_user: User = Depends(get_authenticated_
     cache_key = "throughput"
     now_time = time.time()
 
-    if cache_key in metrics_cache:
-        cached_data = metrics_cache[cache_key]
-        if now_time - cached_data["timestamp"] < CACHE_TTL_SECONDS:
-            return cached_data["data"]
+    cached_data = _get_cached_metrics(cache_key, now_time)
+    if cached_data:
+        return _metrics_response(request, cached_data)
 
     try:
         # Calculate 24 hours ago timestamp
-        now = datetime.utcnow()
-        hours_24_ago = now - timedelta(hours=24)
-        cutoff_iso = hours_24_ago.isoformat() + "Z"
+        cutoff_iso = _throughput_cutoff_iso()
 
         # Scan for events created in the last 24 hours
-        response = table.scan(
-            ProjectionExpression="id, created_at",
+        aggregates = _scan_metrics(
+            cutoff_iso,
+            ProjectionExpression=_CREATED_AT_PROJECTION,
             FilterExpression=Attr("created_at").gte(cutoff_iso)
         )
 
-        events = response.get("Items", [])
-
-        # Handle pagination
-        while "LastEvaluatedKey" in response:
-            response = table.scan(
-                ProjectionExpression="id, created_at",
-                FilterExpression=Attr("created_at").gte(cutoff_iso),
-                ExclusiveStartKey=response["LastEvaluatedKey"]
-            )
-            events.extend(response.get("Items", []))
-
-        total_events = len(events)
-
-        # Calculate rates
-        # 24 hours = 1440 minutes
-        events_per_minute = round(total_events / 1440.0, 2) if total_events > 0 else 0.0
-        events_per_hour = round(total_events / 24.0, 2) if total_events > 0 else 0.0
-
-        result = ThroughputMetrics(
-            events_per_minute=events_per_minute,
-            events_per_hour=events_per_hour,
-            total_events_24h=total_events,
-            time_range="last_24_hours"
-        )
+        result = _compute_throughput(aggregates)
 
         # Update cache
-        metrics_cache[cache_key] = {
-            "data": result,
-            "timestamp": now_time
-        }
+        metrics_cache[cache_key] = _metrics_cache_entry(cache_key, result, now_time)
 
-        return result
+        return _metrics_response(request, metrics_cache[cache_key])
 
     except ClientError as e:
         print(f"DynamoDB error: {str(e)}")
@@ -1161,7 +1470,7 @@ async def get_metrics_throughput(current_user: User = Depends(get_authenticated_
          tags=["Metrics"],
          summary="Get Error Metrics",
          response_description="Error rates and failed delivery statistics")
-async def get_metrics_errors(current_user: User = Depends(get_authenticated_user)):
+async def get_metrics_errors(request: Request, current_user: User = Depends(get_authenticated_user)):
     """
     ## Get Error Metrics
 
@@ -1174,7 +1483,10 @@ async def get_metrics_errors(current_user: User = Depends(get_authenticated_user
     Error rate is calculated as: (failed / (delivered + failed)) * 100
 
     ### Caching
-    Results are cached for 30 seconds to reduce database load.
+    Results are cached for 10 seconds by default to reduce database load
+    (configurable with `METRICS_CACHE_TTL_SECONDS`). Responses carry
+    an `ETag`; send it back in `If-None-Match` to receive `304 Not Modified`
+    while the data is unchanged.
 
     ### Example
     ```bash
@@ -1196,58 +1508,102 @@ async def get_metrics_errors(current_user: User = Depends(get_authenticated_user
     cache_key = "errors"
     now = time.time()
 
-    if cache_key in metrics_cache:
-        cached_data = metrics_cache[cache_key]
-        if now - cached_data["timestamp"] < CACHE_TTL_SECONDS:
-            return cached_data["data"]
+    cached_data = _get_cached_metrics(cache_key, now)
+    if cached_data:
+        return _metrics_response(request, cached_data)
 
     try:
         # Scan table to count events by status
-        response = table.scan(
-            ProjectionExpression="id, #status",
-            ExpressionAttributeNames={"#status": "status"}
+        aggregates = _scan_metrics(
+            ProjectionExpression=_STATUS_PROJECTION,
+            ExpressionAttributeNames=_STATUS_NAMES
         )
 
-        events = response.get("Items", [])
+        result = _compute_errors(aggregates)
 
-        # Handle pagination
-        while "LastEvaluatedKey" in response:
-            response = table.scan(
-                ProjectionExpression="id, #status",
-                ExpressionAttributeNames={"#status": "status"},
-                ExclusiveStartKey=response["LastEvaluatedKey"]
-            )
-            events.extend(response.get("Items", []))
-
-        # Count by status
-        failed = sum(1 for e in events if e.get("status") == "failed")
-        delivered = sum(1 for e in events if e.get("status") == "delivered")
-        pending = sum(1 for e in events if e.get("status") == "pending")
-
-        # Calculate error rate
-        completed = delivered + failed
-        error_rate = (failed / completed * 100) if completed > 0 else 0.0
-
-        result = ErrorMetrics(
-            total_errors=failed,
-            error_rate=round(error_rate, 2),
-            failed_deliveries=failed,
-            pending_retries=pending
+        # Update cache
+        metrics_cache[cache_key] = _metrics_cache_entry(cache_key, result, now)
+
+        return _metrics_response(request, metrics_cache[cache_key])
+
+    except ClientError as e:
+        print(f"DynamoDB error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve error metrics: {str(e)}"
+        )
+
+
+# GET /metrics/all - Get all dashboard metrics in one scan (protected endpoint)
+@app.get("/metrics/all", response_model=AllMetrics,
+         tags=["Metrics"],
+         summary="Get All Dashboard Metrics",
+         response_description="Summary, latency, throughput and error metrics from a single scan")
+async def get_metrics_all(request: Request, current_user: User = Depends(get_authenticated_user)):
+    """
+    ## Get All Dashboard Metrics
+
+    Returns the summary, latency, throughput and error metrics in one response.
+    The four metric groups are computed from a single table scan instead of one
+    scan per endpoint, so dashboards should prefer this over calling
+    `/metrics/summary`, `/metrics/latency`, `/metrics/throughput` and
+    `/metrics/errors` individually.
+
+    ### Caching
+    Results are cached for 10 seconds by default to reduce database load
+    (configurable with `METRICS_CACHE_TTL_SECONDS`). Responses carry
+    an `ETag`; send it back in `If-None-Match` to receive `304 Not Modified`
+    while the data is unchanged.
+
+    ### Example
+    ```bash
+    curl -X GET "https://your-api-url/metrics/all" \\
+      -H "Authorization: Bearer YOUR_JWT_TOKEN"
+    ```
+
+    ### Response
+    ```json
+    {
+      "summary": {"total": 1247, "pending": 23, "delivered": 1198, "failed": 26, "success_rate": 97.91},
+      "latency": {"p50": 1.23, "p95": 3.45, "p99": 5.67, "sample_size": 1150},
+      "throughput": {"events_per_minute": 2.5, "events_per_hour": 150.0, "total_events_24h": 3600, "time_range": "last_24_hours"},
+      "errors": {"total_errors": 26, "error_rate": 2.09, "failed_deliveries": 26, "pending_retries": 5}
+    }
+    ```
+    """
+    # Check cache first
+    cache_key = "all"
+    now = time.time()
+
+    cached_data = _get_cached_metrics(cache_key, now)
+    if cached_data:
+        return _metrics_response(request, cached_data)
+
+    try:
+        # One scan projecting every attribute the four computations need
+        aggregates = _scan_metrics(
+            _throughput_cutoff_iso(),
+            ProjectionExpression=_TIMESTAMPS_PROJECTION,
+            ExpressionAttributeNames=_STATUS_NAMES
+        )
+
+        result = AllMetrics(
+            summary=_compute_summary(aggregates),
+            latency=_compute_latency(aggregates),
+            throughput=_compute_throughput(aggregates),
+            errors=_compute_errors(aggregates)
         )
 
         # Update cache
-        metrics_cache[cache_key] = {
-            "data": result,
-            "timestamp": now
-        }
+        metrics_cache[cache_key] = _metrics_cache_entry(cache_key, result, now)
 
-        return result
+        return _metrics_response(request, metrics_cache[cache_key])
 
     except ClientError as e:
         print(f"DynamoDB error: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to retrieve error metrics: {str(e)}"
+            detail=f"Failed to retrieve metrics: {str(e)}"
         )
 
 
@@ -1256,7 +1612,10 @@ async def get_metrics_errors(current_user: User = Depends(get_authenticated_user
          tags=["Inbox"],
          summary="Get Pending Events",
          response_description="List of pending events awaiting delivery")
-async def get_inbox(current_user: User = Depends(get_authenticated_user)):
+async def get_inbox(
+    limit: int = 100,
+    current_user: User = Depends(get_authenticated_user)
+):
     """
     ## Get Inbox Events
 
@@ -1266,9 +1625,13 @@ async def get_inbox(current_user: User = Depends(get_authenticated_user)):
 
     Requires JWT bearer token in Authorization header.
 
+    ### Query Parameters
+
+    - **limit** (optional): Maximum number of events to return (default: 100, max: 100)
+
     ### Response
 
-    Returns an array of pending events (max 100), sorted by creation time (newest first).
+    Returns an array of pending events (at most `limit`), sorted by creation time (newest first).
     Each event includes:
     - **id**: Unique event identifier
     - **type**: Event type
@@ -1286,13 +1649,20 @@ async def get_inbox(current_user: User = Depends(get_authenticated_user)):
     3. Processes events in Zapier workflows
     4. Acknowledges each event via `/inbox/{id}/ack`
     """
+    # Validate limit
+    if limit < 1 or limit > 100:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Limit must be between 1 and 100"
+        )
+
     try:
         # Query GSI for pending events
         response = table.query(
             IndexName='status-index',
             KeyConditionExpression=Key('status').eq('pending'),
             ScanIndexForward=False,  # Sort by created_at descending
-            Limit=100  # Limit to 100 events
+            Limit=limit
         )
 
         events = []
@@ -1318,6 +1688,97 @@ async def get_inbox(current_user: User = Depends(get_authenticated_user)):
             detail=f"Failed to retrieve inbox: {str(e)}"
         )
 
+
+def _mark_delivered(event_id: str, attempts: int, timestamp: str) -> Optional[Tuple[Dict[str, Any], int]]:
+    """
+    Mark an event as delivered and record its delivery tracking fields.
+
+    Args:
+        event_id: The event ID
+        attempts: Delivery attempts to add to delivery_attempts
+        timestamp: ISO 8601 acknowledgment timestamp
+
+    Returns:
+        Tuple of (event item, delivery latency in ms), or None if the event
+        does not exist
+    """
+    # First, get the item to find its created_at (sort key)
+    response = table.query(
+        KeyConditionExpression=Key('id').eq(event_id),
+        Limit=1
+    )
+
+    if not response.get('Items'):
+        return None
+
+    item = response['Items'][0]
+
+    # Calculate delivery latency (Task 22.3)
+    delivery_latency_ms = int((time.time() - _iso_to_epoch(item['created_at'])) * 1000)
+
+    # Update the event status with delivery tracking fields
+    table.update_item(
+        Key={
+            'id': event_id,
+            'created_at': item['created_at']
+        },
+        UpdateExpression="SET #status = :status, updated_at = :timestamp, last_delivery_attempt = :last_attempt, delivery_latency_ms = :latency, delivery_attempts = :attempts",
+        ExpressionAttributeNames={
+            '#status': 'status'
+        },
+        ExpressionAttributeValues={
+            ':status': 'delivered',
+            ':timestamp': timestamp,
+            ':last_attempt': timestamp,
+            ':latency': delivery_latency_ms,
+            ':attempts': item.get('delivery_attempts', 0) + attempts
+        }
+    )
+
+    return item, delivery_latency_ms
+
+
+def _delivery_metric_data(item: Dict[str, Any], delivery_latency_ms: int) -> List[Dict[str, Any]]:
+    """
+    Build the EventsDelivered and DeliveryLatency datums for one delivered event (Task 22.3).
+    """
+    dimensions = [
+        {'Name': 'EventType', 'Value': item.get('type', 'unknown')},
+        {'Name': 'Source', 'Value': item.get('source', 'unknown')}
+    ]
+    timestamp = datetime.now(timezone.utc)
+    return [
+        {
+            'MetricName': 'EventsDelivered',
+            'Value': 1,
+            'Unit': 'Count',
+            'Timestamp': timestamp,
+            'Dimensions': dimensions
+        },
+        {
+            'MetricName': 'DeliveryLatency',
+            'Value': delivery_latency_ms,
+            'Unit': 'Milliseconds',
+            'Timestamp': timestamp,
+            'Dimensions': dimensions
+        }
+    ]
+
+
+def _publish_delivery_metrics(metric_data: List[Dict[str, Any]]) -> None:
+    """
+    Publish delivery metrics to CloudWatch (best effort).
+    """
+    try:
+        cloudwatch_client.put_metric_data(
+            Namespace=CLOUDWATCH_NAMESPACE,
+            MetricData=metric_data
+        )
+    except Exception as metric_error:
+        # Don't fail the request if metrics fail (best effort)
+        print(f"[WARNING] Failed to publish delivery metrics: {str(metric_error)}")
+
+
 # POST /inbox/{event_id}/ack - Acknowledge event delivery (protected endpoint)
 @app.post("/inbox/{event_id}/ack",
           tags=["Inbox"],
@@ -1325,6 +1786,7 @@ async def get_inbox(current_user: User = Depends(get_authenticated_user)):
           response_description="Event acknowledged and marked as delivered")
 async def acknowledge_event(
     event_id: str,
+    ack: Optional[AckRequest] = None,
     current_user: User = Depends(get_authenticated_user)
 ):
     """
@@ -1340,6 +1802,12 @@ async def acknowledge_event(
 
     - **event_id**: The unique identifier (UUID) of the event to acknowledge
 
+    ### Request Body (optional)
+
+    - **attempts**: Delivery attempts made before this acknowledgment (default: 1).
+      The dispatcher sends this so the attempt count is recorded with the ack
+      instead of in a separate write.
+
     ### Response
 
     Returns confirmation with:
@@ -1359,77 +1827,28 @@ async def acknowledge_event(
 
     Returns 404 if event ID is not found.
     """
-    timestamp = datetime.utcnow().isoformat() + "Z"
+    attempts = ack.attempts if ack else 1
+    if attempts < 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Attempts must be at least 1"
+        )
+
+    timestamp = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
 
     try:
-        # First, get the item to find its created_at (sort key)
-        response = table.query(
-            KeyConditionExpression=Key('id').eq(event_id),
-            Limit=1
-        )
+        delivered = _mark_delivered(event_id, attempts, timestamp)
 
-        if not response.get('Items'):
+        if delivered is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Event with ID {event_id} not found"
             )
 
-        item = response['Items'][0]
-
-        # Calculate delivery latency (Task 22.3)
-        created_at = datetime.fromisoformat(item['created_at'].replace('Z', '+00:00'))
-        delivered_at = datetime.utcnow().replace(tzinfo=created_at.tzinfo)
-        delivery_latency_ms = int((delivered_at - created_at).total_seconds() * 1000)
-
-        # Update the event status with delivery tracking fields
-        table.update_item(
-            Key={
-                'id': event_id,
-                'created_at': item['created_at']
-            },
-            UpdateExpression="SET #status = :status, updated_at = :timestamp, last_delivery_attempt = :last_attempt, delivery_latency_ms = :latency, delivery_attempts = :attempts",
-            ExpressionAttributeNames={
-                '#status': 'status'
-            },
-            ExpressionAttributeValues={
-                ':status': 'delivered',
-                ':timestamp': timestamp,
-                ':last_attempt': timestamp,
-                ':latency': delivery_latency_ms,
-                ':attempts': item.get('delivery_attempts', 0) + 1
-            }
-        )
+        item, delivery_latency_ms = delivered
 
         # Publish EventsDelivered and DeliveryLatency metrics to CloudWatch (Task 22.3)
-        try:
-            cloudwatch_client.put_metric_data(
-                Namespace=CLOUDWATCH_NAMESPACE,
-                MetricData=[
-                    {
-                        'MetricName': 'EventsDelivered',
-                        'Value': 1,
-                        'Unit': 'Count',
-                        'Timestamp': datetime.utcnow(),
-                        'Dimensions': [
-                            {'Name': 'EventType', 'Value': item.get('type', 'unknown')},
-                            {'Name': 'Source', 'Value': item.get('source', 'unknown')}
-                        ]
-                    },
-                    {
-                        'MetricName': 'DeliveryLatency',
-                        'Value': delivery_latency_ms,
-                        'Unit': 'Milliseconds',
-                        'Timestamp': datetime.utcnow(),
-                        'Dimensions': [
-                            {'Name': 'EventType', 'Value': item.get('type', 'unknown')},
-                            {'Name': 'Source', 'Value': item.get('source', 'unknown')}
-                        ]
-                    }
-                ]
-            )
-        except Exception as metric_error:
-            # Don't fail the request if metrics fail (best effort)
-            print(f"[WARNING] Failed to publish delivery metrics: {str(metric_error)}")
+        _publish_delivery_metrics(_delivery_metric_data(item, delivery_latency_ms))
 
         return {
             "id": event_id,
@@ -1447,6 +1866,85 @@ async def acknowledge_event(
         )
 
 
+# POST /inbox/ack - Acknowledge a batch of event deliveries (protected endpoint)
+@app.post("/inbox/ack",
+          tags=["Inbox"],
+          summary="Acknowledge Event Deliveries in Batch",
+          response_description="IDs of acknowledged and failed events")
+async def acknowledge_events_batch(
+    batch: BatchAckRequest,
+    current_user: User = Depends(get_authenticated_user)
+):
+    """
+    ## Acknowledge Events in Batch
+
+    Marks up to 100 events as delivered in one request. The dispatcher uses
+    this instead of one `/inbox/{id}/ack` call per event.
+
+    ### Authentication
+
+    Requires JWT bearer token in Authorization header.
+
+    ### Request Body
+
+    - **acks**: List of `{"id": ..., "attempts": ...}` entries (1-100); `attempts`
+      defaults to 1
+
+    ### Response
+
+    - **acknowledged**: IDs marked as delivered
+    - **failed**: IDs that were not found or could not be updated
+    - **updated_at**: Timestamp of acknowledgment
+
+    ### Error Handling
+
+    Returns 400 if the batch is empty, larger than 100, or has an attempt
+    count below 1. Individual unknown IDs are reported in `failed` rather
+    than failing the whole batch.
+    """
+    if not 1 <= len(batch.acks) <= 100:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Batch must contain between 1 and 100 acknowledgments"
+        )
+    if any(ack.attempts < 1 for ack in batch.acks):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Attempts must be at least 1"
+        )
+
+    timestamp = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+    acknowledged = []
+    failed = []
+    metric_data = []
+
+    for ack in batch.acks:
+        try:
+            delivered = _mark_delivered(ack.id, ack.attempts, timestamp)
+        except Exception as e:
+            print(f"[WARNING] Failed to acknowledge event {ack.id}: {str(e)}")
+            delivered = None
+
+        if delivered is None:
+            failed.append(ack.id)
+            continue
+
+        item, delivery_latency_ms = delivered
+        acknowledged.append(ack.id)
+        metric_data.extend(_delivery_metric_data(item, delivery_latency_ms))
+
+    # One PutMetricData call for the whole batch (Task 22.3); 100 events
+    # produce at most 200 datums, within the 1000-per-call limit
+    if metric_data:
+        _publish_delivery_metrics(metric_data)
+
+    return {
+        "acknowledged": acknowledged,
+        "failed": failed,
+        "updated_at": timestamp
+    }
+
+
 # DELETE /events/{event_id} - Delete event for GDPR/CCPA compliance (protected endpoint)
 @app.delete("/events/{event_id}",
            tags=["Events"],
@@ -1503,7 +2001,7 @@ async def delete_event(
          -H "Authorization: Bearer {your_token}"
     ```
     """
-    timestamp = datetime.utcnow().isoformat() + "Z"
+    timestamp = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
 
     try:
         # First, query to get the item and verify it exists
@@ -1543,7 +2041,7 @@ async def delete_event(
                         'MetricName': 'EventDeletion',
                         'Value': 1,
                         'Unit': 'Count',
-                        'Timestamp': datetime.utcnow(),
+                        'Timestamp': datetime.now(timezone.utc),
                         'Dimensions': [
                             {'Name': 'EventType', 'Value': item.get('type', 'unknown')},
                             {'Name': 'Reason', 'Value': 'manual_deletion'}
@@ -1568,6 +2066,11 @@ async def delete_event(
             detail=f"Failed to delete event: {str(e)}"
         )
 
+# Webhook signatures are the lower-case hex of an HMAC-SHA256 digest
+_SIGNATURE_HEX_DIGITS = frozenset('0123456789abcdef')
+_SIGNATURE_LENGTH = 64
+
+
 # Helper function for HMAC signature validation
 def verify_webhook_signature(payload: bytes, signature: str, secret: str) -> bool:
     """
@@ -1584,15 +2087,16 @@ def verify_webhook_signature(payload: bytes, signature: str, secret: str) -> boo
     if not signature or not secret:
         return False
 
+    # Only the canonical form can match; this also rejects non-ASCII headers,
+    # which compare_digest can't take as str
+    if len(signature) != _SIGNATURE_LENGTH or not _SIGNATURE_HEX_DIGITS.issuperset(signature):
+        return False
+
     # Compute HMAC-SHA256 signature
-    expected_signature = hmac.new(
-        secret.encode('utf-8'),
-        payload,
-        hashlib.sha256
-    ).hexdigest()
+    expected_signature = hmac.digest(secret.encode('utf-8'), payload, 'sha256').hex()
 
-    # Constant-time comparison to prevent timing attacks
-    return hmac.compare_digest(signature, expected_signature)
+    # Constant-time comparison of the raw bytes to prevent timing attacks
+    return hmac.compare_digest(signature.encode('ascii'), expected_signature.encode('ascii'))
 
 
 # Dependency to validate webhook signature
@@ -1702,7 +2206,7 @@ async def receive_webhook(
     ```
     """
     # Extract metadata
-    timestamp = webhook_event.timestamp or datetime.utcnow().isoformat() + "Z"
+    timestamp = webhook_event.timestamp or datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
     event_id = webhook_event.event_id or "unknown"
     request_id = request.headers.get("X-Request-ID", "none")
     source_ip = request.client.host if request.client else "unknown"
@@ -1743,7 +2247,7 @@ async def receive_webhook(
                     'MetricName': 'WebhookReceived',
                     'Value': 1,
                     'Unit': 'Count',
-                    'Timestamp': datetime.utcnow(),
+                    'Timestamp': datetime.now(timezone.utc),
                     'Dimensions': [
                         {'Name': 'EventType', 'Value': webhook_event.event_type}
                     ]
@@ -1759,7 +2263,7 @@ async def receive_webhook(
         "status": "received",
         "message": "Webhook event received and logged successfully",
         "event_id": event_id,
-        "timestamp": datetime.utcnow().isoformat() + "Z"
+        "timestamp": datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
     }
 
 
@@ -1876,6 +2380,13 @@ async def get_webhook_logs(
     return result
 
 
+def _decimal_default(obj: Any) -> float:
+    """Serialize DynamoDB Decimal values as floats (orjson default hook)."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError
+
+
 # GET /events/export - Export event data for GDPR/CCPA compliance (protected endpoint)
 @app.get("/events/export",
          tags=["Compliance"],
@@ -2020,20 +2531,14 @@ async def export_events(
         # Generate appropriate response based on format
         if format == "json":
             # JSON export
-            # Convert Decimal types to float for JSON serialization
-            def decimal_default(obj):
-                if isinstance(obj, Decimal):
-                    return float(obj)
-                raise TypeError
-
-            json_data = json.dumps(events, default=decimal_default, indent=2)
+            json_data = orjson.dumps(events, default=_decimal_default, option=orjson.OPT_INDENT_2)
 
             # Create streaming response
             return StreamingResponse(
                 iter([json_data]),
                 media_type="application/json",
                 headers={
-                    "Content-Disposition": f"attachment; filename=events_export_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.json",
+                    "Content-Disposition": f"attachment; filename=events_export_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}.json",
                     "X-Total-Events": str(len(events))
                 }
             )
@@ -2051,12 +2556,6 @@ async def export_events(
 
             # Write data rows if events exist
             if events:
-                # Helper function to convert Decimal to float
-                def decimal_default(obj):
-                    if isinstance(obj, Decimal):
-                        return float(obj)
-                    raise TypeError
-
                 for event in events:
                     # Convert payload dict to JSON string for CSV
                     row = {
@@ -2066,7 +2565,7 @@ async def export_events(
                         'status': event.get('status', ''),
                         'created_at': event.get('created_at', ''),
                         'updated_at': event.get('updated_at', ''),
-                        'payload': json.dumps(event.get('payload', {}), default=decimal_default)
+                        'payload': orjson.dumps(event.get('payload', {}), default=_decimal_default).decode()
                     }
                     writer.writerow(row)
 
@@ -2078,7 +2577,7 @@ async def export_events(
                 iter([csv_data]),
                 media_type="text/csv",
                 headers={
-                    "Content-Disposition": f"attachment; filename=events_export_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.csv",
+                    "Content-Disposition": f"attachment; filename=events_export_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}.csv",
                     "X-Total-Events": str(len(events))
                 }
             )
@@ -8,6 +8,7 @@ import pytest
 from fastapi.testclient import TestClient
 from moto import mock_aws
 import boto3
+from boto3.dynamodb.conditions import Key
 from datetime import datetime
 from decimal import Decimal
 
@@ -107,6 +108,26 @@ def client(dynamodb_table, secrets_manager):
         yield test_client
 
 
+@pytest.fixture(scope='function')
+def auth_token(client):
+    """Get a valid JWT token for authenticated requests."""
+    response = client.post(
+        "/token",
+        data={
+            "username": "api",
+            "password": "test-api-key"
+        }
+    )
+    assert response.status_code == 200
+    return response.json()["access_token"]
+
+
+@pytest.fixture(scope='function')
+def auth_headers(auth_token):
+    """Create authorization headers with JWT token."""
+    return {"Authorization": f"Bearer {auth_token}"}
+
+
 class TestHealthEndpoints:
     """Tests for health check endpoints."""
 
@@ -146,6 +167,44 @@ class TestConfigEndpoint:
         assert "cache_hit" in data
 
 
+class TestSecretCache:
+    """Tests for the Secrets Manager cache TTL."""
+
+    def test_secret_cached_within_ttl(self, monkeypatch):
+        """Test repeated lookups reuse the cached secret."""
+        import main
+        from unittest.mock import patch
+
+        monkeypatch.setattr(main, '_secrets_cache', {})
+        with patch.object(main, 'secrets_client') as mock_secrets_client:
+            mock_secrets_client.get_secret_value.return_value = {
+                'SecretString': json.dumps({'environment': 'test'})
+            }
+            first = main.get_secret('test-secret-arn')
+            second = main.get_secret('test-secret-arn')
+
+        assert first == second == {'environment': 'test'}
+        mock_secrets_client.get_secret_value.assert_called_once_with(SecretId='test-secret-arn')
+
+    def test_secret_refetched_after_ttl(self, monkeypatch):
+        """Test an expired cache entry is refreshed from Secrets Manager."""
+        import main
+        from unittest.mock import patch
+
+        monkeypatch.setattr(main, '_secrets_cache', {})
+        monkeypatch.setattr(main, 'SECRETS_CACHE_TTL_SECONDS', 0)
+        with patch.object(main, 'secrets_client') as mock_secrets_client:
+            mock_secrets_client.get_secret_value.side_effect = [
+                {'SecretString': json.dumps({'environment': 'test'})},
+                {'SecretString': json.dumps({'environment': 'rotated'})}
+            ]
+            main.get_secret('test-secret-arn')
+            refreshed = main.get_secret('test-secret-arn')
+
+        assert refreshed == {'environment': 'rotated'}
+        assert mock_secrets_client.get_secret_value.call_count == 2
+
+
 class TestEventsEndpoint:
     """Tests for POST /events endpoint."""
 
@@ -288,6 +347,26 @@ class TestInboxEndpoint:
         timestamps = [event["created_at"] for event in events]
         assert timestamps == sorted(timestamps, reverse=True)
 
+    def test_inbox_limit(self, client, auth_headers):
+        """Test that the limit query parameter caps the number of events returned."""
+        for i in range(3):
+            create_response = client.post("/events", headers=auth_headers, json={
+                "type": f"test.event{i}",
+                "source": "test",
+                "payload": {"index": i}
+            })
+            assert create_response.status_code == 201
+
+        response = client.get("/inbox", headers=auth_headers, params={"limit": 2})
+
+        assert response.status_code == 200
+        assert len(response.json()) == 2
+
+    def test_inbox_invalid_limit(self, client, auth_headers):
+        """Test that an out-of-range limit is rejected."""
+        assert client.get("/inbox", headers=auth_headers, params={"limit": 0}).status_code == 400
+        assert client.get("/inbox", headers=auth_headers, params={"limit": 101}).status_code == 400
+
 
 class TestAcknowledgeEndpoint:
     """Tests for POST /inbox/{event_id}/ack endpoint."""
@@ -316,6 +395,37 @@ class TestAcknowledgeEndpoint:
         assert ack_data["message"] == "Event acknowledged successfully"
         assert "updated_at" in ack_data
 
+    def test_acknowledge_event_records_attempts(self, client, auth_headers, dynamodb_table):
+        """Test that attempts sent with the ack are added to delivery_attempts."""
+        create_response = client.post("/events", headers=auth_headers, json={
+            "type": "test.event",
+            "source": "test",
+            "payload": {"test": "data"}
+        })
+        event_id = create_response.json()["id"]
+
+        ack_response = client.post(f"/inbox/{event_id}/ack", headers=auth_headers, json={"attempts": 3})
+
+        assert ack_response.status_code == 200
+        item = dynamodb_table.query(KeyConditionExpression=Key("id").eq(event_id))["Items"][0]
+        assert item["status"] == "delivered"
+        assert item["delivery_attempts"] == 3
+
+    def test_acknowledge_event_invalid_attempts(self, client, auth_headers, dynamodb_table):
+        """Test that a non-positive attempt count is rejected."""
+        create_response = client.post("/events", headers=auth_headers, json={
+            "type": "test.event",
+            "source": "test",
+            "payload": {"test": "data"}
+        })
+        event_id = create_response.json()["id"]
+
+        response = client.post(f"/inbox/{event_id}/ack", headers=auth_headers, json={"attempts": 0})
+
+        assert response.status_code == 400
+        item = dynamodb_table.query(KeyConditionExpression=Key("id").eq(event_id))["Items"][0]
+        assert item["status"] == "pending"
+
     def test_acknowledge_nonexistent_event(self, client):
         """Test acknowledging an event that doesn't exist."""
         fake_event_id = "00000000-0000-0000-0000-000000000000"
@@ -368,6 +478,59 @@ class TestAcknowledgeEndpoint:
         second_ack = client.post(f"/inbox/{event_id}/ack")
         assert second_ack.status_code == 200
 
+    def test_acknowledge_events_batch(self, client, auth_headers, dynamodb_table):
+        """Test acknowledging several events in one batch request."""
+        event_ids = []
+        for i in range(3):
+            create_response = client.post("/events", headers=auth_headers, json={
+                "type": "test.event",
+                "source": "test",
+                "payload": {"index": i}
+            })
+            event_ids.append(create_response.json()["id"])
+        fake_event_id = "00000000-0000-0000-0000-000000000000"
+
+        response = client.post("/inbox/ack", headers=auth_headers, json={
+            "acks": [{"id": event_ids[0], "attempts": 2}]
+                    + [{"id": event_id} for event_id in event_ids[1:]]
+                    + [{"id": fake_event_id}]
+        })
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["acknowledged"] == event_ids
+        assert data["failed"] == [fake_event_id]
+        assert "updated_at" in data
+        assert client.get("/inbox", headers=auth_headers).json() == []
+
+        items = {
+            event_id: dynamodb_table.query(KeyConditionExpression=Key("id").eq(event_id))["Items"][0]
+            for event_id in event_ids
+        }
+        assert all(item["status"] == "delivered" for item in items.values())
+        assert all(item["updated_at"] == data["updated_at"] for item in items.values())
+        assert items[event_ids[0]]["delivery_attempts"] == 2
+        assert items[event_ids[1]]["delivery_attempts"] == 1
+
+    def test_acknowledge_events_batch_invalid(self, client, auth_headers, dynamodb_table):
+        """Test that empty, oversized and non-positive-attempt batches are rejected."""
+        create_response = client.post("/events", headers=auth_headers, json={
+            "type": "test.event",
+            "source": "test",
+            "payload": {"test": "data"}
+        })
+        event_id = create_response.json()["id"]
+
+        assert client.post("/inbox/ack", headers=auth_headers, json={"acks": []}).status_code == 400
+        oversized = {"acks": [{"id": event_id}] + [{"id": str(i)} for i in range(100)]}
+        assert client.post("/inbox/ack", headers=auth_headers, json=oversized).status_code == 400
+        invalid_attempts = {"acks": [{"id": event_id, "attempts": 0}]}
+        assert client.post("/inbox/ack", headers=auth_headers, json=invalid_attempts).status_code == 400
+
+        # Rejected batches leave every event untouched
+        item = dynamodb_table.query(KeyConditionExpression=Key("id").eq(event_id))["Items"][0]
+        assert item["status"] == "pending"
+
 
 class TestEndToEndWorkflow:
     """End-to-end integration tests."""
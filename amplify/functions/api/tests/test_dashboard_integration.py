@@ -280,7 +280,7 @@ class TestDashboardAutoRefresh:
         summary1 = client.get("/metrics/summary", headers=headers).json()
         assert summary1["total"] == 10
 
-        # Clear cache to simulate cache expiry (30 seconds)
+        # Clear cache to simulate cache expiry
         import main
         main.metrics_cache.clear()
 
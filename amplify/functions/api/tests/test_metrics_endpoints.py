@@ -5,7 +5,7 @@ Tests all /metrics/* endpoints: summary, latency, throughput, errors.
 Coverage Goals:
 - Test all success paths with various data scenarios
 - Test edge cases (empty data, single events, large datasets)
-- Test caching behavior (30-second TTL)
+- Test caching behavior (configurable TTL, 10 seconds by default)
 - Test pagination handling for large datasets
 - Test error handling and DynamoDB failures
 - Test authentication requirements
@@ -20,7 +20,7 @@ from moto import mock_aws
 import boto3
 from datetime import datetime, timedelta
 from decimal import Decimal
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 
 # Set environment variables before importing the app
@@ -374,7 +374,7 @@ class TestMetricsSummary:
         assert data["success_rate"] == 0.0
 
     def test_summary_caching_behavior(self, client, auth_token, dynamodb_table):
-        """Test that summary results are cached for 30 seconds."""
+        """Test that summary results are cached for the configured TTL."""
         now = datetime.utcnow()
 
         # Create initial event
@@ -654,6 +654,36 @@ class TestMetricsLatency:
         data = response.json()
         assert data["sample_size"] == 1  # Only valid event counted
 
+    def test_latency_treats_naive_timestamps_as_utc(self):
+        """Test that timestamps with and without a Z suffix parse to the same instant."""
+        import main
+
+        assert main._iso_to_epoch("2024-01-15T10:30:00Z") == main._iso_to_epoch("2024-01-15T10:30:00")
+        assert main._iso_to_epoch("2024-01-15T10:30:05Z") - main._iso_to_epoch("2024-01-15T10:30:00Z") == 5.0
+
+    def test_latency_sample_is_bounded(self):
+        """Test that latency aggregation keeps a fixed-size sample across pages."""
+        import main
+
+        with patch.object(main, 'LATENCY_SAMPLE_SIZE', 50):
+            aggregates = main._MetricsAccumulator()
+            for page in range(10):
+                aggregates.add_page([
+                    {
+                        "id": f"sample-{page}-{i}",
+                        "status": "delivered",
+                        "created_at": "2024-01-15T10:00:00Z",
+                        "updated_at": f"2024-01-15T10:00:{i:02d}Z"
+                    }
+                    for i in range(20)
+                ])
+
+        result = main._compute_latency(aggregates)
+
+        assert len(aggregates.latency_sample) == 50
+        assert result.sample_size == 200
+        assert 0 <= result.p50 <= result.p95 <= result.p99 <= 19
+
     def test_latency_caching(self, client, auth_token, dynamodb_table):
         """Test that latency results are cached."""
         now = datetime.utcnow()
@@ -1087,6 +1117,226 @@ class TestMetricsErrors:
         assert data2["total_errors"] == data1["total_errors"]
 
 
+# ============================================================================
+# TEST CLASS: /metrics/all
+# ============================================================================
+
+class TestMetricsAll:
+    """Tests for GET /metrics/all endpoint."""
+
+    def test_all_requires_authentication(self, client):
+        """Test that /metrics/all requires authentication."""
+        response = client.get("/metrics/all")
+        assert response.status_code == 401
+
+    def test_all_matches_individual_endpoints(self, client, auth_token, sample_events):
+        """Test that the combined response equals the four individual endpoints."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+
+        response = client.get("/metrics/all", headers=headers)
+
+        assert response.status_code == 200
+        data = response.json()
+
+        assert data["summary"] == client.get("/metrics/summary", headers=headers).json()
+        assert data["latency"] == client.get("/metrics/latency", headers=headers).json()
+        assert data["throughput"] == client.get("/metrics/throughput", headers=headers).json()
+        assert data["errors"] == client.get("/metrics/errors", headers=headers).json()
+
+    def test_all_uses_single_scan(self, client, auth_token, sample_events):
+        """Test that all four metric groups are computed from one table scan."""
+        import main
+
+        with patch.object(main.table, 'scan', wraps=main.table.scan) as mock_scan:
+            response = client.get(
+                "/metrics/all",
+                headers={"Authorization": f"Bearer {auth_token}"}
+            )
+
+        assert response.status_code == 200
+        assert mock_scan.call_count == 1
+        assert response.json()["summary"]["total"] == len(sample_events)
+
+    def test_all_scans_large_tables_in_parallel_segments(self, client, auth_token):
+        """Test that every page of every scan segment is aggregated."""
+        import main
+
+        def segmented_scan(**kwargs):
+            segment = kwargs["Segment"]
+            assert kwargs["TotalSegments"] == 3
+            if "ExclusiveStartKey" not in kwargs:
+                # Each segment returns two pages
+                return {
+                    "Items": [{"id": f"{segment}-a", "status": "pending"}],
+                    "LastEvaluatedKey": {"id": f"{segment}-a"}
+                }
+            return {"Items": [{"id": f"{segment}-b", "status": "delivered"}]}
+
+        segment_table = MagicMock()
+        segment_table.scan.side_effect = segmented_scan
+
+        with patch.object(main, "_scan_segment_count", return_value=3), \
+                patch.object(main, "_segment_table", return_value=segment_table):
+            response = client.get(
+                "/metrics/all",
+                headers={"Authorization": f"Bearer {auth_token}"}
+            )
+
+        assert response.status_code == 200
+        assert segment_table.scan.call_count == 6
+        summary = response.json()["summary"]
+        assert summary["total"] == 6
+        assert summary["pending"] == 3
+        assert summary["delivered"] == 3
+
+    def test_all_caching(self, client, auth_token, dynamodb_table):
+        """Test that combined metrics are cached."""
+        now = datetime.utcnow()
+
+        dynamodb_table.put_item(Item={
+            "id": "cache-all-1",
+            "type": "test",
+            "source": "test",
+            "status": "delivered",
+            "created_at": now.isoformat() + "Z",
+            "updated_at": now.isoformat() + "Z",
+            "payload": {},
+            "delivery_attempts": 1,
+            "ttl": int((now + timedelta(days=90)).timestamp())
+        })
+
+        response1 = client.get(
+            "/metrics/all",
+            headers={"Authorization": f"Bearer {auth_token}"}
+        )
+        assert response1.json()["summary"]["total"] == 1
+
+        dynamodb_table.put_item(Item={
+            "id": "cache-all-2",
+            "type": "test",
+            "source": "test",
+            "status": "failed",
+            "created_at": now.isoformat() + "Z",
+            "updated_at": now.isoformat() + "Z",
+            "payload": {},
+            "delivery_attempts": 3,
+            "ttl": int((now + timedelta(days=90)).timestamp())
+        })
+
+        # Should return cached result
+        response2 = client.get(
+            "/metrics/all",
+            headers={"Authorization": f"Bearer {auth_token}"}
+        )
+        assert response2.json() == response1.json()
+
+
+# ============================================================================
+# TEST CLASS: Cache TTL configuration
+# ============================================================================
+
+class TestMetricsCacheTtl:
+    """Tests for environment-configurable metrics cache TTLs."""
+
+    def test_ttl_defaults_to_10_seconds(self):
+        """Test that every endpoint uses the 10 second default TTL."""
+        import main
+
+        assert main.METRICS_CACHE_TTLS == dict.fromkeys(("summary", "latency", "throughput", "errors", "all"), 10)
+
+    def test_ttl_env_overrides(self, monkeypatch):
+        """Test that TTL env vars are honored and entries expire at the configured time."""
+        import main
+
+        ttls = main._load_cache_ttls({'METRICS_CACHE_TTL_SECONDS': '20', 'METRICS_TTL_SUMMARY': '5'})
+
+        assert ttls["summary"] == 5
+        assert ttls["latency"] == 20
+
+        monkeypatch.setattr(main, 'METRICS_CACHE_TTLS', ttls)
+        monkeypatch.setattr(main, 'metrics_cache', {})
+        now = time.time()
+        result = main.EventSummary(total=0, pending=0, delivered=0, failed=0, success_rate=0.0)
+        main.metrics_cache["summary"] = main._metrics_cache_entry("summary", result, now)
+
+        assert main._get_cached_metrics("summary", now + 4) is not None
+        assert main._get_cached_metrics("summary", now + 5) is None
+
+
+# ============================================================================
+# TEST CLASS: HTTP caching (ETag / Cache-Control)
+# ============================================================================
+
+class TestMetricsHttpCaching:
+    """Tests for ETag and Cache-Control headers on metrics endpoints."""
+
+    @pytest.mark.parametrize("endpoint", [
+        "/metrics/summary",
+        "/metrics/latency",
+        "/metrics/throughput",
+        "/metrics/errors",
+        "/metrics/all",
+    ])
+    def test_metrics_return_etag_and_cache_control(self, client, auth_token, endpoint):
+        """Test that every metrics endpoint sets ETag and Cache-Control."""
+        response = client.get(endpoint, headers={"Authorization": f"Bearer {auth_token}"})
+
+        assert response.status_code == 200
+        assert response.headers["ETag"].startswith('"')
+        assert response.headers["Cache-Control"].startswith("private, max-age=")
+
+    def test_matching_if_none_match_returns_304(self, client, auth_token, sample_events):
+        """Test that a matching If-None-Match header short-circuits to 304."""
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        response1 = client.get("/metrics/summary", headers=headers)
+        etag = response1.headers["ETag"]
+
+        response2 = client.get(
+            "/metrics/summary",
+            headers={**headers, "If-None-Match": etag}
+        )
+
+        assert response2.status_code == 304
+        assert response2.content == b""
+        assert response2.headers["ETag"] == etag
+
+    def test_stale_if_none_match_returns_body(self, client, auth_token, sample_events):
+        """Test that a non-matching If-None-Match header returns the full body."""
+        response = client.get(
+            "/metrics/summary",
+            headers={
+                "Authorization": f"Bearer {auth_token}",
+                "If-None-Match": '"stale-etag"'
+            }
+        )
+
+        assert response.status_code == 200
+        assert response.json()["total"] == len(sample_events)
+
+    def test_etag_changes_when_data_changes(self, client, auth_token, dynamodb_table):
+        """Test that the ETag changes once recomputed metrics differ."""
+        import main
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        etag1 = client.get("/metrics/summary", headers=headers).headers["ETag"]
+
+        now = datetime.utcnow()
+        dynamodb_table.put_item(Item={
+            "id": "etag-1",
+            "type": "test",
+            "source": "test",
+            "status": "pending",
+            "created_at": now.isoformat() + "Z",
+            "updated_at": now.isoformat() + "Z",
+            "payload": {},
+            "delivery_attempts": 0,
+            "ttl": int((now + timedelta(days=90)).timestamp())
+        })
+        main.metrics_cache.clear()
+
+        etag2 = client.get("/metrics/summary", headers=headers).headers["ETag"]
+        assert etag1 != etag2
+
+
 # ============================================================================
 # TEST CLASS: Error Handling
 # ============================================================================
@@ -1163,3 +1413,21 @@ class TestMetricsErrorHandling:
         )
 
         assert response.status_code == 500
+
+    @patch('main.table')
+    def test_all_handles_dynamodb_errors(self, mock_table, client, auth_token):
+        """Test combined metrics endpoint error handling."""
+        from botocore.exceptions import ClientError
+
+        mock_table.scan.side_effect = ClientError(
+            {"Error": {"Code": "InternalServerError", "Message": "Internal error"}},
+            "Scan"
+        )
+
+        response = client.get(
+            "/metrics/all",
+            headers={"Authorization": f"Bearer {auth_token}"}
+        )
+
+        assert response.status_code == 500
+        assert "Failed to retrieve metrics" in response.json()["detail"]
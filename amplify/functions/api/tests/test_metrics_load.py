@@ -8,8 +8,10 @@ Tests metrics endpoints under realistic load conditions:
 - Performance degradation testing
 - Cache effectiveness under load
 """
+import asyncio
 import json
 import os
+import httpx
 import pytest
 from fastapi.testclient import TestClient
 from moto import mock_aws
@@ -18,6 +20,7 @@ from datetime import datetime, timedelta
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
 import statistics
+from typing import Iterable
 
 
 # Set environment variables before importing the app
@@ -26,7 +29,7 @@ os.environ['SECRET_ARN'] = 'arn:aws:secretsmanager:us-east-1:123456789012:secret
 os.environ['AWS_REGION'] = 'us-east-1'
 
 
-@pytest.fixture(scope='function')
+@pytest.fixture(scope='class')
 def aws_credentials():
     """Mock AWS credentials for moto."""
     os.environ['AWS_ACCESS_KEY_ID'] = 'testing'
@@ -36,9 +39,9 @@ def aws_credentials():
     os.environ['AWS_DEFAULT_REGION'] = 'us-east-1'
 
 
-@pytest.fixture(scope='function')
-def dynamodb_table(aws_credentials):
-    """Create a mock DynamoDB table for testing."""
+@pytest.fixture(scope='class')
+def dynamodb_table_schema(aws_credentials):
+    """Create the mock DynamoDB table once per test class."""
     with mock_aws():
         dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
 
@@ -78,6 +81,25 @@ def dynamodb_table(aws_credentials):
 
 
 @pytest.fixture(scope='function')
+def dynamodb_table(dynamodb_table_schema):
+    """Provide the class-scoped table emptied of items left by earlier tests."""
+    table = dynamodb_table_schema
+    scan_kwargs = {'ProjectionExpression': 'id, created_at'}
+
+    with table.batch_writer() as batch:
+        while True:
+            response = table.scan(**scan_kwargs)
+            for item in response.get('Items', []):
+                batch.delete_item(Key={'id': item['id'], 'created_at': item['created_at']})
+
+            if 'LastEvaluatedKey' not in response:
+                break
+            scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    yield table
+
+
+@pytest.fixture(scope='class')
 def secrets_manager(aws_credentials):
     """Create a mock Secrets Manager secret for testing."""
     with mock_aws():
@@ -108,6 +130,23 @@ def client(dynamodb_table, secrets_manager):
         yield test_client
 
 
+@pytest.fixture(scope='function')
+async def async_client(client):
+    """Async client that dispatches straight to the ASGI app for concurrent requests."""
+    from main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://test') as test_client:
+        yield test_client
+
+
+def _seed(table, items: Iterable[dict]):
+    """Write items to the table in batches of 25 via BatchWriteItem."""
+    with table.batch_writer() as batch:
+        for item in items:
+            batch.put_item(Item=item)
+
+
 @pytest.fixture(scope='function')
 def auth_token(client):
     """Get an authentication token for protected endpoints."""
@@ -136,44 +175,22 @@ class TestHighVolumeMetricsAccuracy:
         expected_pending = 200
         expected_failed = 100
 
-        for i in range(expected_delivered):
-            dynamodb_table.put_item(Item={
-                "id": f"delivered-{i}",
-                "type": "test",
-                "source": "test",
-                "status": "delivered",
-                "created_at": now.isoformat() + "Z",
-                "updated_at": now.isoformat() + "Z",
-                "payload": {},
-                "delivery_attempts": 1,
-                "ttl": int((now + timedelta(days=90)).timestamp())
-            })
-
-        for i in range(expected_pending):
-            dynamodb_table.put_item(Item={
-                "id": f"pending-{i}",
+        def make_events(prefix, status, count, attempts):
+            return ({
+                "id": f"{prefix}-{i}",
                 "type": "test",
                 "source": "test",
-                "status": "pending",
+                "status": status,
                 "created_at": now.isoformat() + "Z",
                 "updated_at": now.isoformat() + "Z",
                 "payload": {},
-                "delivery_attempts": 0,
+                "delivery_attempts": attempts,
                 "ttl": int((now + timedelta(days=90)).timestamp())
-            })
+            } for i in range(count))
 
-        for i in range(expected_failed):
-            dynamodb_table.put_item(Item={
-                "id": f"failed-{i}",
-                "type": "test",
-                "source": "test",
-                "status": "failed",
-                "created_at": now.isoformat() + "Z",
-                "updated_at": now.isoformat() + "Z",
-                "payload": {},
-                "delivery_attempts": 3,
-                "ttl": int((now + timedelta(days=90)).timestamp())
-            })
+        _seed(dynamodb_table, make_events("delivered", "delivered", expected_delivered, 1))
+        _seed(dynamodb_table, make_events("pending", "pending", expected_pending, 0))
+        _seed(dynamodb_table, make_events("failed", "failed", expected_failed, 3))
 
         headers = {"Authorization": f"Bearer {auth_token}"}
         response = client.get("/metrics/summary", headers=headers)
@@ -196,19 +213,17 @@ class TestHighVolumeMetricsAccuracy:
         now = datetime.utcnow()
 
         # Create 500 events with known latencies (1-500 seconds)
-        for i in range(1, 501):
-            created = now - timedelta(seconds=i)
-            dynamodb_table.put_item(Item={
-                "id": f"latency-{i}",
-                "type": "test",
-                "source": "test",
-                "status": "delivered",
-                "created_at": created.isoformat() + "Z",
-                "updated_at": now.isoformat() + "Z",
-                "payload": {},
-                "delivery_attempts": 1,
-                "ttl": int((now + timedelta(days=90)).timestamp())
-            })
+        _seed(dynamodb_table, ({
+            "id": f"latency-{i}",
+            "type": "test",
+            "source": "test",
+            "status": "delivered",
+            "created_at": (now - timedelta(seconds=i)).isoformat() + "Z",
+            "updated_at": now.isoformat() + "Z",
+            "payload": {},
+            "delivery_attempts": 1,
+            "ttl": int((now + timedelta(days=90)).timestamp())
+        } for i in range(1, 501)))
 
         headers = {"Authorization": f"Bearer {auth_token}"}
         response = client.get("/metrics/latency", headers=headers)
@@ -234,11 +249,12 @@ class TestHighVolumeMetricsAccuracy:
 
         # Create 240 events evenly distributed over 24 hours (10 per hour)
         events_count = 240
-        for i in range(events_count):
+
+        def make_event(i):
             hours_ago = (i / 10.0)  # Spread over 24 hours
             created_time = now - timedelta(hours=hours_ago)
 
-            dynamodb_table.put_item(Item={
+            return {
                 "id": f"throughput-{i}",
                 "type": "test",
                 "source": "test",
@@ -248,7 +264,9 @@ class TestHighVolumeMetricsAccuracy:
                 "payload": {},
                 "delivery_attempts": 1,
                 "ttl": int((now + timedelta(days=90)).timestamp())
-            })
+            }
+
+        _seed(dynamodb_table, (make_event(i) for i in range(events_count)))
 
         headers = {"Authorization": f"Bearer {auth_token}"}
         response = client.get("/metrics/throughput", headers=headers)
@@ -267,44 +285,22 @@ class TestHighVolumeMetricsAccuracy:
         now = datetime.utcnow()
 
         # Create realistic error scenario: 850 delivered, 100 failed, 50 pending
-        for i in range(850):
-            dynamodb_table.put_item(Item={
-                "id": f"success-{i}",
+        def make_events(prefix, status, count, attempts):
+            return ({
+                "id": f"{prefix}-{i}",
                 "type": "test",
                 "source": "test",
-                "status": "delivered",
-                "created_at": now.isoformat() + "Z",
-                "updated_at": now.isoformat() + "Z",
-                "payload": {},
-                "delivery_attempts": 1,
-                "ttl": int((now + timedelta(days=90)).timestamp())
-            })
-
-        for i in range(100):
-            dynamodb_table.put_item(Item={
-                "id": f"error-{i}",
-                "type": "test",
-                "source": "test",
-                "status": "failed",
+                "status": status,
                 "created_at": now.isoformat() + "Z",
                 "updated_at": now.isoformat() + "Z",
                 "payload": {},
-                "delivery_attempts": 3,
+                "delivery_attempts": attempts,
                 "ttl": int((now + timedelta(days=90)).timestamp())
-            })
+            } for i in range(count))
 
-        for i in range(50):
-            dynamodb_table.put_item(Item={
-                "id": f"pending-{i}",
-                "type": "test",
-                "source": "test",
-                "status": "pending",
-                "created_at": now.isoformat() + "Z",
-                "updated_at": now.isoformat() + "Z",
-                "payload": {},
-                "delivery_attempts": 0,
-                "ttl": int((now + timedelta(days=90)).timestamp())
-            })
+        _seed(dynamodb_table, make_events("success", "delivered", 850, 1))
+        _seed(dynamodb_table, make_events("error", "failed", 100, 3))
+        _seed(dynamodb_table, make_events("pending", "pending", 50, 0))
 
         headers = {"Authorization": f"Bearer {auth_token}"}
         response = client.get("/metrics/errors", headers=headers)
@@ -327,7 +323,8 @@ class TestHighVolumeMetricsAccuracy:
 class TestConcurrentAccessPerformance:
     """Test metrics endpoints under concurrent load."""
 
-    def test_concurrent_summary_requests(self, client, auth_token, dynamodb_table):
+    @pytest.mark.asyncio
+    async def test_concurrent_summary_requests(self, async_client, auth_token, dynamodb_table):
         """Test summary endpoint with 50 concurrent requests."""
         now = datetime.utcnow()
 
@@ -347,18 +344,11 @@ class TestConcurrentAccessPerformance:
 
         headers = {"Authorization": f"Bearer {auth_token}"}
 
-        def fetch_summary():
-            response = client.get("/metrics/summary", headers=headers)
-            return response.status_code, response.json()
-
-        # Execute 50 concurrent requests
-        with ThreadPoolExecutor(max_workers=50) as executor:
-            futures = [executor.submit(fetch_summary) for _ in range(50)]
-
-            results = []
-            for future in as_completed(futures):
-                status_code, data = future.result()
-                results.append((status_code, data))
+        # Execute 50 concurrent requests on one event loop
+        responses = await asyncio.gather(*[
+            async_client.get("/metrics/summary", headers=headers) for _ in range(50)
+        ])
+        results = [(response.status_code, response.json()) for response in responses]
 
         # All requests should succeed
         assert all(status == 200 for status, _ in results)
@@ -576,13 +566,13 @@ class TestStressScenarios:
         now = datetime.utcnow()
 
         # Create 2000 events with varied statuses and timestamps
-        for i in range(2000):
+        def make_event(i):
             hours_ago = (i % 48) * 0.5  # Spread over 24 hours
             created_time = now - timedelta(hours=hours_ago)
 
             status = "delivered" if i % 5 != 0 else ("pending" if i % 10 == 0 else "failed")
 
-            dynamodb_table.put_item(Item={
+            return {
                 "id": f"stress-{i}",
                 "type": f"type-{i % 10}",
                 "source": f"source-{i % 5}",
@@ -592,7 +582,9 @@ class TestStressScenarios:
                 "payload": {},
                 "delivery_attempts": 1 if status == "delivered" else (0 if status == "pending" else 3),
                 "ttl": int((now + timedelta(days=90)).timestamp())
-            })
+            }
+
+        _seed(dynamodb_table, (make_event(i) for i in range(2000)))
 
         headers = {"Authorization": f"Bearer {auth_token}"}
 
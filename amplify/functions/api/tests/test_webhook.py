@@ -1,40 +1,24 @@
 """
 Tests for webhook receiver endpoint
 """
+import asyncio
+import httpx
 import pytest
-import json
+import pytest_asyncio
 import hmac
-import hashlib
-import os
-from datetime import datetime
-from fastapi.testclient import TestClient
-from unittest.mock import patch, MagicMock
+import orjson
+from unittest.mock import patch
 from main import app
 
 
-@pytest.fixture
-def client():
-    """Test client fixture"""
-    with patch.dict(os.environ, {'SECRET_ARN': 'arn:aws:secretsmanager:us-east-2:123456789:secret:test'}):
-        return TestClient(app)
+WEBHOOK_SECRET = "test-webhook-secret-key"
+WEBHOOK_SECRET_BYTES = WEBHOOK_SECRET.encode('utf-8')
 
+JSON_HEADERS = {"Content-Type": "application/json"}
 
-@pytest.fixture
-def mock_secrets():
-    """Mock secrets fixture with webhook secret"""
-    return {
-        "environment": "test",
-        "jwt_secret": "test-jwt-secret-key-for-testing-only",
-        "zapier_api_key": "test-api-key",
-        "zapier_webhook_url": "https://hooks.zapier.com/test",
-        "zapier_webhook_secret": "test-webhook-secret-key"
-    }
-
-
-@pytest.fixture
-def webhook_payload():
-    """Sample webhook payload"""
-    return {
+# Fixed test payloads; bodies and signatures are derived once at import (see _VECTORS)
+PAYLOADS = {
+    "default": {
         "event_type": "user.created",
         "event_id": "550e8400-e29b-41d4-a716-446655440000",
         "payload": {
@@ -43,95 +27,217 @@ def webhook_payload():
             "name": "Test User"
         },
         "timestamp": "2024-01-15T10:30:00Z"
-    }
+    },
+    # Only required fields
+    "minimal": {
+        "event_type": "test.event",
+        "payload": {"test": "data"}
+    },
+    "complex": {
+        "event_type": "order.completed",
+        "event_id": "order-12345",
+        "payload": {
+            "order_id": "ORD-2024-001",
+            "customer": {
+                "id": "CUST-123",
+                "name": "John Doe",
+                "email": "john@example.com",
+                "address": {
+                    "street": "123 Main St",
+                    "city": "New York",
+                    "state": "NY",
+                    "zip": "10001"
+                }
+            },
+            "items": [
+                {"sku": "ITEM-001", "quantity": 2, "price": 29.99},
+                {"sku": "ITEM-002", "quantity": 1, "price": 49.99}
+            ],
+            "total": 109.97,
+            "currency": "USD"
+        },
+        "timestamp": "2024-01-15T10:30:00Z"
+    },
+    # Missing event_type
+    "missing_event_type": {
+        "payload": {"test": "data"}
+    },
+}
 
 
-def generate_hmac_signature(payload: dict, secret: str) -> str:
+def encode_payload(payload: dict) -> bytes:
+    """Serialize a webhook payload to the exact request body bytes that get signed and posted"""
+    return orjson.dumps(payload)
+
+
+def generate_hmac_signature(payload_bytes: bytes, secret_bytes: bytes) -> str:
     """
-    Generate HMAC-SHA256 signature for webhook payload
+    Generate HMAC-SHA256 signature for a webhook request body
 
-    Note: Uses default JSON serialization format to match what FastAPI TestClient sends
-    (with spaces after colons and commas)
+    Tests post these same bytes with content=, so the signed body and the
+    body the server sees are identical regardless of JSON formatting.
 
     Args:
-        payload: Dictionary to sign
-        secret: Webhook secret key
+        payload_bytes: Raw request body to sign
+        secret_bytes: Webhook secret key, already UTF-8 encoded
 
     Returns:
         Hex-encoded HMAC signature
     """
-    # Use default JSON serialization to match FastAPI/Starlette TestClient
-    # which uses json.dumps() with default separators (', ', ': ')
-    payload_bytes = json.dumps(payload, separators=(', ', ': ')).encode('utf-8')
-    signature = hmac.new(
-        secret.encode('utf-8'),
-        payload_bytes,
-        hashlib.sha256
-    ).hexdigest()
-    return signature
+    # One-shot C implementation; skips building a Python-level HMAC object
+    return hmac.digest(secret_bytes, payload_bytes, 'sha256').hex()
 
 
-class TestWebhookEndpoint:
-    """Test cases for POST /webhook endpoint"""
+def _build_vector(payload: dict):
+    body = encode_payload(payload)
+    return body, generate_hmac_signature(body, WEBHOOK_SECRET_BYTES)
 
-    def test_webhook_with_valid_signature(self, client, mock_secrets, webhook_payload):
-        """Test webhook endpoint with valid HMAC signature"""
-        with patch('main.get_secret', return_value=mock_secrets):
-            with patch('main.cloudwatch_client.put_metric_data') as mock_cloudwatch:
-                # Generate valid signature
-                signature = generate_hmac_signature(webhook_payload, mock_secrets["zapier_webhook_secret"])
-
-                # Send request with signature
-                response = client.post(
-                    "/webhook",
-                    json=webhook_payload,
-                    headers={"X-Webhook-Signature": signature}
-                )
-
-                # Verify response
-                assert response.status_code == 200
-                data = response.json()
-                assert data["status"] == "received"
-                assert data["message"] == "Webhook event received and logged successfully"
-                assert data["event_id"] == webhook_payload["event_id"]
-                assert "timestamp" in data
-
-                # Verify CloudWatch metric was published
-                mock_cloudwatch.assert_called_once()
 
-    @patch('main.get_secret')
-    def test_webhook_with_invalid_signature(self, mock_get_secret, client, mock_secrets, webhook_payload):
-        """Test webhook endpoint with invalid HMAC signature"""
-        mock_get_secret.return_value = mock_secrets
+# name -> (request body, signature header)
+_VECTORS = {name: _build_vector(payload) for name, payload in PAYLOADS.items()}
 
-        # Send request with invalid signature
-        response = client.post(
-            "/webhook",
-            json=webhook_payload,
-            headers={"X-Webhook-Signature": "invalid-signature-here"}
-        )
 
-        # Verify 401 Unauthorized response
-        assert response.status_code == 401
-        assert "Invalid webhook signature" in response.json()["detail"]
+@pytest.fixture(scope="module", autouse=True)
+def configure_secret_arn():
+    """
+    Point main at a test secret ARN once for the whole module
 
-    @patch('main.get_secret')
-    def test_webhook_without_signature(self, mock_get_secret, client, mock_secrets, webhook_payload):
-        """Test webhook endpoint without signature header"""
-        mock_get_secret.return_value = mock_secrets
+    main reads SECRET_ARN at import, so the module attribute is patched
+    rather than the environment.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr('main.secret_arn', 'arn:aws:secretsmanager:us-east-2:123456789:secret:test')
+        yield
 
-        # Send request without signature header
-        response = client.post(
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def client():
+    """
+    Async client that dispatches straight to the ASGI app, without TestClient's thread portal
+
+    Built once per module; the tests using it share a module-scoped event loop.
+    """
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="module")
+def mock_secrets():
+    """Mock secrets fixture with webhook secret"""
+    return {
+        "environment": "test",
+        "jwt_secret": "test-jwt-secret-key-for-testing-only",
+        "zapier_api_key": "test-api-key",
+        "zapier_webhook_url": "https://hooks.zapier.com/test",
+        "zapier_webhook_secret": WEBHOOK_SECRET
+    }
+
+
+class _NoopCloudWatch:
+    """CloudWatch stand-in that accepts and drops metrics"""
+
+    def put_metric_data(self, **kwargs):
+        pass
+
+
+@pytest.fixture(scope="module", autouse=True)
+def stub_aws_clients(mock_secrets):
+    """
+    Stub Secrets Manager and CloudWatch once for the whole module
+
+    Tests that need different behaviour patch main.get_secret or
+    main.cloudwatch_client.put_metric_data locally.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr('main.get_secret', lambda *args, **kwargs: mock_secrets)
+        mp.setattr('main.cloudwatch_client', _NoopCloudWatch())
+        yield
+
+
+@pytest.fixture(scope="module")
+def webhook_payload():
+    """Sample webhook payload"""
+    return PAYLOADS["default"]
+
+
+@pytest.fixture(scope="module")
+def webhook_body():
+    """Serialized sample webhook payload"""
+    return _VECTORS["default"][0]
+
+
+@pytest.fixture(scope="module")
+def webhook_signature():
+    """Valid signature for webhook_body"""
+    return _VECTORS["default"][1]
+
+
+@pytest.mark.asyncio(loop_scope="module")
+class TestWebhookEndpoint:
+    """Test cases for POST /webhook endpoint"""
+
+    @pytest.mark.parametrize("vector, extra_headers, cloudwatch_error, expected_event_id", [
+        pytest.param("default", {}, None, PAYLOADS["default"]["event_id"], id="valid_signature"),
+        pytest.param("default", {"X-Request-ID": "test-request-123"}, None,
+                     PAYLOADS["default"]["event_id"], id="request_id_header"),
+        # event_id should be "unknown" when not provided
+        pytest.param("minimal", {}, None, "unknown", id="minimal_payload"),
+        pytest.param("complex", {}, None, "order-12345", id="complex_payload"),
+        # Should still succeed even if metric publishing fails
+        pytest.param("default", {}, Exception("CloudWatch API error"),
+                     PAYLOADS["default"]["event_id"], id="cloudwatch_metric_failure"),
+    ])
+    async def test_webhook_accepts_signed_payload(self, client, vector, extra_headers,
+                                                  cloudwatch_error, expected_event_id):
+        """Test webhook endpoint accepts correctly signed payloads"""
+        body, signature = _VECTORS[vector]
+
+        with patch('main.cloudwatch_client.put_metric_data',
+                   side_effect=cloudwatch_error) as mock_cloudwatch:
+            response = await client.post(
+                "/webhook",
+                content=body,
+                headers={**JSON_HEADERS, "X-Webhook-Signature": signature, **extra_headers}
+            )
+
+        # Verify response
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "received"
+        assert data["message"] == "Webhook event received and logged successfully"
+        assert data["event_id"] == expected_event_id
+        assert "timestamp" in data
+
+        # Verify the WebhookReceived metric was published once (the request
+        # metrics middleware publishes through the same client)
+        webhook_calls = [
+            call for call in mock_cloudwatch.call_args_list
+            if any(datum["MetricName"] == "WebhookReceived" for datum in call.kwargs["MetricData"])
+        ]
+        assert len(webhook_calls) == 1
+
+    @pytest.mark.parametrize("signature_headers", [
+        pytest.param({"X-Webhook-Signature": "invalid-signature-here"}, id="invalid_signature"),
+        # Non-ASCII header values must be rejected, not raise
+        pytest.param({"X-Webhook-Signature": ("\u00e9" * 64).encode("latin-1")}, id="non_ascii_signature"),
+        # Signature required when secret is configured
+        pytest.param({}, id="missing_signature"),
+    ])
+    async def test_webhook_rejects_bad_signature(self, client, webhook_body, signature_headers):
+        """Test webhook endpoint rejects missing or invalid HMAC signatures"""
+        response = await client.post(
             "/webhook",
-            json=webhook_payload
+            content=webhook_body,
+            headers={**JSON_HEADERS, **signature_headers}
         )
 
-        # Verify 401 Unauthorized response (signature required when secret is configured)
+        # Verify 401 Unauthorized response
         assert response.status_code == 401
+        assert "Invalid webhook signature" in response.json()["detail"]
 
     @patch('main.get_secret')
-    @patch('main.cloudwatch_client.put_metric_data')
-    def test_webhook_without_secret_configured(self, mock_cloudwatch, mock_get_secret, client, webhook_payload):
+    async def test_webhook_without_secret_configured(self, mock_get_secret, client, webhook_payload):
         """Test webhook endpoint when webhook secret is not configured"""
         # Return secrets without webhook_secret
         mock_get_secret.return_value = {
@@ -141,7 +247,7 @@ class TestWebhookEndpoint:
         }
 
         # Send request without signature (should succeed since no secret is configured)
-        response = client.post(
+        response = await client.post(
             "/webhook",
             json=webhook_payload
         )
@@ -151,73 +257,13 @@ class TestWebhookEndpoint:
         data = response.json()
         assert data["status"] == "received"
 
-    @patch('main.get_secret')
-    @patch('main.cloudwatch_client.put_metric_data')
-    def test_webhook_with_minimal_payload(self, mock_cloudwatch, mock_get_secret, client, mock_secrets):
-        """Test webhook endpoint with minimal required fields"""
-        mock_get_secret.return_value = mock_secrets
-
-        # Minimal payload (only required fields)
-        minimal_payload = {
-            "event_type": "test.event",
-            "payload": {"test": "data"}
-        }
-
-        signature = generate_hmac_signature(minimal_payload, mock_secrets["zapier_webhook_secret"])
-
-        response = client.post(
-            "/webhook",
-            json=minimal_payload,
-            headers={"X-Webhook-Signature": signature}
-        )
-
-        # Verify success
-        assert response.status_code == 200
-        data = response.json()
-        assert data["status"] == "received"
-        # event_id should be "unknown" when not provided
-        assert data["event_id"] == "unknown"
-
-    @patch('main.get_secret')
-    @patch('main.cloudwatch_client.put_metric_data')
-    def test_webhook_with_request_id_header(self, mock_cloudwatch, mock_get_secret, client, mock_secrets, webhook_payload):
-        """Test webhook endpoint with X-Request-ID header for tracking"""
-        mock_get_secret.return_value = mock_secrets
-
-        signature = generate_hmac_signature(webhook_payload, mock_secrets["zapier_webhook_secret"])
-
-        response = client.post(
-            "/webhook",
-            json=webhook_payload,
-            headers={
-                "X-Webhook-Signature": signature,
-                "X-Request-ID": "test-request-123"
-            }
-        )
-
-        # Verify success
-        assert response.status_code == 200
-        assert response.json()["status"] == "received"
-
-    @patch('main.get_secret')
-    @patch('main.cloudwatch_client.put_metric_data')
-    def test_webhook_idempotency(self, mock_cloudwatch, mock_get_secret, client, mock_secrets, webhook_payload):
+    async def test_webhook_idempotency(self, client, webhook_body, webhook_signature):
         """Test webhook endpoint handles duplicate deliveries idempotently"""
-        mock_get_secret.return_value = mock_secrets
-
-        signature = generate_hmac_signature(webhook_payload, mock_secrets["zapier_webhook_secret"])
-
-        # Send same webhook twice
-        response1 = client.post(
-            "/webhook",
-            json=webhook_payload,
-            headers={"X-Webhook-Signature": signature}
-        )
-
-        response2 = client.post(
-            "/webhook",
-            json=webhook_payload,
-            headers={"X-Webhook-Signature": signature}
+        # Send same webhook twice, concurrently on the same event loop
+        headers = {**JSON_HEADERS, "X-Webhook-Signature": webhook_signature}
+        response1, response2 = await asyncio.gather(
+            client.post("/webhook", content=webhook_body, headers=headers),
+            client.post("/webhook", content=webhook_body, headers=headers),
         )
 
         # Both should succeed
@@ -225,107 +271,34 @@ class TestWebhookEndpoint:
         assert response2.status_code == 200
         assert response1.json()["event_id"] == response2.json()["event_id"]
 
-    @patch('main.get_secret')
-    @patch('main.cloudwatch_client.put_metric_data')
-    def test_webhook_with_complex_payload(self, mock_cloudwatch, mock_get_secret, client, mock_secrets):
-        """Test webhook endpoint with complex nested payload"""
-        mock_get_secret.return_value = mock_secrets
-
-        complex_payload = {
-            "event_type": "order.completed",
-            "event_id": "order-12345",
-            "payload": {
-                "order_id": "ORD-2024-001",
-                "customer": {
-                    "id": "CUST-123",
-                    "name": "John Doe",
-                    "email": "john@example.com",
-                    "address": {
-                        "street": "123 Main St",
-                        "city": "New York",
-                        "state": "NY",
-                        "zip": "10001"
-                    }
-                },
-                "items": [
-                    {"sku": "ITEM-001", "quantity": 2, "price": 29.99},
-                    {"sku": "ITEM-002", "quantity": 1, "price": 49.99}
-                ],
-                "total": 109.97,
-                "currency": "USD"
-            },
-            "timestamp": "2024-01-15T10:30:00Z"
-        }
-
-        signature = generate_hmac_signature(complex_payload, mock_secrets["zapier_webhook_secret"])
-
-        response = client.post(
-            "/webhook",
-            json=complex_payload,
-            headers={"X-Webhook-Signature": signature}
-        )
-
-        # Verify success
-        assert response.status_code == 200
-        assert response.json()["event_id"] == "order-12345"
-
-    @patch('main.get_secret')
-    @patch('main.cloudwatch_client.put_metric_data')
-    def test_webhook_cloudwatch_metric_failure(self, mock_cloudwatch, mock_get_secret, client, mock_secrets, webhook_payload):
-        """Test webhook endpoint handles CloudWatch metric failure gracefully"""
-        mock_get_secret.return_value = mock_secrets
-
-        # Make CloudWatch put_metric_data raise an exception
-        mock_cloudwatch.side_effect = Exception("CloudWatch API error")
-
-        signature = generate_hmac_signature(webhook_payload, mock_secrets["zapier_webhook_secret"])
-
-        response = client.post(
-            "/webhook",
-            json=webhook_payload,
-            headers={"X-Webhook-Signature": signature}
-        )
-
-        # Should still succeed even if metric publishing fails
-        assert response.status_code == 200
-        assert response.json()["status"] == "received"
-
-    def test_webhook_with_invalid_json(self, client):
+    async def test_webhook_with_invalid_json(self, client):
         """Test webhook endpoint with malformed JSON"""
-        response = client.post(
+        response = await client.post(
             "/webhook",
-            data="not-valid-json",
+            content="not-valid-json",
             headers={"Content-Type": "application/json"}
         )
 
         # Should return 422 Unprocessable Entity
         assert response.status_code == 422
 
-    @patch('main.get_secret')
-    def test_webhook_missing_required_fields(self, mock_get_secret, client, mock_secrets):
+    async def test_webhook_missing_required_fields(self, client):
         """Test webhook endpoint with missing required fields"""
-        mock_get_secret.return_value = mock_secrets
-
-        # Payload missing event_type
-        invalid_payload = {
-            "payload": {"test": "data"}
-        }
-
-        signature = generate_hmac_signature(invalid_payload, mock_secrets["zapier_webhook_secret"])
+        body, signature = _VECTORS["missing_event_type"]
 
-        response = client.post(
+        response = await client.post(
             "/webhook",
-            json=invalid_payload,
-            headers={"X-Webhook-Signature": signature}
+            content=body,
+            headers={**JSON_HEADERS, "X-Webhook-Signature": signature}
         )
 
         # Should return 422 Unprocessable Entity (validation error)
         assert response.status_code == 422
 
     @patch('main.secret_arn', None)
-    def test_webhook_without_secret_arn_configured(self, client, webhook_payload):
+    async def test_webhook_without_secret_arn_configured(self, client, webhook_payload):
         """Test webhook endpoint when SECRET_ARN is not configured"""
-        response = client.post(
+        response = await client.post(
             "/webhook",
             json=webhook_payload
         )
@@ -346,11 +319,7 @@ class TestWebhookSignatureVerification:
         secret = "test-secret-key"
 
         # Generate valid signature
-        signature = hmac.new(
-            secret.encode('utf-8'),
-            payload,
-            hashlib.sha256
-        ).hexdigest()
+        signature = hmac.digest(secret.encode('utf-8'), payload, 'sha256').hex()
 
         # Verify
         assert verify_webhook_signature(payload, signature, secret) is True
@@ -394,11 +363,7 @@ class TestWebhookSignatureVerification:
         secret = "test-secret-key"
 
         # Generate correct signature
-        correct_signature = hmac.new(
-            secret.encode('utf-8'),
-            payload,
-            hashlib.sha256
-        ).hexdigest()
+        correct_signature = hmac.digest(secret.encode('utf-8'), payload, 'sha256').hex()
 
         # Create signature that differs by one character
         wrong_signature = correct_signature[:-1] + ('a' if correct_signature[-1] != 'a' else 'b')
@@ -406,3 +371,25 @@ class TestWebhookSignatureVerification:
         # Both should fail, and function should use constant-time comparison
         assert verify_webhook_signature(payload, wrong_signature, secret) is False
         assert verify_webhook_signature(payload, "completely-wrong", secret) is False
+
+    def test_signature_verification_rejects_non_canonical_hex(self):
+        """Test signature verification rejects upper-case or spaced-out hex"""
+        from main import verify_webhook_signature
+
+        payload = b'{"event_type":"test","payload":{"test":"data"}}'
+        secret = "test-secret-key"
+        signature = hmac.digest(secret.encode('utf-8'), payload, 'sha256').hex()
+        spaced_signature = " ".join(signature[i:i + 2] for i in range(0, len(signature), 2))
+
+        assert verify_webhook_signature(payload, signature.upper(), secret) is False
+        assert verify_webhook_signature(payload, spaced_signature, secret) is False
+
+    def test_signature_verification_with_truncated_signature(self):
+        """Test signature verification rejects a valid-hex prefix of the signature"""
+        from main import verify_webhook_signature
+
+        payload = b'{"event_type":"test","payload":{"test":"data"}}'
+        secret = "test-secret-key"
+        signature = hmac.digest(secret.encode('utf-8'), payload, 'sha256').hex()
+
+        assert verify_webhook_signature(payload, signature[:32], secret) is False
@@ -4,23 +4,35 @@ Polls events from /inbox and dispatches them to configured webhook URLs
 Implements retry logic with exponential backoff
 """
 import os
-import json
+import atexit
+import logging
+import base64
+import hmac
 import time
+import random
 import asyncio
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+import contextlib
+import functools
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timezone
 from decimal import Decimal
 
 import httpx
+import orjson
 import boto3
 from boto3.dynamodb.conditions import Key
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
-# AWS X-Ray instrumentation
-from aws_xray_sdk.core import xray_recorder, patch_all
+# AWS X-Ray instrumentation. Only the processing run is traced (see handler);
+# patch_all() would wrap every boto3 and HTTP call on the hot path.
+from aws_xray_sdk.core import xray_recorder
 
-# Patch all AWS SDK calls for automatic tracing
-patch_all()
+# Logging (Lambda forwards records to CloudWatch Logs; per-event detail is DEBUG)
+logger = logging.getLogger(__name__)
+logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO').upper())
 
 # Environment configuration
 API_BASE_URL = os.environ.get('API_BASE_URL')
@@ -29,30 +41,122 @@ DYNAMODB_TABLE_NAME = os.environ.get('DYNAMODB_TABLE_NAME')
 AWS_REGION = os.environ.get('AWS_REGION', 'us-east-2')
 MAX_EVENTS_PER_RUN = int(os.environ.get('MAX_EVENTS_PER_RUN', '100'))
 
+# Largest page the API's /inbox endpoint will return
+INBOX_MAX_LIMIT = 100
+
 # Retry configuration
 MAX_RETRIES = 3
 INITIAL_BACKOFF_SECONDS = 1
 MAX_BACKOFF_SECONDS = 60
 
+# Wall-clock budget for one event across all attempts and backoff, so a
+# doomed delivery can't eat into the Lambda timeout (300s)
+DELIVERY_BUDGET_SECONDS = float(os.environ.get('DELIVERY_BUDGET_SECONDS', '120'))
+
+# Webhook responses worth retrying: request timeouts, throttling, and
+# transient server errors. Any other non-2xx status fails immediately.
+RETRYABLE_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+# Maximum webhook requests in flight at once, so a full batch doesn't hit the
+# webhook with MAX_EVENTS_PER_RUN simultaneous requests and trigger 429s.
+# The effective limit adapts between the minimum and maximum (see DeliveryLimiter).
+DELIVERY_CONCURRENCY = int(os.environ.get('DELIVERY_CONCURRENCY', '20'))
+DELIVERY_MIN_CONCURRENCY = min(4, DELIVERY_CONCURRENCY)
+
+# HTTP client configuration (one pooled client is shared by every request,
+# and kept alive across warm invocations)
+HTTP_TIMEOUT_SECONDS = 30.0
+HTTP_LIMITS = httpx.Limits(
+    max_connections=MAX_EVENTS_PER_RUN * 2,
+    max_keepalive_connections=MAX_EVENTS_PER_RUN,
+    # Long enough to keep connections open through retry backoff
+    keepalive_expiry=30.0
+)
+
+# Headers for webhook deliveries, shared by every attempt (httpx copies them
+# into each request, so the dict is never mutated)
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
 # Initialize AWS clients
-dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+# Standard retry mode backs off with jitter on throttling
+# (ProvisionedThroughputExceeded, Throttling) and transient 5xx errors
+DYNAMODB_CONFIG = Config(retries={'max_attempts': 5, 'mode': 'standard'})
+dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION, config=DYNAMODB_CONFIG)
 table = dynamodb.Table(DYNAMODB_TABLE_NAME)
 secrets_client = boto3.client('secretsmanager', region_name=AWS_REGION)
 cloudwatch_client = boto3.client('cloudwatch', region_name=AWS_REGION)
 
+# Init-phase preloading has to finish well inside Lambda's 10s init limit, so
+# it gets its own short deadlines and falls back to fetching on demand
+INIT_PRELOAD_TIMEOUT_SECONDS = 3.0
+INIT_SECRETS_CONFIG = Config(connect_timeout=1, read_timeout=2, retries={'max_attempts': 1})
+
+# Blocking boto3 calls run on this pool so they don't stall the event loop
+# while deliveries are in flight; its size caps concurrent AWS requests
+AWS_MAX_CONCURRENCY = int(os.environ.get('AWS_MAX_CONCURRENCY', '16'))
+_aws_executor = ThreadPoolExecutor(max_workers=AWS_MAX_CONCURRENCY, thread_name_prefix='aws')
+
+# Delivery status updates never overwrite an event that is already delivered
+NOT_DELIVERED_CONDITION = "attribute_not_exists(#status) OR #status <> :delivered"
+
 # CloudWatch namespace
 CLOUDWATCH_NAMESPACE = 'ZapierTriggersAPI/Dispatcher'
 
+# Single-value metrics published by publish_metrics: (metrics key, metric name, unit)
+_METRIC_SPEC = (
+    ('total_events', 'EventsProcessed', 'Count'),
+    ('successful_deliveries', 'SuccessfulDeliveries', 'Count'),
+    ('failed_deliveries', 'DeliveryFailures', 'Count'),
+    ('total_retries', 'RetryCount', 'Count'),
+)
+
+# PutMetricData accepts at most 150 distinct values per datum
+CLOUDWATCH_MAX_VALUES_PER_DATUM = 150
+
+# Emit metrics as CloudWatch Embedded Metric Format (EMF) log lines instead of
+# calling PutMetricData. CloudWatch Logs extracts them asynchronously, so no
+# API call sits on the end of each invocation.
+USE_EMF = os.environ.get('USE_EMF', '').lower() in ('1', 'true', 'yes')
+
+# EMF accepts at most 100 values per metric in one log record
+EMF_MAX_VALUES_PER_METRIC = 100
+
 # Global cache for secrets (Lambda container reuse optimization)
-_secrets_cache: Dict[str, Any] = {}
+# Entries expire so rotated secrets are picked up by warm containers
+SECRETS_CACHE_TTL_SECONDS = int(os.environ.get('SECRETS_CACHE_TTL_SECONDS', '300'))
+_secrets_cache: Dict[str, Dict[str, Any]] = {}
+
+# Global cache for the API JWT; reused across warm invocations until it is
+# within TOKEN_REFRESH_MARGIN_SECONDS of expiring
+_token_cache: Dict[str, Any] = {'token': None, 'exp': 0}
+TOKEN_REFRESH_MARGIN_SECONDS = 60
+
+# Keyed HMAC prototype for webhook signing; copying it per event skips
+# re-deriving the key pads. Rebuilt when the webhook secret changes.
+_signing_cache: Dict[str, Any] = {'secret': None, 'hmac': None}
+
+# Event loop and HTTP client kept alive across warm invocations so pooled
+# connections (and their TLS sessions) survive between runs. asyncio.run
+# would close the loop, and with it every connection, after each invocation.
+_event_loop: Optional[asyncio.AbstractEventLoop] = None
+_http_client: Optional[httpx.AsyncClient] = None
 
+# Delivery concurrency limit learned by the previous run; warm invocations
+# start from it instead of probing the webhook from scratch
+_delivery_concurrency = DELIVERY_CONCURRENCY
 
-def get_secret(secret_id: str) -> Dict[str, Any]:
+
+def get_secret(secret_id: str, client: Optional[Any] = None) -> Dict[str, Any]:
     """
     Retrieve a secret from AWS Secrets Manager with caching.
 
+    Cached values are reused for SECRETS_CACHE_TTL_SECONDS (default 300s)
+    before Secrets Manager is called again.
+
     Args:
         secret_id: The ARN or name of the secret
+        client: Secrets Manager client to read through (defaults to the
+            module-level client)
 
     Returns:
         Dict containing the secret values
@@ -60,18 +164,23 @@ def get_secret(secret_id: str) -> Dict[str, Any]:
     Raises:
         Exception: If secret retrieval fails
     """
-    if secret_id in _secrets_cache:
-        return _secrets_cache[secret_id]
+    now = time.time()
+    cached = _secrets_cache.get(secret_id)
+    if cached and now - cached['timestamp'] < SECRETS_CACHE_TTL_SECONDS:
+        return cached['data']
 
     try:
-        response = secrets_client.get_secret_value(SecretId=secret_id)
+        response = (client or secrets_client).get_secret_value(SecretId=secret_id)
 
         if 'SecretString' in response:
-            secret_data = json.loads(response['SecretString'])
+            secret_data = orjson.loads(response['SecretString'])
         else:
             secret_data = response['SecretBinary']
 
-        _secrets_cache[secret_id] = secret_data
+        _secrets_cache[secret_id] = {
+            'data': secret_data,
+            'timestamp': now
+        }
         return secret_data
 
     except ClientError as e:
@@ -81,16 +190,113 @@ def get_secret(secret_id: str) -> Dict[str, Any]:
         raise Exception(f"Unexpected error retrieving secret: {str(e)}")
 
 
-def get_jwt_token() -> str:
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return the Lambda-wide event loop, creating it on first use.
+    """
+    global _event_loop
+    if _event_loop is None or _event_loop.is_closed():
+        _event_loop = asyncio.new_event_loop()
+    return _event_loop
+
+
+def make_http_client(transport: Optional[httpx.AsyncBaseTransport] = None) -> httpx.AsyncClient:
+    """
+    Build an HTTP client configured for the dispatcher.
+
+    Args:
+        transport: Optional transport override (tests pass httpx.MockTransport)
+
+    Returns:
+        New AsyncClient
+    """
+    if transport is None:
+        # HTTP/2 multiplexes concurrent deliveries to the webhook host over one
+        # connection. Transport-level retries stay off: delivery retries are
+        # handled (with backoff) by deliver_event_with_retry.
+        transport = httpx.AsyncHTTPTransport(http2=True, limits=HTTP_LIMITS, retries=0)
+    return httpx.AsyncClient(timeout=HTTP_TIMEOUT_SECONDS, transport=transport)
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the Lambda-wide pooled HTTP client, creating it on first use.
+
+    Only use it on the persistent event loop, which owns the client's
+    connections.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = make_http_client()
+    return _http_client
+
+
+def _close_http_client():
+    """
+    Close the pooled client and event loop when the container shuts down.
+    """
+    if _event_loop is None or _event_loop.is_closed():
+        return
+    if _http_client is not None and not _http_client.is_closed:
+        _event_loop.run_until_complete(_http_client.aclose())
+    _event_loop.close()
+
+
+atexit.register(_close_http_client)
+
+
+async def run_aws_call(func, *args, **kwargs):
+    """
+    Run a blocking AWS SDK call on the bounded AWS thread pool.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _aws_executor,
+        functools.partial(func, *args, **kwargs)
+    )
+
+
+def _token_expiry(token: str) -> float:
+    """
+    Read the exp claim from a JWT without verifying it.
+
+    The dispatcher only uses this to decide when to refresh its cached token;
+    the API still verifies the signature on every request.
+
+    Args:
+        token: JWT access token
+
+    Returns:
+        Expiry as a Unix timestamp, or 0 if it cannot be read
+    """
+    try:
+        payload_segment = token.split('.')[1]
+        padding = '=' * (-len(payload_segment) % 4)
+        claims = orjson.loads(base64.urlsafe_b64decode(payload_segment + padding))
+        return float(claims.get('exp', 0))
+    except (IndexError, ValueError, TypeError, AttributeError):
+        return 0
+
+
+async def get_jwt_token(client: httpx.AsyncClient) -> str:
     """
     Authenticate with the API and get a JWT token.
 
+    Returns the cached token while it has more than
+    TOKEN_REFRESH_MARGIN_SECONDS left before expiry.
+
+    Args:
+        client: Shared HTTP client
+
     Returns:
         JWT access token
 
     Raises:
         Exception: If authentication fails
     """
+    if _token_cache['token'] and _token_cache['exp'] - time.time() > TOKEN_REFRESH_MARGIN_SECONDS:
+        return _token_cache['token']
+
     secrets = get_secret(SECRET_ARN)
     api_key = secrets.get('zapier_api_key')
 
@@ -100,28 +306,33 @@ def get_jwt_token() -> str:
     # Authenticate to get JWT token
     token_url = f"{API_BASE_URL}/token"
 
-    with httpx.Client(timeout=30.0) as client:
-        response = client.post(
-            token_url,
-            data={
-                'username': 'api',
-                'password': api_key
-            },
-            headers={'Content-Type': 'application/x-www-form-urlencoded'}
-        )
+    response = await client.post(
+        token_url,
+        data={
+            'username': 'api',
+            'password': api_key
+        },
+        headers={'Content-Type': 'application/x-www-form-urlencoded'}
+    )
 
-        if response.status_code != 200:
-            raise Exception(f"Authentication failed: {response.status_code} - {response.text}")
+    if response.status_code != 200:
+        raise Exception(f"Authentication failed: {response.status_code} - {response.text}")
 
-        token_data = response.json()
-        return token_data['access_token']
+    token = response.json()['access_token']
+    _token_cache['token'] = token
+    _token_cache['exp'] = _token_expiry(token)
+    return token
 
 
-async def fetch_pending_events(token: str) -> List[Dict[str, Any]]:
+async def fetch_pending_events(client: httpx.AsyncClient, token: str) -> List[Dict[str, Any]]:
     """
     Fetch pending events from the /inbox endpoint.
 
+    Only MAX_EVENTS_PER_RUN events are requested, so the API doesn't query,
+    serialize, and send events this run would discard.
+
     Args:
+        client: Shared HTTP client
         token: JWT access token
 
     Returns:
@@ -132,30 +343,118 @@ async def fetch_pending_events(token: str) -> List[Dict[str, Any]]:
     """
     inbox_url = f"{API_BASE_URL}/inbox"
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        response = await client.get(
-            inbox_url,
-            headers={'Authorization': f'Bearer {token}'}
-        )
+    response = await client.get(
+        inbox_url,
+        params={'limit': min(MAX_EVENTS_PER_RUN, INBOX_MAX_LIMIT)},
+        headers={'Authorization': f'Bearer {token}'}
+    )
+
+    if response.status_code != 200:
+        raise Exception(f"Failed to fetch inbox: {response.status_code} - {response.text}")
+
+    # orjson decodes the raw body directly, instead of response.json()'s
+    # stdlib decoder
+    return orjson.loads(response.content)
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header given in delta-seconds.
+
+    HTTP-date values and malformed headers are ignored (returns None), in which
+    case the normal backoff applies.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
 
-        if response.status_code != 200:
-            raise Exception(f"Failed to fetch inbox: {response.status_code} - {response.text}")
 
-        return response.json()
+class DeliveryLimiter:
+    """
+    Limit concurrent webhook requests, adapting the limit with AIMD.
+
+    Each 2xx response raises the limit by one (up to max_limit) and each 429
+    or 503 halves it (down to min_limit), so throughput settles near what the
+    webhook can take. Lowering the limit never interrupts requests already in
+    flight; new requests wait until the in-flight count drops below it.
+
+    Create one per run: it holds asyncio primitives bound to the running loop.
+    """
+
+    def __init__(self, limit: int, min_limit: int = 1, max_limit: Optional[int] = None):
+        self.min_limit = min_limit
+        self.max_limit = max_limit or limit
+        self.limit = max(min_limit, min(limit, self.max_limit))
+        self._in_flight = 0
+        self._condition = asyncio.Condition()
+
+    async def __aenter__(self) -> 'DeliveryLimiter':
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        return self
+
+    async def __aexit__(self, *exc_info):
+        async with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def record(self, status_code: int):
+        """
+        Adjust the limit from a webhook response status.
+        """
+        if 200 <= status_code < 300:
+            self.limit = min(self.limit + 1, self.max_limit)
+        elif status_code in (429, 503):
+            self.limit = max(self.limit // 2, self.min_limit)
+
+
+def sign_payload(body: bytes, secret: str) -> str:
+    """
+    Compute the X-Webhook-Signature value for a delivery body.
+
+    Matches the API's verify_webhook_signature: hex-encoded HMAC-SHA256 of
+    the raw request body.
+
+    Args:
+        body: Serialized request body
+        secret: Shared webhook signing secret
+
+    Returns:
+        Hex signature
+    """
+    if _signing_cache['secret'] != secret:
+        _signing_cache['hmac'] = hmac.new(secret.encode('utf-8'), digestmod='sha256')
+        _signing_cache['secret'] = secret
+
+    signer = _signing_cache['hmac'].copy()
+    signer.update(body)
+    return signer.hexdigest()
 
 
 async def deliver_event_with_retry(
+    client: httpx.AsyncClient,
     event: Dict[str, Any],
     webhook_url: str,
-    max_retries: int = MAX_RETRIES
+    max_retries: int = MAX_RETRIES,
+    limiter: Optional[DeliveryLimiter] = None,
+    webhook_secret: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Deliver an event to a webhook URL with exponential backoff retry logic.
 
     Args:
+        client: Shared HTTP client
         event: The event data to deliver
         webhook_url: The destination webhook URL
         max_retries: Maximum number of retry attempts
+        limiter: Optional limit on concurrent webhook requests; only held
+            while a request is in flight, not during backoff
+        webhook_secret: Optional secret used to sign the body
+            (X-Webhook-Signature)
 
     Returns:
         Dict with delivery status and metadata
@@ -164,76 +463,98 @@ async def deliver_event_with_retry(
     attempt = 0
     backoff = INITIAL_BACKOFF_SECONDS
     last_error = None
+    deadline = time.monotonic() + DELIVERY_BUDGET_SECONDS
+
+    # Serialize and sign once; every retry sends the same bytes and headers
+    body = orjson.dumps(event)
+    headers = _JSON_HEADERS
+    if webhook_secret:
+        headers = {**_JSON_HEADERS, 'X-Webhook-Signature': sign_payload(body, webhook_secret)}
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        while attempt < max_retries:
-            attempt += 1
+    while attempt < max_retries:
+        attempt += 1
 
-            try:
-                print(f"Delivering event {event_id} to {webhook_url} (attempt {attempt}/{max_retries})")
+        retry_after = None
 
-                # Send event to webhook
+        try:
+            logger.debug("Delivering event %s to %s (attempt %d/%d)", event_id, webhook_url, attempt, max_retries)
+
+            # Send event to webhook
+            async with limiter or contextlib.nullcontext():
+                sent_at = time.perf_counter()
                 response = await client.post(
                     webhook_url,
-                    json=event,
-                    headers={'Content-Type': 'application/json'}
+                    content=body,
+                    headers=headers
                 )
+                response_time_ms = (time.perf_counter() - sent_at) * 1000
+                if limiter:
+                    limiter.record(response.status_code)
+
+            # Check if delivery was successful
+            if response.status_code in (200, 201, 202, 204):
+                logger.debug("Successfully delivered event %s on attempt %d", event_id, attempt)
+
+                return {
+                    'success': True,
+                    'event_id': event_id,
+                    'attempts': attempt,
+                    'status_code': response.status_code,
+                    'response_time_ms': response_time_ms
+                }
+
+            # Non-retryable error
+            if response.status_code not in RETRYABLE_STATUS_CODES:
+                logger.warning("Non-retryable error for event %s: %d", event_id, response.status_code)
 
-                # Check if delivery was successful
-                if response.status_code in (200, 201, 202, 204):
-                    print(f"Successfully delivered event {event_id} on attempt {attempt}")
-
-                    return {
-                        'success': True,
-                        'event_id': event_id,
-                        'attempts': attempt,
-                        'status_code': response.status_code,
-                        'response_time_ms': response.elapsed.total_seconds() * 1000
-                    }
-
-                # Non-retryable error (4xx except 429)
-                if 400 <= response.status_code < 500 and response.status_code != 429:
-                    print(f"Non-retryable error for event {event_id}: {response.status_code}")
-
-                    return {
-                        'success': False,
-                        'event_id': event_id,
-                        'attempts': attempt,
-                        'error': f"HTTP {response.status_code}",
-                        'retryable': False
-                    }
-
-                # Retryable error (5xx or 429)
-                last_error = f"HTTP {response.status_code}"
-                print(f"Retryable error for event {event_id}: {response.status_code}")
-
-            except httpx.TimeoutException as e:
-                last_error = f"Timeout: {str(e)}"
-                print(f"Timeout delivering event {event_id}: {str(e)}")
-
-            except httpx.RequestError as e:
-                last_error = f"Request error: {str(e)}"
-                print(f"Request error delivering event {event_id}: {str(e)}")
-
-            except Exception as e:
-                last_error = f"Unexpected error: {str(e)}"
-                print(f"Unexpected error delivering event {event_id}: {str(e)}")
-
-            # If we haven't returned yet, we need to retry
-            if attempt < max_retries:
-                # Calculate exponential backoff with jitter
-                sleep_time = min(backoff, MAX_BACKOFF_SECONDS)
-                print(f"Retrying event {event_id} in {sleep_time}s...")
-                await asyncio.sleep(sleep_time)
-                backoff *= 2  # Exponential backoff
-
-    # All retries exhausted
-    print(f"Failed to deliver event {event_id} after {max_retries} attempts")
+                return {
+                    'success': False,
+                    'event_id': event_id,
+                    'attempts': attempt,
+                    'error': f"HTTP {response.status_code}",
+                    'retryable': False
+                }
+
+            # Retryable error (see RETRYABLE_STATUS_CODES)
+            last_error = f"HTTP {response.status_code}"
+            logger.info("Retryable error for event %s: %d", event_id, response.status_code)
+
+            if response.status_code in (429, 503):
+                retry_after = _parse_retry_after(response.headers.get('retry-after'))
+
+        except httpx.TimeoutException as e:
+            last_error = f"Timeout: {str(e)}"
+            logger.info("Timeout delivering event %s: %s", event_id, e)
+
+        except httpx.RequestError as e:
+            last_error = f"Request error: {str(e)}"
+            logger.info("Request error delivering event %s: %s", event_id, e)
+
+        except Exception as e:
+            last_error = f"Unexpected error: {str(e)}"
+            logger.exception("Unexpected error delivering event %s", event_id)
+
+        # If we haven't returned yet, we need to retry
+        if attempt < max_retries:
+            # Full jitter keeps concurrent failing deliveries from retrying in lockstep
+            sleep_time = random.uniform(0, min(backoff, MAX_BACKOFF_SECONDS))
+            if retry_after is not None:
+                # Honour the server's Retry-After (capped so one event can't stall the run)
+                sleep_time = max(sleep_time, min(retry_after, MAX_BACKOFF_SECONDS))
+            if time.monotonic() + sleep_time >= deadline:
+                logger.warning("Delivery budget of %.0fs exhausted for event %s", DELIVERY_BUDGET_SECONDS, event_id)
+                break
+            logger.debug("Retrying event %s in %.2fs", event_id, sleep_time)
+            await asyncio.sleep(sleep_time)
+            backoff *= 2  # Exponential backoff
+
+    # All retries exhausted (or the delivery budget ran out)
+    logger.warning("Failed to deliver event %s after %d attempts", event_id, attempt)
 
     return {
         'success': False,
         'event_id': event_id,
-        'attempts': max_retries,
+        'attempts': attempt,
         'error': last_error,
         'retryable': True
     }
@@ -243,69 +564,75 @@ async def update_event_delivery_status(
     event_id: str,
     created_at: str,
     attempts: int,
-    success: bool,
     error_message: Optional[str] = None
 ):
     """
-    Update event delivery tracking fields in DynamoDB (Task 22.4).
+    Record a failed delivery's tracking fields in DynamoDB (Task 22.4).
+
+    Successful deliveries are recorded by the API's ack endpoint instead.
+    Events already marked delivered (e.g. acked by another run) are left
+    untouched, so a late or duplicate update can't regress them.
 
     Args:
         event_id: The event ID
         created_at: The event creation timestamp (sort key)
         attempts: Number of delivery attempts
-        success: Whether delivery was successful
-        error_message: Error message if delivery failed
+        error_message: Error message from the last failed attempt
     """
     try:
-        timestamp = datetime.utcnow().isoformat() + "Z"
-
-        # Build update expression based on success/failure
-        if success:
-            # On success, these fields are updated by the API's ack endpoint
-            # We just update the attempt counter here
-            table.update_item(
-                Key={
-                    'id': event_id,
-                    'created_at': created_at
-                },
-                UpdateExpression="SET delivery_attempts = :attempts, last_delivery_attempt = :last_attempt",
-                ExpressionAttributeValues={
-                    ':attempts': attempts,
-                    ':last_attempt': timestamp
-                }
-            )
-        else:
-            # On failure, update all tracking fields including error message
-            table.update_item(
-                Key={
-                    'id': event_id,
-                    'created_at': created_at
-                },
-                UpdateExpression="SET delivery_attempts = :attempts, last_delivery_attempt = :last_attempt, error_message = :error, #status = :status",
-                ExpressionAttributeNames={
-                    '#status': 'status'
-                },
-                ExpressionAttributeValues={
-                    ':attempts': attempts,
-                    ':last_attempt': timestamp,
-                    ':error': error_message or 'Unknown error',
-                    ':status': 'failed'
-                }
-            )
+        timestamp = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+
+        # boto3 is blocking; run it on the AWS pool so concurrent
+        # updates overlap instead of stalling the event loop one by one
+        await run_aws_call(
+            table.update_item,
+            Key={
+                'id': event_id,
+                'created_at': created_at
+            },
+            UpdateExpression="SET delivery_attempts = :attempts, last_delivery_attempt = :last_attempt, error_message = :error, #status = :status",
+            ConditionExpression=NOT_DELIVERED_CONDITION,
+            ExpressionAttributeNames={
+                '#status': 'status'
+            },
+            ExpressionAttributeValues={
+                ':attempts': attempts,
+                ':last_attempt': timestamp,
+                ':error': error_message or 'Unknown error',
+                ':status': 'failed',
+                ':delivered': 'delivered'
+            }
+        )
 
-        print(f"Updated delivery status for event {event_id}: attempts={attempts}, success={success}")
+        logger.debug("Recorded failed delivery for event %s: attempts=%d", event_id, attempts)
+
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            logger.debug("Event %s already delivered; delivery status left unchanged", event_id)
+        else:
+            logger.error("Failed to update delivery status for event %s: %s", event_id, e)
 
     except Exception as e:
-        print(f"Failed to update delivery status for event {event_id}: {str(e)}")
+        logger.error("Failed to update delivery status for event %s: %s", event_id, e)
 
 
-async def acknowledge_event(event_id: str, token: str) -> bool:
+async def acknowledge_event(
+    client: httpx.AsyncClient,
+    event_id: str,
+    token: str,
+    attempts: int = 1
+) -> bool:
     """
     Acknowledge successful event delivery via the /inbox/{id}/ack endpoint.
 
+    The ack also records the delivery attempt count, so a successful delivery
+    needs no separate DynamoDB write.
+
     Args:
+        client: Shared HTTP client
         event_id: The event ID to acknowledge
         token: JWT access token
+        attempts: Number of delivery attempts it took
 
     Returns:
         True if acknowledgment was successful, False otherwise
@@ -313,89 +640,188 @@ async def acknowledge_event(event_id: str, token: str) -> bool:
     ack_url = f"{API_BASE_URL}/inbox/{event_id}/ack"
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                ack_url,
-                headers={'Authorization': f'Bearer {token}'}
-            )
+        response = await client.post(
+            ack_url,
+            json={'attempts': attempts},
+            headers={'Authorization': f'Bearer {token}'}
+        )
 
-            if response.status_code in (200, 201, 204):
-                print(f"Successfully acknowledged event {event_id}")
-                return True
-            else:
-                print(f"Failed to acknowledge event {event_id}: {response.status_code} - {response.text}")
-                return False
+        if response.status_code in (200, 201, 204):
+            logger.debug("Successfully acknowledged event %s", event_id)
+            return True
+        else:
+            logger.warning("Failed to acknowledge event %s: %d - %s", event_id, response.status_code, response.text)
+            return False
 
     except Exception as e:
-        print(f"Error acknowledging event {event_id}: {str(e)}")
+        logger.error("Error acknowledging event %s: %s", event_id, e)
         return False
 
 
+async def acknowledge_events_batch(
+    client: httpx.AsyncClient,
+    acks: List[Tuple[str, int]],
+    token: str
+) -> int:
+    """
+    Acknowledge successful deliveries with one call to the /inbox/ack endpoint.
+
+    One request per run replaces one /inbox/{id}/ack request (and API Lambda
+    invocation) per event. Only an API without the batch endpoint (404/405)
+    falls back to acking each event with acknowledge_event; any other failure
+    may come after the batch was applied, so re-acking could double-count
+    attempts and delivery metrics. Those events stay pending and are
+    redelivered on the next run.
+
+    Args:
+        client: Shared HTTP client
+        acks: (event ID, delivery attempts) pairs, at most INBOX_MAX_LIMIT
+        token: JWT access token
+
+    Returns:
+        Number of events acknowledged
+    """
+    if not acks:
+        return 0
+
+    ack_url = f"{API_BASE_URL}/inbox/ack"
+
+    try:
+        response = await client.post(
+            ack_url,
+            content=orjson.dumps({
+                'acks': [{'id': event_id, 'attempts': attempts} for event_id, attempts in acks]
+            }),
+            headers={**_JSON_HEADERS, 'Authorization': f'Bearer {token}'}
+        )
+
+        if response.status_code == 200:
+            body = orjson.loads(response.content)
+            if body['failed']:
+                logger.warning("Failed to acknowledge events: %s", body['failed'])
+            logger.debug("Acknowledged %d events in batch", len(body['acknowledged']))
+            return len(body['acknowledged'])
+
+        if response.status_code not in (404, 405):
+            logger.warning("Batch acknowledgment failed: %d - %s", response.status_code, response.text)
+            return 0
+
+    except Exception as e:
+        logger.error("Error acknowledging events in batch: %s", e)
+        return 0
+
+    logger.info("Batch acknowledgment unavailable (%d); acking events individually", response.status_code)
+    acknowledged = await asyncio.gather(*(
+        acknowledge_event(client, event_id, token, attempts=attempts)
+        for event_id, attempts in acks
+    ))
+    return sum(acknowledged)
+
+
+def _emf_records(metrics: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Build CloudWatch Embedded Metric Format records for publish_metrics.
+
+    Count metrics go in the first record. Delivery latencies are sent as
+    value arrays, split across records when there are more than
+    EMF_MAX_VALUES_PER_METRIC of them.
+
+    Args:
+        metrics: Dictionary containing metric data
+
+    Returns:
+        List of EMF records (empty if there is nothing to publish)
+    """
+    timestamp_ms = int(time.time() * 1000)
+    counts = {
+        metric_name: (metrics[key], unit)
+        for key, metric_name, unit in _METRIC_SPEC
+        if key in metrics
+    }
+    latencies = [round(t) for t in metrics.get('delivery_times_ms') or []]
+    latency_chunks = [
+        latencies[i:i + EMF_MAX_VALUES_PER_METRIC]
+        for i in range(0, len(latencies), EMF_MAX_VALUES_PER_METRIC)
+    ]
+
+    records = []
+    for i in range(max(len(latency_chunks), 1 if counts else 0)):
+        record_metrics = dict(counts) if i == 0 else {}
+        if i < len(latency_chunks):
+            record_metrics['DispatcherDeliveryLatency'] = (latency_chunks[i], 'Milliseconds')
+
+        records.append({
+            '_aws': {
+                'Timestamp': timestamp_ms,
+                'CloudWatchMetrics': [{
+                    'Namespace': CLOUDWATCH_NAMESPACE,
+                    'Dimensions': [[]],
+                    'Metrics': [
+                        {'Name': name, 'Unit': unit}
+                        for name, (_, unit) in record_metrics.items()
+                    ]
+                }]
+            },
+            **{name: value for name, (value, _) in record_metrics.items()}
+        })
+
+    return records
+
+
 def publish_metrics(metrics: Dict[str, Any]):
     """
     Publish custom metrics to CloudWatch.
 
+    Uses EMF log lines when USE_EMF is set, otherwise PutMetricData.
+
     Args:
         metrics: Dictionary containing metric data
     """
     try:
-        metric_data = []
-        timestamp = datetime.utcnow()
-
-        # Total events processed
-        if 'total_events' in metrics:
-            metric_data.append({
-                'MetricName': 'EventsProcessed',
-                'Value': metrics['total_events'],
-                'Unit': 'Count',
+        if USE_EMF:
+            # Written straight to stdout: EMF records must be bare JSON lines,
+            # which a logging formatter would prefix
+            for record in _emf_records(metrics):
+                print(orjson.dumps(record).decode(), flush=True)
+            return
+
+        timestamp = datetime.now(timezone.utc)
+
+        # Count metrics (DeliveryFailures and RetryCount are Task 22.4)
+        metric_data = [
+            {
+                'MetricName': metric_name,
+                'Value': metrics[key],
+                'Unit': unit,
                 'Timestamp': timestamp
-            })
-
-        # Successful deliveries
-        if 'successful_deliveries' in metrics:
-            metric_data.append({
-                'MetricName': 'SuccessfulDeliveries',
-                'Value': metrics['successful_deliveries'],
-                'Unit': 'Count',
-                'Timestamp': timestamp
-            })
-
-        # Failed deliveries (Task 22.4)
-        if 'failed_deliveries' in metrics:
-            metric_data.append({
-                'MetricName': 'DeliveryFailures',
-                'Value': metrics['failed_deliveries'],
-                'Unit': 'Count',
-                'Timestamp': timestamp
-            })
-
-        # Average delivery time
-        if 'avg_delivery_time_ms' in metrics:
-            metric_data.append({
-                'MetricName': 'DispatcherDeliveryLatency',
-                'Value': metrics['avg_delivery_time_ms'],
-                'Unit': 'Milliseconds',
-                'Timestamp': timestamp
-            })
-
-        # Total retry attempts (Task 22.4)
-        if 'total_retries' in metrics:
-            metric_data.append({
-                'MetricName': 'RetryCount',
-                'Value': metrics['total_retries'],
-                'Unit': 'Count',
-                'Timestamp': timestamp
-            })
+            }
+            for key, metric_name, unit in _METRIC_SPEC
+            if key in metrics
+        ]
+
+        # Delivery latency distribution, sent as Values/Counts (rounded to
+        # whole milliseconds) so CloudWatch can serve p50/p95/p99
+        if metrics.get('delivery_times_ms'):
+            latency_counts = list(Counter(round(t) for t in metrics['delivery_times_ms']).items())
+            for i in range(0, len(latency_counts), CLOUDWATCH_MAX_VALUES_PER_DATUM):
+                chunk = latency_counts[i:i + CLOUDWATCH_MAX_VALUES_PER_DATUM]
+                metric_data.append({
+                    'MetricName': 'DispatcherDeliveryLatency',
+                    'Values': [value for value, _ in chunk],
+                    'Counts': [count for _, count in chunk],
+                    'Unit': 'Milliseconds',
+                    'Timestamp': timestamp
+                })
 
         if metric_data:
             cloudwatch_client.put_metric_data(
                 Namespace=CLOUDWATCH_NAMESPACE,
                 MetricData=metric_data
             )
-            print(f"Published {len(metric_data)} metrics to CloudWatch")
+            logger.info("Published %d metrics to CloudWatch", len(metric_data))
 
     except Exception as e:
-        print(f"Failed to publish metrics: {str(e)}")
+        logger.error("Failed to publish metrics: %s", e)
 
 
 async def process_events():
@@ -409,20 +835,77 @@ async def process_events():
     start_time = time.time()
 
     # Get secrets for webhook URL
-    secrets = get_secret(SECRET_ARN)
+    secrets = await run_aws_call(get_secret, SECRET_ARN)
     webhook_url = secrets.get('zapier_webhook_url')
 
     if not webhook_url:
         raise Exception("Webhook URL not configured in secrets")
 
-    # Authenticate and get JWT token
-    token = get_jwt_token()
+    # One pooled client shared by deliveries and acks, and reused by later
+    # warm invocations, so requests to the same host skip the TLS handshake
+    client = get_http_client()
+
+    # Authenticate and get JWT token (cached across warm invocations)
+    token = await get_jwt_token(client)
+
+    return await _process_pending_events(
+        client, token, webhook_url, start_time,
+        webhook_secret=secrets.get('zapier_webhook_secret')
+    )
+
+
+async def _deliver_and_record(
+    client: httpx.AsyncClient,
+    event: Dict[str, Any],
+    webhook_url: str,
+    limiter: DeliveryLimiter,
+    webhook_secret: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Deliver one event and record it in DynamoDB if delivery failed (Task 22.4).
+
+    The failure write runs as soon as this event's delivery finishes, so a
+    slow webhook only holds up its own event. Successful deliveries are
+    acked together once the whole batch is done.
+
+    Returns:
+        Delivery result
+    """
+    result = await deliver_event_with_retry(
+        client, event, webhook_url, limiter=limiter, webhook_secret=webhook_secret
+    )
+
+    if not result['success']:
+        await update_event_delivery_status(
+            event_id=result['event_id'],
+            created_at=event['created_at'],
+            attempts=result['attempts'],
+            error_message=result.get('error')
+        )
+
+    return result
+
+
+async def _process_pending_events(
+    client: httpx.AsyncClient,
+    token: str,
+    webhook_url: str,
+    start_time: float,
+    webhook_secret: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Fetch, deliver, and acknowledge pending events using the shared client.
 
+    Deliveries are signed when webhook_secret is set.
+
+    Returns:
+        Dict with processing statistics
+    """
     # Fetch pending events
-    events = await fetch_pending_events(token)
+    events = await fetch_pending_events(client, token)
 
     if not events:
-        print("No pending events to process")
+        logger.info("No pending events to process")
         return {
             'total_events': 0,
             'successful_deliveries': 0,
@@ -432,84 +915,93 @@ async def process_events():
 
     # Limit the number of events per run
     events_to_process = events[:MAX_EVENTS_PER_RUN]
-    print(f"Processing {len(events_to_process)} events")
-
-    # Process events concurrently
-    delivery_tasks = [
-        deliver_event_with_retry(event, webhook_url)
+    logger.info("Processing %d events", len(events_to_process))
+
+    # Process events concurrently, with an adaptive cap on webhook requests
+    # in flight. Each failure is recorded as soon as its own delivery
+    # finishes.
+    global _delivery_concurrency
+    limiter = DeliveryLimiter(_delivery_concurrency, DELIVERY_MIN_CONCURRENCY, DELIVERY_CONCURRENCY)
+    event_tasks = [
+        _deliver_and_record(client, event, webhook_url, limiter, webhook_secret)
         for event in events_to_process
     ]
 
-    delivery_results = await asyncio.gather(*delivery_tasks)
-
-    # Update DynamoDB delivery status for all events (Task 22.4)
-    update_tasks = []
-    for i, result in enumerate(delivery_results):
-        event = events_to_process[i]
-        update_tasks.append(
-            update_event_delivery_status(
-                event_id=result['event_id'],
-                created_at=event['created_at'],
-                attempts=result['attempts'],
-                success=result['success'],
-                error_message=result.get('error')
-            )
-        )
-
-    await asyncio.gather(*update_tasks)
-
-    # Acknowledge successful deliveries
-    successful_events = [
-        result for result in delivery_results
-        if result['success']
-    ]
-
-    ack_tasks = [
-        acknowledge_event(result['event_id'], token)
-        for result in successful_events
-    ]
+    delivery_results = await asyncio.gather(*event_tasks)
+    _delivery_concurrency = limiter.limit
 
-    ack_results = await asyncio.gather(*ack_tasks)
+    # Acknowledge all successful deliveries in one request
+    acknowledged_count = await acknowledge_events_batch(
+        client,
+        [(result['event_id'], result['attempts']) for result in delivery_results if result['success']],
+        token
+    )
 
     # Calculate statistics
     total_events = len(events_to_process)
-    successful_deliveries = len(successful_events)
+    successful_deliveries = sum(1 for result in delivery_results if result['success'])
     failed_deliveries = total_events - successful_deliveries
     total_retries = sum(result['attempts'] - 1 for result in delivery_results)
 
-    # Calculate average delivery time for successful deliveries
+    # Collect delivery times for successful deliveries (published as a distribution)
     delivery_times = [
         result['response_time_ms']
         for result in delivery_results
         if result['success'] and 'response_time_ms' in result
     ]
-    avg_delivery_time_ms = sum(delivery_times) / len(delivery_times) if delivery_times else 0
 
     processing_time_seconds = time.time() - start_time
 
     # Prepare metrics
-    metrics = {
+    stats = {
         'total_events': total_events,
         'successful_deliveries': successful_deliveries,
         'failed_deliveries': failed_deliveries,
-        'total_retries': total_retries,
-        'avg_delivery_time_ms': avg_delivery_time_ms
+        'total_retries': total_retries
     }
+    metrics = {**stats, 'delivery_times_ms': delivery_times}
 
     # Publish metrics to CloudWatch
-    publish_metrics(metrics)
+    await run_aws_call(publish_metrics, metrics)
 
     # Log summary
-    print(f"Processed {total_events} events in {processing_time_seconds:.2f}s")
-    print(f"Successful: {successful_deliveries}, Failed: {failed_deliveries}, Retries: {total_retries}")
+    logger.info(
+        "Processed %d events in %.2fs (successful=%d, failed=%d, retries=%d)",
+        total_events, processing_time_seconds, successful_deliveries, failed_deliveries, total_retries
+    )
 
     return {
-        **metrics,
+        **stats,
         'processing_time_seconds': processing_time_seconds,
-        'acknowledged_count': sum(ack_results)
+        'acknowledged_count': acknowledged_count
     }
 
 
+def _prime_caches():
+    """
+    Fetch the dispatcher secret and a JWT during Lambda's init phase.
+
+    Runs once per container at import time, so the first invocation starts
+    with the secret, token, and pooled connection to the API already in
+    place. Both fetches are bounded by short init-only deadlines; failures
+    and timeouts are only logged, and the handler fetches on demand as usual.
+    """
+    try:
+        init_secrets_client = boto3.client('secretsmanager', region_name=AWS_REGION, config=INIT_SECRETS_CONFIG)
+        get_secret(SECRET_ARN, init_secrets_client)
+        get_event_loop().run_until_complete(
+            asyncio.wait_for(get_jwt_token(get_http_client()), INIT_PRELOAD_TIMEOUT_SECONDS)
+        )
+    except Exception as e:
+        logger.warning("Init-phase preload failed, deferring to first invocation: %s", e)
+
+
+# Preload only inside Lambda, so importing the module (tests, local runs)
+# makes no network calls
+if os.environ.get('AWS_LAMBDA_FUNCTION_NAME') and SECRET_ARN:
+    _prime_caches()
+
+
 def handler(event, context):
     """
     Lambda handler function.
@@ -522,37 +1014,41 @@ def handler(event, context):
     Returns:
         Dict with processing results
     """
-    print(f"Dispatcher Lambda invoked at {datetime.utcnow().isoformat()}")
-    print(f"Event: {json.dumps(event)}")
+    logger.info("Dispatcher Lambda invoked at %s", datetime.now(timezone.utc).isoformat())
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Event: %s", orjson.dumps(event).decode())
 
     try:
-        # Run async event processing
-        result = asyncio.run(process_events())
+        # Run async event processing on the persistent loop
+        with xray_recorder.in_subsegment('process_events'):
+            result = get_event_loop().run_until_complete(process_events())
 
-        print(f"Dispatcher completed successfully")
+        logger.info("Dispatcher completed successfully")
 
         return {
             'statusCode': 200,
-            'body': json.dumps(result)
+            'body': orjson.dumps(result).decode()
         }
 
     except Exception as e:
         error_message = f"Dispatcher failed: {str(e)}"
-        print(error_message)
+        logger.error(error_message)
 
         # Publish error metric
         publish_metrics({'failed_deliveries': 1})
 
         return {
             'statusCode': 500,
-            'body': json.dumps({
+            'body': orjson.dumps({
                 'error': error_message
-            })
+            }).decode()
         }
 
 
 # For local testing
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
     # Mock event and context for testing
     test_event = {}
 
@@ -561,4 +1057,4 @@ if __name__ == "__main__":
         function_name = "dispatcher-test"
 
     result = handler(test_event, MockContext())
-    print(json.dumps(result, indent=2))
+    print(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())
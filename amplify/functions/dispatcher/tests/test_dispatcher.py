@@ -3,6 +3,8 @@ Unit tests for the Event Dispatcher Lambda function
 Tests event fetching, webhook delivery, retry logic, and acknowledgment
 """
 import json
+import base64
+import time
 import pytest
 import asyncio
 from unittest.mock import Mock, patch, AsyncMock, MagicMock
@@ -89,13 +91,30 @@ class TestSecretRetrieval:
     @patch('main.secrets_client')
     def test_get_secret_cached(self, mock_secrets_client, mock_secrets):
         """Test that secrets are cached on subsequent calls"""
-        main._secrets_cache['test-secret-arn'] = mock_secrets
+        main._secrets_cache['test-secret-arn'] = {'data': mock_secrets, 'timestamp': time.time()}
 
         result = main.get_secret('test-secret-arn')
 
         assert result == mock_secrets
         mock_secrets_client.get_secret_value.assert_not_called()
 
+    @patch('main.secrets_client')
+    def test_get_secret_refetched_after_ttl(self, mock_secrets_client, mock_secrets):
+        """Test that an expired cache entry is refreshed so rotated secrets are picked up"""
+        rotated = {**mock_secrets, 'zapier_api_key': 'rotated-key'}
+        main._secrets_cache['test-secret-arn'] = {
+            'data': mock_secrets,
+            'timestamp': time.time() - main.SECRETS_CACHE_TTL_SECONDS - 1
+        }
+        mock_secrets_client.get_secret_value.return_value = {
+            'SecretString': json.dumps(rotated)
+        }
+
+        result = main.get_secret('test-secret-arn')
+
+        assert result == rotated
+        mock_secrets_client.get_secret_value.assert_called_once_with(SecretId='test-secret-arn')
+
     @patch('main.secrets_client')
     def test_get_secret_not_found(self, mock_secrets_client):
         """Test handling of non-existent secret"""
@@ -111,44 +130,86 @@ class TestSecretRetrieval:
             main.get_secret('nonexistent-secret')
 
 
+def make_jwt(exp: float) -> str:
+    """Build an unsigned JWT-shaped token carrying the given exp claim"""
+    claims = base64.urlsafe_b64encode(json.dumps({'sub': 'api', 'exp': exp}).encode()).decode().rstrip('=')
+    return f'eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.{claims}.signature'
+
+
 class TestAuthentication:
     """Test JWT token authentication"""
 
-    @patch('main.get_secret')
-    @patch('httpx.Client')
-    def test_get_jwt_token_success(self, mock_client, mock_get_secret, mock_secrets, mock_jwt_token):
-        """Test successful JWT token retrieval"""
-        mock_get_secret.return_value = mock_secrets
+    @pytest.fixture(autouse=True)
+    def clear_token_cache(self):
+        """Start every test without a cached token"""
+        main._token_cache.update(token=None, exp=0)
+        yield
+        main._token_cache.update(token=None, exp=0)
 
+    @staticmethod
+    def _token_client(status_code, token=None, text=''):
         mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {'access_token': mock_jwt_token, 'token_type': 'bearer'}
+        mock_response.status_code = status_code
+        mock_response.text = text
+        mock_response.json.return_value = {'access_token': token, 'token_type': 'bearer'}
 
-        mock_client_instance = Mock()
-        mock_client_instance.post.return_value = mock_response
-        mock_client.return_value.__enter__.return_value = mock_client_instance
+        mock_client_instance = AsyncMock()
+        mock_client_instance.post = AsyncMock(return_value=mock_response)
+        return mock_client_instance
 
-        token = main.get_jwt_token()
+    @pytest.mark.asyncio
+    @patch('main.get_secret')
+    async def test_get_jwt_token_success(self, mock_get_secret, mock_secrets, mock_jwt_token):
+        """Test successful JWT token retrieval"""
+        mock_get_secret.return_value = mock_secrets
+        mock_client_instance = self._token_client(200, mock_jwt_token)
+
+        token = await main.get_jwt_token(mock_client_instance)
 
         assert token == mock_jwt_token
         mock_client_instance.post.assert_called_once()
 
+    @pytest.mark.asyncio
     @patch('main.get_secret')
-    @patch('httpx.Client')
-    def test_get_jwt_token_auth_failure(self, mock_client, mock_get_secret, mock_secrets):
+    async def test_get_jwt_token_auth_failure(self, mock_get_secret, mock_secrets):
         """Test handling of authentication failure"""
         mock_get_secret.return_value = mock_secrets
+        mock_client_instance = self._token_client(401, text='Unauthorized')
 
-        mock_response = Mock()
-        mock_response.status_code = 401
-        mock_response.text = 'Unauthorized'
+        with pytest.raises(Exception, match='Authentication failed'):
+            await main.get_jwt_token(mock_client_instance)
 
-        mock_client_instance = Mock()
-        mock_client_instance.post.return_value = mock_response
-        mock_client.return_value.__enter__.return_value = mock_client_instance
+    @pytest.mark.asyncio
+    @patch('main.get_secret')
+    async def test_get_jwt_token_reuses_cached_token(self, mock_get_secret, mock_secrets):
+        """Test that a token far from expiry is reused without re-authenticating"""
+        mock_get_secret.return_value = mock_secrets
+        token = make_jwt(time.time() + 3600)
+        mock_client_instance = self._token_client(200, token)
 
-        with pytest.raises(Exception, match='Authentication failed'):
-            main.get_jwt_token()
+        first = await main.get_jwt_token(mock_client_instance)
+        second = await main.get_jwt_token(mock_client_instance)
+
+        assert first == second == token
+        mock_client_instance.post.assert_called_once()
+
+    @pytest.mark.asyncio
+    @patch('main.get_secret')
+    async def test_get_jwt_token_refreshes_near_expiry(self, mock_get_secret, mock_secrets):
+        """Test that a token inside the refresh margin is replaced"""
+        mock_get_secret.return_value = mock_secrets
+        token = make_jwt(time.time() + main.TOKEN_REFRESH_MARGIN_SECONDS / 2)
+        mock_client_instance = self._token_client(200, token)
+
+        await main.get_jwt_token(mock_client_instance)
+        await main.get_jwt_token(mock_client_instance)
+
+        assert mock_client_instance.post.call_count == 2
+
+    def test_token_expiry_unreadable_token(self, mock_jwt_token):
+        """Test that tokens without a readable exp claim are treated as expired"""
+        assert main._token_expiry(mock_jwt_token) == 0
+        assert main._token_expiry('not-a-jwt') == 0
 
 
 class TestEventFetching:
@@ -157,51 +218,60 @@ class TestEventFetching:
     @pytest.mark.asyncio
     async def test_fetch_pending_events_success(self, sample_events, mock_jwt_token):
         """Test successful event fetching"""
-        with patch('httpx.AsyncClient') as mock_client:
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.json.return_value = sample_events
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.content = json.dumps(sample_events).encode()
+
+        mock_client_instance = AsyncMock()
+        mock_client_instance.get = AsyncMock(return_value=mock_response)
+
+        events = await main.fetch_pending_events(mock_client_instance, mock_jwt_token)
 
-            mock_client_instance = AsyncMock()
-            mock_client_instance.get = AsyncMock(return_value=mock_response)
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+        assert len(events) == 2
+        assert events[0]['id'] == '550e8400-e29b-41d4-a716-446655440000'
+        mock_client_instance.get.assert_called_once()
 
-            events = await main.fetch_pending_events(mock_jwt_token)
+    @pytest.mark.asyncio
+    async def test_fetch_pending_events_requests_run_limit(self, mock_jwt_token):
+        """Test the inbox is asked for no more events than one run will process"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.content = b'[]'
+
+        mock_client_instance = AsyncMock()
+        mock_client_instance.get = AsyncMock(return_value=mock_response)
 
-            assert len(events) == 2
-            assert events[0]['id'] == '550e8400-e29b-41d4-a716-446655440000'
-            mock_client_instance.get.assert_called_once()
+        with patch('main.MAX_EVENTS_PER_RUN', 25):
+            await main.fetch_pending_events(mock_client_instance, mock_jwt_token)
+
+        assert mock_client_instance.get.call_args[1]['params'] == {'limit': 25}
 
     @pytest.mark.asyncio
     async def test_fetch_pending_events_empty(self, mock_jwt_token):
         """Test fetching when no events are pending"""
-        with patch('httpx.AsyncClient') as mock_client:
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.json.return_value = []
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.content = b'[]'
 
-            mock_client_instance = AsyncMock()
-            mock_client_instance.get = AsyncMock(return_value=mock_response)
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+        mock_client_instance = AsyncMock()
+        mock_client_instance.get = AsyncMock(return_value=mock_response)
 
-            events = await main.fetch_pending_events(mock_jwt_token)
+        events = await main.fetch_pending_events(mock_client_instance, mock_jwt_token)
 
-            assert events == []
+        assert events == []
 
     @pytest.mark.asyncio
     async def test_fetch_pending_events_error(self, mock_jwt_token):
         """Test handling of fetch error"""
-        with patch('httpx.AsyncClient') as mock_client:
-            mock_response = Mock()
-            mock_response.status_code = 500
-            mock_response.text = 'Internal Server Error'
+        mock_response = Mock()
+        mock_response.status_code = 500
+        mock_response.text = 'Internal Server Error'
 
-            mock_client_instance = AsyncMock()
-            mock_client_instance.get = AsyncMock(return_value=mock_response)
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+        mock_client_instance = AsyncMock()
+        mock_client_instance.get = AsyncMock(return_value=mock_response)
 
-            with pytest.raises(Exception, match='Failed to fetch inbox'):
-                await main.fetch_pending_events(mock_jwt_token)
+        with pytest.raises(Exception, match='Failed to fetch inbox'):
+            await main.fetch_pending_events(mock_client_instance, mock_jwt_token)
 
 
 class TestEventDelivery:
@@ -213,22 +283,19 @@ class TestEventDelivery:
         event = sample_events[0]
         webhook_url = 'https://hooks.zapier.com/test'
 
-        with patch('httpx.AsyncClient') as mock_client:
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.elapsed.total_seconds.return_value = 0.150
+        mock_response = Mock()
+        mock_response.status_code = 200
 
-            mock_client_instance = AsyncMock()
-            mock_client_instance.post = AsyncMock(return_value=mock_response)
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+        mock_client_instance = AsyncMock()
+        mock_client_instance.post = AsyncMock(return_value=mock_response)
 
-            result = await main.deliver_event_with_retry(event, webhook_url, max_retries=3)
+        result = await main.deliver_event_with_retry(mock_client_instance, event, webhook_url, max_retries=3)
 
-            assert result['success'] is True
-            assert result['attempts'] == 1
-            assert result['status_code'] == 200
-            assert 'response_time_ms' in result
-            mock_client_instance.post.assert_called_once()
+        assert result['success'] is True
+        assert result['attempts'] == 1
+        assert result['status_code'] == 200
+        assert 'response_time_ms' in result
+        mock_client_instance.post.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_deliver_event_retry_then_success(self, sample_events):
@@ -236,70 +303,225 @@ class TestEventDelivery:
         event = sample_events[0]
         webhook_url = 'https://hooks.zapier.com/test'
 
-        with patch('httpx.AsyncClient') as mock_client:
-            # First attempt fails, second succeeds
-            mock_response_fail = Mock()
-            mock_response_fail.status_code = 500
+        # First attempt fails, second succeeds
+        mock_response_fail = Mock()
+        mock_response_fail.status_code = 500
+
+        mock_response_success = Mock()
+        mock_response_success.status_code = 200
 
-            mock_response_success = Mock()
-            mock_response_success.status_code = 200
-            mock_response_success.elapsed.total_seconds.return_value = 0.200
+        mock_client_instance = AsyncMock()
+        mock_client_instance.post = AsyncMock(
+            side_effect=[mock_response_fail, mock_response_success]
+        )
 
-            mock_client_instance = AsyncMock()
-            mock_client_instance.post = AsyncMock(
-                side_effect=[mock_response_fail, mock_response_success]
+        with patch('asyncio.sleep', new_callable=AsyncMock):
+            result = await main.deliver_event_with_retry(mock_client_instance, event, webhook_url, max_retries=3)
+
+        assert result['success'] is True
+        assert result['attempts'] == 2
+        assert mock_client_instance.post.call_count == 2
+
+        # The event is serialized once and the same bytes are resent on retry
+        bodies = [c[1]['content'] for c in mock_client_instance.post.call_args_list]
+        assert bodies[0] is bodies[1]
+        assert json.loads(bodies[0]) == event
+
+    @pytest.mark.asyncio
+    async def test_deliver_event_stops_retrying_when_budget_exhausted(self, sample_events):
+        """Test no further attempts start once the per-event delivery budget is spent"""
+        mock_response = Mock()
+        mock_response.status_code = 503
+        mock_response.headers = {}
+
+        mock_client_instance = AsyncMock()
+        mock_client_instance.post = AsyncMock(return_value=mock_response)
+
+        with patch('main.DELIVERY_BUDGET_SECONDS', 0), \
+                patch('asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+            result = await main.deliver_event_with_retry(
+                mock_client_instance, sample_events[0], 'https://hooks.zapier.com/test', max_retries=3
             )
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
 
-            with patch('asyncio.sleep', new_callable=AsyncMock):
-                result = await main.deliver_event_with_retry(event, webhook_url, max_retries=3)
+        assert result['success'] is False
+        assert result['retryable'] is True
+        assert result['attempts'] == 1
+        mock_client_instance.post.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_deliver_event_signs_body_once(self, sample_events):
+        """Test deliveries carry an HMAC signature of the exact body sent, computed once"""
+        import hmac
+        import hashlib
+
+        mock_response_fail = Mock()
+        mock_response_fail.status_code = 500
+
+        mock_response_success = Mock()
+        mock_response_success.status_code = 200
+
+        mock_client_instance = AsyncMock()
+        mock_client_instance.post = AsyncMock(side_effect=[mock_response_fail, mock_response_success])
+
+        with patch('asyncio.sleep', new_callable=AsyncMock):
+            result = await main.deliver_event_with_retry(
+                mock_client_instance, sample_events[0], 'https://hooks.zapier.com/test',
+                webhook_secret='test-webhook-secret'
+            )
+
+        assert result['success'] is True
+        first, second = mock_client_instance.post.call_args_list
+        expected = hmac.new(b'test-webhook-secret', first[1]['content'], hashlib.sha256).hexdigest()
+        assert first[1]['headers']['X-Webhook-Signature'] == expected
+        assert second[1]['headers'] is first[1]['headers']
+
+    def test_sign_payload_follows_secret_rotation(self):
+        """Test the cached signing key is replaced when the webhook secret changes"""
+        import hmac
+        import hashlib
+
+        body = b'{"id":"evt"}'
+
+        main.sign_payload(body, 'old-secret')
+        signature = main.sign_payload(body, 'new-secret')
+
+        assert signature == hmac.new(b'new-secret', body, hashlib.sha256).hexdigest()
+
+    @pytest.mark.asyncio
+    async def test_deliver_event_unsigned_without_secret(self, sample_events):
+        """Test no signature header is sent when no webhook secret is configured"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+
+        mock_client_instance = AsyncMock()
+        mock_client_instance.post = AsyncMock(return_value=mock_response)
 
-            assert result['success'] is True
-            assert result['attempts'] == 2
-            assert mock_client_instance.post.call_count == 2
+        await main.deliver_event_with_retry(mock_client_instance, sample_events[0], 'https://hooks.zapier.com/test')
+
+        assert 'X-Webhook-Signature' not in mock_client_instance.post.call_args[1]['headers']
 
     @pytest.mark.asyncio
-    async def test_deliver_event_non_retryable_error(self, sample_events):
-        """Test handling of non-retryable error (4xx)"""
+    async def test_deliver_event_limiter_caps_in_flight_requests(self, sample_events):
+        """Test the delivery limiter bounds concurrent webhook requests"""
+        in_flight = 0
+        peak = 0
+
+        async def post(*args, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            response = Mock()
+            response.status_code = 200
+            return response
+
+        mock_client_instance = AsyncMock()
+        mock_client_instance.post = AsyncMock(side_effect=post)
+        limiter = main.DeliveryLimiter(2, min_limit=1, max_limit=2)
+
+        results = await asyncio.gather(*[
+            main.deliver_event_with_retry(
+                mock_client_instance, sample_events[0], 'https://hooks.zapier.com/test', limiter=limiter
+            )
+            for _ in range(6)
+        ])
+
+        assert all(result['success'] for result in results)
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('status_code', [400, 404, 501])
+    async def test_deliver_event_non_retryable_error(self, sample_events, status_code):
+        """Test handling of non-retryable errors (4xx other than 408/425/429, and 501)"""
         event = sample_events[0]
         webhook_url = 'https://hooks.zapier.com/test'
 
-        with patch('httpx.AsyncClient') as mock_client:
-            mock_response = Mock()
-            mock_response.status_code = 400  # Bad request - non-retryable
+        mock_response = Mock()
+        mock_response.status_code = status_code
 
-            mock_client_instance = AsyncMock()
-            mock_client_instance.post = AsyncMock(return_value=mock_response)
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+        mock_client_instance = AsyncMock()
+        mock_client_instance.post = AsyncMock(return_value=mock_response)
 
-            result = await main.deliver_event_with_retry(event, webhook_url, max_retries=3)
+        result = await main.deliver_event_with_retry(mock_client_instance, event, webhook_url, max_retries=3)
 
-            assert result['success'] is False
-            assert result['retryable'] is False
-            assert result['attempts'] == 1
-            mock_client_instance.post.assert_called_once()
+        assert result['success'] is False
+        assert result['retryable'] is False
+        assert result['attempts'] == 1
+        mock_client_instance.post.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_deliver_event_max_retries_exhausted(self, sample_events):
+    @pytest.mark.parametrize('status_code', [408, 502, 503])
+    async def test_deliver_event_max_retries_exhausted(self, sample_events, status_code):
         """Test when all retry attempts are exhausted"""
         event = sample_events[0]
         webhook_url = 'https://hooks.zapier.com/test'
 
-        with patch('httpx.AsyncClient') as mock_client:
-            mock_response = Mock()
-            mock_response.status_code = 503  # Service unavailable - retryable
+        mock_response = Mock()
+        mock_response.status_code = status_code  # Retryable
 
-            mock_client_instance = AsyncMock()
-            mock_client_instance.post = AsyncMock(return_value=mock_response)
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+        mock_client_instance = AsyncMock()
+        mock_client_instance.post = AsyncMock(return_value=mock_response)
 
-            with patch('asyncio.sleep', new_callable=AsyncMock):
-                result = await main.deliver_event_with_retry(event, webhook_url, max_retries=3)
+        with patch('asyncio.sleep', new_callable=AsyncMock):
+            result = await main.deliver_event_with_retry(mock_client_instance, event, webhook_url, max_retries=3)
+
+        assert result['success'] is False
+        assert result['retryable'] is True
+        assert result['attempts'] == 3
+        assert mock_client_instance.post.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_deliver_event_backoff_has_jitter(self, sample_events):
+        """Test retry sleeps are drawn uniformly up to the current backoff"""
+        mock_response = Mock()
+        mock_response.status_code = 500
+        mock_response.headers = {}
 
-            assert result['success'] is False
-            assert result['retryable'] is True
-            assert result['attempts'] == 3
-            assert mock_client_instance.post.call_count == 3
+        mock_client_instance = AsyncMock()
+        mock_client_instance.post = AsyncMock(return_value=mock_response)
+
+        with patch('main.random.uniform', return_value=0.25) as mock_uniform, \
+                patch('asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+            await main.deliver_event_with_retry(
+                mock_client_instance, sample_events[0], 'https://hooks.zapier.com/test', max_retries=3
+            )
+
+        assert [c.args for c in mock_uniform.call_args_list] == [
+            (0, main.INITIAL_BACKOFF_SECONDS),
+            (0, main.INITIAL_BACKOFF_SECONDS * 2)
+        ]
+        assert [c.args[0] for c in mock_sleep.await_args_list] == [0.25, 0.25]
+
+    @pytest.mark.asyncio
+    async def test_deliver_event_honours_retry_after(self, sample_events):
+        """Test a 429 with Retry-After waits at least that long before retrying"""
+        mock_response_throttled = Mock()
+        mock_response_throttled.status_code = 429
+        mock_response_throttled.headers = {'retry-after': '5'}
+
+        mock_response_success = Mock()
+        mock_response_success.status_code = 200
+
+        mock_client_instance = AsyncMock()
+        mock_client_instance.post = AsyncMock(
+            side_effect=[mock_response_throttled, mock_response_success]
+        )
+
+        with patch('asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+            result = await main.deliver_event_with_retry(
+                mock_client_instance, sample_events[0], 'https://hooks.zapier.com/test', max_retries=3
+            )
+
+        assert result['success'] is True
+        mock_sleep.assert_awaited_once_with(5.0)
+
+    def test_parse_retry_after(self):
+        """Test Retry-After parsing accepts delta-seconds only"""
+        assert main._parse_retry_after('7') == 7.0
+        assert main._parse_retry_after(None) is None
+        assert main._parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') is None
 
     @pytest.mark.asyncio
     async def test_deliver_event_timeout(self, sample_events):
@@ -309,17 +531,143 @@ class TestEventDelivery:
 
         import httpx
 
-        with patch('httpx.AsyncClient') as mock_client:
-            mock_client_instance = AsyncMock()
-            mock_client_instance.post = AsyncMock(side_effect=httpx.TimeoutException('Timeout'))
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+        mock_client_instance = AsyncMock()
+        mock_client_instance.post = AsyncMock(side_effect=httpx.TimeoutException('Timeout'))
+
+        with patch('asyncio.sleep', new_callable=AsyncMock):
+            result = await main.deliver_event_with_retry(mock_client_instance, event, webhook_url, max_retries=2)
+
+        assert result['success'] is False
+        assert 'Timeout' in result['error']
+        assert result['attempts'] == 2
+
+
+class TestDeliveryOverHttp:
+    """Test delivery and ack through a real httpx client backed by MockTransport"""
+
+    @pytest.mark.asyncio
+    async def test_retry_then_success_sends_signed_body(self, sample_events):
+        """Test a 500 is retried and both attempts carry the same signed JSON body"""
+        import hmac
+        import hashlib
+        import httpx
+
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(500 if len(requests) == 1 else 202)
 
+        async with main.make_http_client(httpx.MockTransport(handler)) as client:
             with patch('asyncio.sleep', new_callable=AsyncMock):
-                result = await main.deliver_event_with_retry(event, webhook_url, max_retries=2)
+                result = await main.deliver_event_with_retry(
+                    client, sample_events[0], 'https://hooks.zapier.com/test',
+                    webhook_secret='test-webhook-secret'
+                )
+
+        assert result['success'] is True
+        assert result['attempts'] == 2
+        assert result['status_code'] == 202
+        assert requests[0].content == requests[1].content
+        assert json.loads(requests[1].content) == sample_events[0]
+        assert requests[1].headers['content-type'] == 'application/json'
+        assert requests[1].headers['x-webhook-signature'] == hmac.new(
+            b'test-webhook-secret', requests[1].content, hashlib.sha256
+        ).hexdigest()
+
+    @pytest.mark.asyncio
+    async def test_acknowledge_sends_attempts_and_token(self, mock_jwt_token, monkeypatch):
+        """Test the ack request carries the bearer token and attempt count"""
+        import httpx
+
+        monkeypatch.setattr(main, 'API_BASE_URL', 'https://test-api.example.com')
+
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json={'status': 'delivered'})
+
+        async with main.make_http_client(httpx.MockTransport(handler)) as client:
+            acknowledged = await main.acknowledge_event(client, 'event-1', mock_jwt_token, attempts=2)
+
+        assert acknowledged is True
+        assert requests[0].url.path == '/inbox/event-1/ack'
+        assert requests[0].headers['authorization'] == f'Bearer {mock_jwt_token}'
+        assert json.loads(requests[0].content) == {'attempts': 2}
+
+    @pytest.mark.asyncio
+    async def test_acknowledge_events_batch_sends_one_request(self, mock_jwt_token, monkeypatch):
+        """Test successful deliveries are acked with a single batch request"""
+        import httpx
+
+        monkeypatch.setattr(main, 'API_BASE_URL', 'https://test-api.example.com')
+
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json={'acknowledged': ['event-1', 'event-2'], 'failed': []})
+
+        async with main.make_http_client(httpx.MockTransport(handler)) as client:
+            acknowledged = await main.acknowledge_events_batch(
+                client, [('event-1', 1), ('event-2', 3)], mock_jwt_token
+            )
+
+        assert acknowledged == 2
+        assert len(requests) == 1
+        assert requests[0].url.path == '/inbox/ack'
+        assert requests[0].headers['authorization'] == f'Bearer {mock_jwt_token}'
+        assert json.loads(requests[0].content) == {
+            'acks': [{'id': 'event-1', 'attempts': 1}, {'id': 'event-2', 'attempts': 3}]
+        }
+
+    @pytest.mark.asyncio
+    async def test_acknowledge_events_batch_falls_back_to_single_acks(self, mock_jwt_token, monkeypatch):
+        """Test each event is acked individually when the API has no batch endpoint"""
+        import httpx
 
-            assert result['success'] is False
-            assert 'Timeout' in result['error']
-            assert result['attempts'] == 2
+        monkeypatch.setattr(main, 'API_BASE_URL', 'https://test-api.example.com')
+
+        paths = []
+
+        def handler(request):
+            paths.append(request.url.path)
+            if request.url.path == '/inbox/ack':
+                return httpx.Response(404)
+            return httpx.Response(200, json={'status': 'delivered'})
+
+        async with main.make_http_client(httpx.MockTransport(handler)) as client:
+            acknowledged = await main.acknowledge_events_batch(
+                client, [('event-1', 1), ('event-2', 1)], mock_jwt_token
+            )
+
+        assert acknowledged == 2
+        assert paths[0] == '/inbox/ack'
+        assert sorted(paths[1:]) == ['/inbox/event-1/ack', '/inbox/event-2/ack']
+
+    @pytest.mark.asyncio
+    async def test_acknowledge_events_batch_does_not_reack_after_error(self, mock_jwt_token, monkeypatch):
+        """Test a failed batch call isn't retried per event, since it may already have been applied"""
+        import httpx
+
+        monkeypatch.setattr(main, 'API_BASE_URL', 'https://test-api.example.com')
+
+        paths = []
+
+        def handler(request):
+            paths.append(request.url.path)
+            if request.url.path == '/inbox/ack':
+                return httpx.Response(500)
+            return httpx.Response(200, json={'status': 'delivered'})
+
+        async with main.make_http_client(httpx.MockTransport(handler)) as client:
+            acknowledged = await main.acknowledge_events_batch(
+                client, [('event-1', 1), ('event-2', 1)], mock_jwt_token
+            )
+
+        assert acknowledged == 0
+        assert paths == ['/inbox/ack']
 
 
 class TestEventAcknowledgment:
@@ -330,36 +678,33 @@ class TestEventAcknowledgment:
         """Test successful event acknowledgment"""
         event_id = '550e8400-e29b-41d4-a716-446655440000'
 
-        with patch('httpx.AsyncClient') as mock_client:
-            mock_response = Mock()
-            mock_response.status_code = 200
+        mock_response = Mock()
+        mock_response.status_code = 200
 
-            mock_client_instance = AsyncMock()
-            mock_client_instance.post = AsyncMock(return_value=mock_response)
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+        mock_client_instance = AsyncMock()
+        mock_client_instance.post = AsyncMock(return_value=mock_response)
 
-            result = await main.acknowledge_event(event_id, mock_jwt_token)
+        result = await main.acknowledge_event(mock_client_instance, event_id, mock_jwt_token, attempts=2)
 
-            assert result is True
-            mock_client_instance.post.assert_called_once()
+        assert result is True
+        mock_client_instance.post.assert_called_once()
+        assert mock_client_instance.post.call_args[1]['json'] == {'attempts': 2}
 
     @pytest.mark.asyncio
     async def test_acknowledge_event_failure(self, mock_jwt_token):
         """Test handling of acknowledgment failure"""
         event_id = '550e8400-e29b-41d4-a716-446655440000'
 
-        with patch('httpx.AsyncClient') as mock_client:
-            mock_response = Mock()
-            mock_response.status_code = 404
-            mock_response.text = 'Not Found'
+        mock_response = Mock()
+        mock_response.status_code = 404
+        mock_response.text = 'Not Found'
 
-            mock_client_instance = AsyncMock()
-            mock_client_instance.post = AsyncMock(return_value=mock_response)
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
+        mock_client_instance = AsyncMock()
+        mock_client_instance.post = AsyncMock(return_value=mock_response)
 
-            result = await main.acknowledge_event(event_id, mock_jwt_token)
+        result = await main.acknowledge_event(mock_client_instance, event_id, mock_jwt_token)
 
-            assert result is False
+        assert result is False
 
 
 class TestMetricsPublishing:
@@ -372,7 +717,7 @@ class TestMetricsPublishing:
             'total_events': 10,
             'successful_deliveries': 8,
             'failed_deliveries': 2,
-            'avg_delivery_time_ms': 150.5,
+            'delivery_times_ms': [150.5],
             'total_retries': 3
         }
 
@@ -383,6 +728,64 @@ class TestMetricsPublishing:
         assert call_args[1]['Namespace'] == 'ZapierTriggersAPI/Dispatcher'
         assert len(call_args[1]['MetricData']) == 5
 
+    @patch('main.cloudwatch_client')
+    def test_publish_latency_distribution(self, mock_cloudwatch_client):
+        """Test delivery latencies are published as Values/Counts"""
+        main.publish_metrics({'delivery_times_ms': [100.2, 99.8, 250.0]})
+
+        metric_data = mock_cloudwatch_client.put_metric_data.call_args[1]['MetricData']
+        assert len(metric_data) == 1
+        latency = metric_data[0]
+        assert latency['MetricName'] == 'DispatcherDeliveryLatency'
+        assert latency['Unit'] == 'Milliseconds'
+        assert dict(zip(latency['Values'], latency['Counts'])) == {100: 2, 250: 1}
+
+    @patch('main.cloudwatch_client')
+    def test_publish_latency_distribution_chunks_values(self, mock_cloudwatch_client):
+        """Test more distinct latencies than one datum allows are split across datums"""
+        times = [float(i) for i in range(main.CLOUDWATCH_MAX_VALUES_PER_DATUM + 10)]
+
+        main.publish_metrics({'delivery_times_ms': times})
+
+        mock_cloudwatch_client.put_metric_data.assert_called_once()
+        metric_data = mock_cloudwatch_client.put_metric_data.call_args[1]['MetricData']
+        assert [len(m['Values']) for m in metric_data] == [main.CLOUDWATCH_MAX_VALUES_PER_DATUM, 10]
+        assert sum(sum(m['Counts']) for m in metric_data) == len(times)
+
+    @patch('main.USE_EMF', True)
+    @patch('main.cloudwatch_client')
+    def test_publish_metrics_as_emf(self, mock_cloudwatch_client, capsys):
+        """Test metrics are written as EMF log lines instead of calling PutMetricData"""
+        main.publish_metrics({
+            'total_events': 3,
+            'failed_deliveries': 1,
+            'delivery_times_ms': [100.2, 250.0]
+        })
+
+        mock_cloudwatch_client.put_metric_data.assert_not_called()
+        lines = capsys.readouterr().out.strip().splitlines()
+        assert len(lines) == 1
+        record = json.loads(lines[0])
+        directive = record['_aws']['CloudWatchMetrics'][0]
+        assert directive['Namespace'] == 'ZapierTriggersAPI/Dispatcher'
+        assert {m['Name'] for m in directive['Metrics']} == {
+            'EventsProcessed', 'DeliveryFailures', 'DispatcherDeliveryLatency'
+        }
+        assert record['EventsProcessed'] == 3
+        assert record['DeliveryFailures'] == 1
+        assert record['DispatcherDeliveryLatency'] == [100, 250]
+
+    @patch('main.USE_EMF', True)
+    def test_emf_splits_latencies_across_records(self):
+        """Test more latencies than EMF allows per metric are split across records"""
+        times = [float(i) for i in range(main.EMF_MAX_VALUES_PER_METRIC + 5)]
+
+        records = main._emf_records({'total_events': len(times), 'delivery_times_ms': times})
+
+        assert [len(r['DispatcherDeliveryLatency']) for r in records] == [main.EMF_MAX_VALUES_PER_METRIC, 5]
+        assert 'EventsProcessed' in records[0]
+        assert 'EventsProcessed' not in records[1]
+
     @patch('main.cloudwatch_client')
     def test_publish_metrics_empty(self, mock_cloudwatch_client):
         """Test publishing empty metrics"""
@@ -393,6 +796,90 @@ class TestMetricsPublishing:
         mock_cloudwatch_client.put_metric_data.assert_not_called()
 
 
+class TestDeliveryLimiter:
+    """Test adaptive (AIMD) delivery concurrency"""
+
+    def test_success_increases_limit_up_to_max(self):
+        """Test each 2xx response adds one to the limit, capped at max_limit"""
+        limiter = main.DeliveryLimiter(4, min_limit=2, max_limit=5)
+
+        limiter.record(200)
+        limiter.record(204)
+
+        assert limiter.limit == 5
+
+    @pytest.mark.parametrize('status_code', [429, 503])
+    def test_throttling_halves_limit_down_to_min(self, status_code):
+        """Test 429/503 responses halve the limit, floored at min_limit"""
+        limiter = main.DeliveryLimiter(16, min_limit=4, max_limit=16)
+
+        limiter.record(status_code)
+        assert limiter.limit == 8
+
+        limiter.record(status_code)
+        limiter.record(status_code)
+        assert limiter.limit == 4
+
+    def test_other_errors_leave_limit_unchanged(self):
+        """Test non-throttling failures don't change the limit"""
+        limiter = main.DeliveryLimiter(8, min_limit=2, max_limit=16)
+
+        limiter.record(500)
+        limiter.record(400)
+
+        assert limiter.limit == 8
+
+    @pytest.mark.asyncio
+    @patch('main.get_secret')
+    @patch('main.get_jwt_token')
+    @patch('main.fetch_pending_events')
+    @patch('main.deliver_event_with_retry')
+    @patch('main.acknowledge_events_batch')
+    @patch('main.publish_metrics')
+    async def test_learned_limit_carries_over_to_next_run(
+        self, mock_publish, mock_ack, mock_deliver, mock_fetch, mock_token, mock_secret
+    ):
+        """Test a warm invocation starts from the limit the previous run settled on"""
+        mock_secret.return_value = {'zapier_webhook_url': 'https://hooks.zapier.com/test'}
+        mock_token.return_value = 'test-token'
+        mock_fetch.return_value = [
+            {'id': 'event-1', 'type': 'test', 'created_at': '2024-01-15T10:30:00Z', 'payload': {}}
+        ]
+        mock_ack.return_value = 1
+
+        async def throttled_delivery(client, event, webhook_url, limiter, **kwargs):
+            limiter.record(429)
+            return {'success': True, 'event_id': event['id'], 'attempts': 2, 'response_time_ms': 100}
+
+        mock_deliver.side_effect = throttled_delivery
+
+        with patch('main._delivery_concurrency', 16), \
+                patch('main.DELIVERY_CONCURRENCY', 16), \
+                patch('main.DELIVERY_MIN_CONCURRENCY', 4):
+            await main.process_events()
+            assert main._delivery_concurrency == 8
+
+            await main.process_events()
+            assert main._delivery_concurrency == 4
+
+
+class TestAwsCalls:
+    """Test blocking AWS calls are moved off the event loop"""
+
+    @pytest.mark.asyncio
+    async def test_run_aws_call_runs_in_worker_thread(self):
+        """Test run_aws_call forwards arguments and runs on the AWS pool"""
+        import threading
+
+        def blocking_call(x, y=0):
+            return threading.current_thread().name, x + y
+
+        thread_name, total = await main.run_aws_call(blocking_call, 1, y=2)
+
+        assert total == 3
+        assert thread_name.startswith('aws')
+
+
 class TestLambdaHandler:
     """Test Lambda handler function"""
 
@@ -406,34 +893,84 @@ class TestLambdaHandler:
             'processing_time_seconds': 2.5
         }
 
-        # Mock asyncio.run to avoid actually running async code
-        with patch('asyncio.run', return_value=mock_process_events.return_value):
-            event = {}
-            context = Mock()
+        event = {}
+        context = Mock()
 
-            result = main.handler(event, context)
+        result = main.handler(event, context)
 
-            assert result['statusCode'] == 200
-            body = json.loads(result['body'])
-            assert body['total_events'] == 5
-            assert body['successful_deliveries'] == 5
+        assert result['statusCode'] == 200
+        body = json.loads(result['body'])
+        assert body['total_events'] == 5
+        assert body['successful_deliveries'] == 5
 
     @patch('main.process_events')
     def test_handler_error(self, mock_process_events, mock_environment):
         """Test Lambda handler error handling"""
         mock_process_events.side_effect = Exception('Processing failed')
 
-        with patch('asyncio.run', side_effect=mock_process_events.side_effect):
-            with patch('main.publish_metrics'):
-                event = {}
-                context = Mock()
+        with patch('main.publish_metrics'):
+            event = {}
+            context = Mock()
+
+            result = main.handler(event, context)
+
+            assert result['statusCode'] == 500
+            body = json.loads(result['body'])
+            assert 'error' in body
+            assert 'Processing failed' in body['error']
+
+    @patch('main.get_jwt_token')
+    @patch('main.get_secret')
+    @patch('main.boto3.client')
+    def test_prime_caches_fetches_secret_and_token(self, mock_boto3_client, mock_get_secret, mock_get_token,
+                                                   mock_environment):
+        """Test init-phase preloading warms the secret and JWT caches"""
+        mock_get_token.return_value = 'test-token'
+
+        main._prime_caches()
+
+        mock_boto3_client.assert_called_once_with(
+            'secretsmanager', region_name=main.AWS_REGION, config=main.INIT_SECRETS_CONFIG
+        )
+        mock_get_secret.assert_called_once_with(main.SECRET_ARN, mock_boto3_client.return_value)
+        mock_get_token.assert_awaited_once()
+
+    @patch('main.INIT_PRELOAD_TIMEOUT_SECONDS', 0.01)
+    @patch('main.get_jwt_token')
+    @patch('main.get_secret')
+    @patch('main.boto3.client')
+    def test_prime_caches_gives_up_on_slow_token(self, mock_boto3_client, mock_get_secret, mock_get_token,
+                                                 mock_environment):
+        """Test a slow /token response can't hold up Lambda init"""
+        async def slow_token(client):
+            await asyncio.sleep(1)
+            return 'test-token'
+
+        mock_get_token.side_effect = slow_token
+
+        start = time.monotonic()
+        main._prime_caches()
+
+        assert time.monotonic() - start < 0.5
+
+    @patch('main.get_secret')
+    def test_prime_caches_swallows_errors(self, mock_get_secret, mock_environment):
+        """Test a failed preload doesn't break Lambda init"""
+        mock_get_secret.side_effect = Exception('Secrets Manager unavailable')
+
+        main._prime_caches()
+
+    @patch('main.process_events')
+    def test_handler_reuses_event_loop_across_invocations(self, mock_process_events, mock_environment):
+        """Test warm invocations run on the same loop, keeping pooled connections alive"""
+        mock_process_events.return_value = {'total_events': 0}
 
-                result = main.handler(event, context)
+        main.handler({}, Mock())
+        first_loop = main.get_event_loop()
+        main.handler({}, Mock())
 
-                assert result['statusCode'] == 500
-                body = json.loads(result['body'])
-                assert 'error' in body
-                assert 'Processing failed' in body['error']
+        assert main.get_event_loop() is first_loop
+        assert not first_loop.is_closed()
 
 
 if __name__ == '__main__':
@@ -34,36 +34,6 @@ def mock_environment(monkeypatch):
 class TestDynamoDBFieldUpdates:
     """Test DynamoDB delivery tracking field updates (Task 22.4)"""
 
-    @pytest.mark.asyncio
-    @patch('main.table')
-    async def test_update_event_delivery_status_success(self, mock_table):
-        """Test updating DynamoDB fields on successful delivery"""
-        event_id = 'test-event-123'
-        created_at = '2024-01-15T10:30:00Z'
-        attempts = 2
-
-        await main.update_event_delivery_status(
-            event_id=event_id,
-            created_at=created_at,
-            attempts=attempts,
-            success=True
-        )
-
-        # Verify DynamoDB update was called with correct parameters
-        mock_table.update_item.assert_called_once()
-        call_args = mock_table.update_item.call_args
-
-        # Check keys
-        assert call_args[1]['Key'] == {
-            'id': event_id,
-            'created_at': created_at
-        }
-
-        # Check that attempts and last_delivery_attempt are updated
-        assert ':attempts' in call_args[1]['ExpressionAttributeValues']
-        assert call_args[1]['ExpressionAttributeValues'][':attempts'] == attempts
-        assert ':last_attempt' in call_args[1]['ExpressionAttributeValues']
-
     @pytest.mark.asyncio
     @patch('main.table')
     async def test_update_event_delivery_status_failure(self, mock_table):
@@ -77,7 +47,6 @@ class TestDynamoDBFieldUpdates:
             event_id=event_id,
             created_at=created_at,
             attempts=attempts,
-            success=False,
             error_message=error_message
         )
 
@@ -93,6 +62,29 @@ class TestDynamoDBFieldUpdates:
         assert ':status' in call_args[1]['ExpressionAttributeValues']
         assert call_args[1]['ExpressionAttributeValues'][':status'] == 'failed'
 
+    @pytest.mark.asyncio
+    @patch('main.table')
+    async def test_update_event_skips_delivered_events(self, mock_table):
+        """Test updates are conditional so an already-delivered event is not regressed"""
+        from botocore.exceptions import ClientError
+
+        mock_table.update_item.side_effect = ClientError(
+            {'Error': {'Code': 'ConditionalCheckFailedException', 'Message': 'The conditional request failed'}},
+            'UpdateItem'
+        )
+
+        # Should be treated as a no-op rather than raising
+        await main.update_event_delivery_status(
+            event_id='test-event',
+            created_at='2024-01-15T10:30:00Z',
+            attempts=3,
+            error_message='Timeout'
+        )
+
+        call_args = mock_table.update_item.call_args
+        assert call_args[1]['ConditionExpression'] == main.NOT_DELIVERED_CONDITION
+        assert call_args[1]['ExpressionAttributeValues'][':delivered'] == 'delivered'
+
     @pytest.mark.asyncio
     @patch('main.table')
     async def test_update_event_handles_exceptions(self, mock_table):
@@ -104,7 +96,7 @@ class TestDynamoDBFieldUpdates:
             event_id='test-event',
             created_at='2024-01-15T10:30:00Z',
             attempts=1,
-            success=True
+            error_message='Timeout'
         )
 
         # Function should have attempted the update
@@ -167,7 +159,7 @@ class TestCloudWatchMetrics:
             'successful_deliveries': 92,
             'failed_deliveries': 8,
             'total_retries': 15,
-            'avg_delivery_time_ms': 234.5
+            'delivery_times_ms': [234.5, 180.0]
         }
 
         main.publish_metrics(metrics)
@@ -210,7 +202,7 @@ class TestProcessEventsIntegration:
     @patch('main.fetch_pending_events')
     @patch('main.deliver_event_with_retry')
     @patch('main.update_event_delivery_status')
-    @patch('main.acknowledge_event')
+    @patch('main.acknowledge_events_batch')
     @patch('main.publish_metrics')
     async def test_process_events_updates_dynamodb_fields(
         self,
@@ -222,7 +214,7 @@ class TestProcessEventsIntegration:
         mock_token,
         mock_secret
     ):
-        """Test that process_events calls update_event_delivery_status for all events"""
+        """Test that process_events writes failures to DynamoDB and acks successes"""
         # Setup mocks
         mock_secret.return_value = {
             'zapier_webhook_url': 'https://hooks.zapier.com/test',
@@ -265,26 +257,26 @@ class TestProcessEventsIntegration:
         ]
 
         mock_update_status.return_value = None
-        mock_ack.return_value = True
+        mock_ack.return_value = 1
 
         # Execute
         result = await main.process_events()
 
-        # Verify update_event_delivery_status was called for both events
-        assert mock_update_status.call_count == 2
+        # Only the failed delivery is written to DynamoDB
+        mock_update_status.assert_called_once()
+        update_call = mock_update_status.call_args
+        assert update_call[1]['event_id'] == 'event-2'
+        assert update_call[1]['attempts'] == 3
+        assert update_call[1]['error_message'] == 'Connection timeout'
 
-        # Verify first call (successful delivery)
-        first_call = mock_update_status.call_args_list[0]
-        assert first_call[1]['event_id'] == 'event-1'
-        assert first_call[1]['success'] is True
-        assert first_call[1]['attempts'] == 1
+        # The successful delivery's attempt count travels with the batch ack
+        mock_ack.assert_called_once()
+        assert mock_ack.call_args[0][1] == [('event-1', 1)]
+        assert result['acknowledged_count'] == 1
 
-        # Verify second call (failed delivery)
-        second_call = mock_update_status.call_args_list[1]
-        assert second_call[1]['event_id'] == 'event-2'
-        assert second_call[1]['success'] is False
-        assert second_call[1]['attempts'] == 3
-        assert second_call[1]['error_message'] == 'Connection timeout'
+        # Deliveries and acks share one pooled HTTP client
+        clients = {c[0][0] for c in mock_deliver.call_args_list + mock_ack.call_args_list}
+        assert len(clients) == 1
 
     @pytest.mark.asyncio
     @patch('main.get_secret')
@@ -292,7 +284,7 @@ class TestProcessEventsIntegration:
     @patch('main.fetch_pending_events')
     @patch('main.deliver_event_with_retry')
     @patch('main.update_event_delivery_status')
-    @patch('main.acknowledge_event')
+    @patch('main.acknowledge_events_batch')
     @patch('main.publish_metrics')
     async def test_process_events_publishes_correct_metrics(
         self,
@@ -337,7 +329,7 @@ class TestProcessEventsIntegration:
 
         mock_deliver.side_effect = delivery_results
         mock_update_status.return_value = None
-        mock_ack.return_value = True
+        mock_ack.return_value = 7
 
         # Execute
         result = await main.process_events()
@@ -352,3 +344,53 @@ class TestProcessEventsIntegration:
         assert published_metrics['failed_deliveries'] == 3
         # Total retries: 7 successful (0 retries each) + 3 failed (2 retries each) = 6
         assert published_metrics['total_retries'] == 6
+        # Latency is published per delivery rather than as an average
+        assert published_metrics['delivery_times_ms'] == [200] * 7
+
+    @pytest.mark.asyncio
+    @patch('main.get_secret')
+    @patch('main.get_jwt_token')
+    @patch('main.fetch_pending_events')
+    @patch('main.deliver_event_with_retry')
+    @patch('main.update_event_delivery_status')
+    @patch('main.acknowledge_events_batch')
+    @patch('main.publish_metrics')
+    async def test_process_events_records_failures_without_waiting_for_slow_deliveries(
+        self,
+        mock_publish,
+        mock_ack,
+        mock_update_status,
+        mock_deliver,
+        mock_fetch,
+        mock_token,
+        mock_secret
+    ):
+        """Test that a failure is recorded while a slower delivery is still in flight"""
+        mock_secret.return_value = {'zapier_webhook_url': 'https://hooks.zapier.com/test'}
+        mock_token.return_value = 'test-token'
+        mock_fetch.return_value = [
+            {'id': 'slow', 'type': 'test', 'created_at': '2024-01-15T10:30:00Z', 'payload': {}},
+            {'id': 'fast', 'type': 'test', 'created_at': '2024-01-15T10:31:00Z', 'payload': {}}
+        ]
+
+        # The slow delivery only completes once the fast failure has been recorded
+        fast_recorded = asyncio.Event()
+
+        async def deliver(client, event, webhook_url, **kwargs):
+            if event['id'] == 'slow':
+                await fast_recorded.wait()
+                return {'success': True, 'event_id': 'slow', 'attempts': 1, 'response_time_ms': 100}
+            return {'success': False, 'event_id': 'fast', 'attempts': 3, 'error': 'Timeout'}
+
+        async def update(**kwargs):
+            fast_recorded.set()
+
+        mock_deliver.side_effect = deliver
+        mock_update_status.side_effect = update
+        mock_ack.return_value = 1
+
+        result = await asyncio.wait_for(main.process_events(), timeout=1)
+
+        assert result['successful_deliveries'] == 1
+        assert result['acknowledged_count'] == 1
+        assert mock_ack.call_args[0][1] == [('slow', 1)]
@@ -24,9 +24,111 @@ Usage:
 
 import os
 import time
-from typing import Dict, Any, List, Callable, Optional
-from datetime import datetime, timedelta
+import base64
+import random
+import socket
+import logging
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Callable, NamedTuple, Optional
+from datetime import datetime, timezone
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
+
+# Library logging; applications attach their own handlers
+logger = logging.getLogger('zapier_triggers')
+logger.addHandler(logging.NullHandler())
+
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Maximum acknowledgments per POST /inbox/ack request
+ACK_BATCH_SIZE = 100
+
+# Refresh the token this long before its exp claim (capped at half its lifetime)
+TOKEN_REFRESH_MARGIN_SECONDS = 300
+# Assumed lifetime when a token's exp claim cannot be read
+DEFAULT_TOKEN_LIFETIME_SECONDS = 24 * 3600
+
+# POSTs are not idempotent, so they are only retried on statuses that mean
+# the API rejected the request without handling it
+POST_RETRY_STATUS_CODES = frozenset({429, 503})
+
+
+def _token_expiry(token: str) -> float:
+    """
+    Read the exp claim from a JWT without verifying it.
+
+    Only used to schedule refreshes; the API verifies the signature on every
+    request.
+
+    Returns:
+        Expiry as a Unix timestamp, or 0 if it cannot be read
+    """
+    try:
+        payload_segment = token.split('.')[1]
+        padding = '=' * (-len(payload_segment) % 4)
+        claims = orjson.loads(base64.urlsafe_b64decode(payload_segment + padding))
+        return float(claims.get('exp', 0))
+    except (IndexError, ValueError, TypeError, AttributeError):
+        return 0
+
+
+class _ApiRetry(Retry):
+    """
+    urllib3 retry policy for API requests.
+
+    GETs are retried on 429 and 5xx responses, POSTs only on
+    POST_RETRY_STATUS_CODES. Backoff uses full jitter so concurrent workers
+    don't retry in lockstep; a Retry-After header takes precedence.
+    """
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if method == 'POST' and status_code not in POST_RETRY_STATUS_CODES:
+            return False
+        return super().is_retry(method, status_code, has_retry_after)
+
+    def get_backoff_time(self) -> float:
+        return random.uniform(0, super().get_backoff_time())
+
+
+RETRY_POLICY = _ApiRetry(
+    total=5,
+    connect=3,
+    read=0,  # A read error may mean a POST was already handled
+    status=3,
+    backoff_factor=0.3,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset({'GET', 'POST'}),
+    respect_retry_after_header=True,
+    raise_on_status=False  # Return the last response so callers get an HTTPError
+)
+
+
+class ProcessResult(NamedTuple):
+    """Outcome of processing one inbox event."""
+    event_id: str
+    status: str  # 'success' or 'failed'
+    error: Optional[str] = None
+
+
+class _KeepAliveAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that enables TCP keep-alive on pooled sockets.
+
+    Keep-alive probes stop idle pooled connections from being silently
+    dropped by NATs and load balancers between batches. urllib3's default
+    options (including TCP_NODELAY) are kept.
+    """
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        kwargs['socket_options'] = HTTPConnection.default_socket_options + [
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+        ]
+        super().init_poolmanager(*args, **kwargs)
 
 
 class ZapierTriggersClient:
@@ -37,7 +139,11 @@ class ZapierTriggersClient:
         api_key: Your Zapier API key from AWS Secrets Manager
         base_url: API base URL (default: production endpoint)
         token: Current JWT access token
-        token_expiry: Token expiration datetime
+        token_deadline: time.monotonic() value after which the token is refreshed
+        session: Pooled HTTP session reused for every request (keep-alive)
+
+    The client holds open connections; call close() when done, or use it
+    as a context manager.
 
     Example:
         client = ZapierTriggersClient(api_key=os.getenv('ZAPIER_API_KEY'))
@@ -56,7 +162,8 @@ class ZapierTriggersClient:
     def __init__(
         self,
         api_key: str,
-        base_url: str = 'https://ollzpcmoeaco4cpc773nyz7c5q0zumqi.lambda-url.us-east-2.on.aws'
+        base_url: str = 'https://ollzpcmoeaco4cpc773nyz7c5q0zumqi.lambda-url.us-east-2.on.aws',
+        pool_maxsize: int = 100
     ):
         """
         Initialize the Zapier Triggers API client.
@@ -64,6 +171,8 @@ class ZapierTriggersClient:
         Args:
             api_key: Your Zapier API key from AWS Secrets Manager
             base_url: API base URL (default: production endpoint)
+            pool_maxsize: Keep-alive connections kept open to the API
+                (default: 100, one full inbox page)
 
         Raises:
             ValueError: If api_key is not provided
@@ -73,55 +182,138 @@ class ZapierTriggersClient:
 
         self.api_key = api_key
         self.base_url = base_url
+
+        # Endpoint URLs, built once rather than on every call
+        self._token_url = f'{base_url}/token'
+        self._events_url = f'{base_url}/events'
+        self._inbox_url = f'{base_url}/inbox'
+        self._batch_ack_url = f'{base_url}/inbox/ack'
+        self._health_url = f'{base_url}/health'
         self.token: Optional[str] = None
-        self.token_expiry: Optional[datetime] = None
+        # Monotonic, so clock adjustments can't shorten or extend the token's life
+        self.token_deadline = 0.0
+        # Serializes refreshes when process_inbox workers find the token expired together
+        self._auth_lock = threading.Lock()
+
+        # One session for all calls, so requests reuse pooled keep-alive
+        # connections instead of a new TCP + TLS handshake each time. The
+        # client only talks to one host, so it needs a single pool.
+        self.session = requests.Session()
+        adapter = _KeepAliveAdapter(pool_connections=1, pool_maxsize=pool_maxsize, max_retries=RETRY_POLICY)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def close(self) -> None:
+        """Close the underlying HTTP session and its pooled connections."""
+        self.session.close()
+
+    def __enter__(self) -> 'ZapierTriggersClient':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
 
     def _ensure_authenticated(self) -> None:
         """
         Ensure we have a valid token, refreshing if needed.
 
-        This method is called automatically before each API request.
+        This method is called automatically before each API request. It is
+        safe to call from several threads: only the first caller to find the
+        token expired re-authenticates, and the others reuse its token.
         """
-        if not self.token or not self.token_expiry or self.token_expiry < datetime.utcnow():
-            self._authenticate()
+        if self.token and time.monotonic() < self.token_deadline:
+            return
+
+        with self._auth_lock:
+            if not self.token or time.monotonic() >= self.token_deadline:
+                self._authenticate()
 
     def _authenticate(self) -> None:
         """
         Authenticate with the API and obtain JWT token.
 
-        Token is valid for 24 hours and automatically refreshed 1 hour before expiry.
+        The token is refreshed TOKEN_REFRESH_MARGIN_SECONDS before the expiry
+        in its exp claim, so the client follows whatever lifetime the API issues.
 
         Raises:
             requests.HTTPError: If authentication fails
         """
         try:
-            response = requests.post(
-                f'{self.base_url}/token',
+            response = self.session.post(
+                self._token_url,
                 data={
                     'username': 'api',
                     'password': self.api_key,
-                },
-                headers={
-                    'Content-Type': 'application/x-www-form-urlencoded',
                 }
             )
             response.raise_for_status()
 
             data = response.json()
             self.token = data['access_token']
+            self.session.headers['Authorization'] = f'Bearer {self.token}'
 
-            # Token is valid for 24 hours, refresh 1 hour before expiry
-            self.token_expiry = datetime.utcnow() + timedelta(hours=23)
+            expiry = _token_expiry(self.token)
+            lifetime = expiry - time.time() if expiry else DEFAULT_TOKEN_LIFETIME_SECONDS
+            self.token_deadline = time.monotonic() + lifetime - min(TOKEN_REFRESH_MARGIN_SECONDS, lifetime / 2)
 
-            print('Successfully authenticated with Zapier Triggers API')
+            logger.info('Successfully authenticated with Zapier Triggers API')
 
         except requests.HTTPError as e:
-            error_msg = f'Authentication failed: {e.response.status_code} {e.response.reason}'
-            print(error_msg)
+            logger.error('Authentication failed: %s %s', e.response.status_code, e.response.reason)
             if e.response.text:
-                print(f'Error details: {e.response.text}')
+                logger.error('Error details: %s', e.response.text)
+            raise
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        authenticated: bool = True,
+        **kwargs: Any
+    ) -> Any:
+        """
+        Send a request to the API and return the decoded JSON response.
+
+        Authenticated requests that are rejected with 401 (e.g. the token was
+        revoked server-side) re-authenticate once and are retried.
+
+        Args:
+            method: HTTP method
+            url: Endpoint URL
+            authenticated: Whether the endpoint requires a bearer token
+            **kwargs: Passed through to requests; a json= body is encoded
+                with orjson
+
+        Raises:
+            requests.HTTPError: If the API returns an error status
+        """
+        if 'json' in kwargs:
+            kwargs['data'] = orjson.dumps(kwargs.pop('json'))
+            kwargs['headers'] = _JSON_HEADERS
+
+        if authenticated:
+            self._ensure_authenticated()
+            sent_token = self.token
+
+        response = self.session.request(method, url, **kwargs)
+
+        if response.status_code == 401 and authenticated:
+            with self._auth_lock:
+                # Another thread may already have replaced the rejected token
+                if self.token == sent_token:
+                    self._authenticate()
+            response = self.session.request(method, url, **kwargs)
+
+        try:
+            response.raise_for_status()
+        except requests.HTTPError:
+            logger.error('%s %s failed: %s %s', method, url, response.status_code, response.reason)
+            if response.text:
+                logger.error('Error details: %s', response.text)
             raise
 
+        return orjson.loads(response.content)
+
     def create_event(
         self,
         type: str,
@@ -154,36 +346,21 @@ class ZapierTriggersClient:
             )
             print(f"Event created: {event['id']}")
         """
-        self._ensure_authenticated()
+        return self._request('POST', self._events_url, json={
+            'type': type,
+            'source': source,
+            'payload': payload,
+        })
 
-        try:
-            response = requests.post(
-                f'{self.base_url}/events',
-                json={
-                    'type': type,
-                    'source': source,
-                    'payload': payload,
-                },
-                headers={
-                    'Authorization': f'Bearer {self.token}',
-                    'Content-Type': 'application/json',
-                }
-            )
-            response.raise_for_status()
-
-            return response.json()
-
-        except requests.HTTPError as e:
-            error_msg = f'Event creation failed: {e.response.status_code} - {e.response.text}'
-            print(error_msg)
-            raise
-
-    def get_inbox(self) -> List[Dict[str, Any]]:
+    def get_inbox(self, limit: int = 100) -> List[Dict[str, Any]]:
         """
-        Retrieve all pending events from the inbox.
+        Retrieve pending events from the inbox.
+
+        Args:
+            limit: Maximum number of events to return (1-100, default: 100)
 
         Returns:
-            List of pending events (max 100), sorted by creation time (newest first)
+            List of pending events, sorted by creation time (newest first)
 
         Raises:
             requests.HTTPError: If retrieval fails
@@ -194,23 +371,7 @@ class ZapierTriggersClient:
             for event in events:
                 print(f"  - {event['id']}: {event['type']}")
         """
-        self._ensure_authenticated()
-
-        try:
-            response = requests.get(
-                f'{self.base_url}/inbox',
-                headers={
-                    'Authorization': f'Bearer {self.token}',
-                }
-            )
-            response.raise_for_status()
-
-            return response.json()
-
-        except requests.HTTPError as e:
-            error_msg = f'Inbox retrieval failed: {e.response.status_code} {e.response.reason}'
-            print(error_msg)
-            raise
+        return self._request('GET', self._inbox_url, params={'limit': limit})
 
     def acknowledge_event(self, event_id: str) -> Dict[str, Any]:
         """
@@ -232,41 +393,79 @@ class ZapierTriggersClient:
             result = client.acknowledge_event('550e8400-e29b-41d4-a716-446655440000')
             print(f"Event acknowledged: {result['status']}")  # 'delivered'
         """
-        self._ensure_authenticated()
+        return self._request('POST', f'{self._inbox_url}/{event_id}/ack')
 
-        try:
-            response = requests.post(
-                f'{self.base_url}/inbox/{event_id}/ack',
-                headers={
-                    'Authorization': f'Bearer {self.token}',
-                }
-            )
-            response.raise_for_status()
+    def acknowledge_events(self, event_ids: List[str]) -> Dict[str, List[str]]:
+        """
+        Acknowledge several processed events at once.
 
-            return response.json()
+        Sends one POST /inbox/ack request per 100 events instead of one request
+        per event. Falls back to acknowledging events one at a time if the API
+        does not have the batch endpoint.
 
-        except requests.HTTPError as e:
-            if e.response.status_code == 404:
-                print(f'Event not found: {event_id}')
-            else:
-                print(f'Acknowledgment failed: {e.response.status_code} {e.response.reason}')
-            raise
+        Args:
+            event_ids: Event IDs to acknowledge
+
+        Returns:
+            Dict with 'acknowledged' and 'failed' lists of event IDs; events
+            that were not found are reported as failed
+
+        Raises:
+            requests.HTTPError: If a batch request fails
+
+        Example:
+            result = client.acknowledge_events(['event-1', 'event-2'])
+            print(f"Acknowledged {len(result['acknowledged'])} events")
+        """
+        acknowledged: List[str] = []
+        failed: List[str] = []
+
+        for start in range(0, len(event_ids), ACK_BATCH_SIZE):
+            batch = event_ids[start:start + ACK_BATCH_SIZE]
+            try:
+                result = self._request('POST', self._batch_ack_url, json={
+                    'acks': [{'id': event_id} for event_id in batch]
+                })
+                acknowledged.extend(result['acknowledged'])
+                failed.extend(result['failed'])
+            except requests.HTTPError as e:
+                if e.response.status_code not in (404, 405):
+                    raise
+                # Older API without the batch endpoint
+                for event_id in batch:
+                    try:
+                        self.acknowledge_event(event_id)
+                        acknowledged.append(event_id)
+                    except requests.HTTPError:
+                        failed.append(event_id)
+
+        return {'acknowledged': acknowledged, 'failed': failed}
 
     def process_inbox(
         self,
-        callback: Callable[[Dict[str, Any]], None]
-    ) -> List[Dict[str, Any]]:
+        callback: Callable[[Dict[str, Any]], None],
+        max_workers: int = 10,
+        limit: int = 100
+    ) -> List[ProcessResult]:
         """
         Process all pending events with a callback function.
 
         Retrieves all pending events and processes each one with the provided callback.
-        Automatically acknowledges events after successful processing.
+        Automatically acknowledges successfully processed events, in one batch
+        request once all callbacks have finished.
+
+        Events are processed concurrently on up to max_workers threads sharing
+        the pooled session, so the callback must be thread-safe. Pass
+        max_workers=1 to process events one at a time.
 
         Args:
             callback: Function to process each event. Should raise exception on failure.
+            max_workers: Maximum number of events processed at once (default: 10)
+            limit: Maximum number of pending events to fetch (1-100, default: 100)
 
         Returns:
-            List of processing results with event_id and status
+            List of ProcessResult tuples, in inbox order. Results used to be
+            dicts; read result.status instead of result['status'].
 
         Example:
             def process_event(event):
@@ -275,38 +474,58 @@ class ZapierTriggersClient:
                 # Raise exception if processing fails
 
             results = client.process_inbox(process_event)
-            successful = len([r for r in results if r['status'] == 'success'])
+            successful = sum(1 for r in results if r.status == 'success')
             print(f"Successfully processed {successful} events")
         """
-        events = self.get_inbox()
-        print(f'Processing {len(events)} pending events...')
+        events = self.get_inbox(limit)
+        logger.info('Processing %d pending events...', len(events))
 
-        results = []
+        if not events:
+            return []
 
-        for event in events:
-            try:
-                # Process event with callback
-                callback(event)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(lambda event: self._process_one(event, callback), events))
 
-                # Acknowledge successful processing
-                self.acknowledge_event(event['id'])
+        # Acknowledge successful processing
+        processed_ids = [result.event_id for result in results if result.status == 'success']
+        if not processed_ids:
+            return results
 
-                results.append({
-                    'event_id': event['id'],
-                    'status': 'success'
-                })
-                print(f"✓ Processed and acknowledged event {event['id']}")
-
-            except Exception as e:
-                results.append({
-                    'event_id': event['id'],
-                    'status': 'failed',
-                    'error': str(e)
-                })
-                print(f"✗ Failed to process event {event['id']}: {e}")
+        try:
+            not_acknowledged = set(self.acknowledge_events(processed_ids)['failed'])
+            error = 'Acknowledgment failed'
+        except requests.RequestException as e:
+            not_acknowledged = set(processed_ids)
+            error = f'Acknowledgment failed: {e}'
+
+        for index, result in enumerate(results):
+            if result.status != 'success':
+                continue
+            if result.event_id in not_acknowledged:
+                results[index] = result._replace(status='failed', error=error)
+                logger.warning('Failed to acknowledge event %s', result.event_id)
+            else:
+                logger.debug('Processed and acknowledged event %s', result.event_id)
 
         return results
 
+    def _process_one(
+        self,
+        event: Dict[str, Any],
+        callback: Callable[[Dict[str, Any]], None]
+    ) -> ProcessResult:
+        """Run the callback for one event."""
+        event_id = event['id']
+        try:
+            # Process event with callback
+            callback(event)
+
+            return ProcessResult(event_id, 'success')
+
+        except Exception as e:
+            logger.warning('Failed to process event %s: %s', event_id, e)
+            return ProcessResult(event_id, 'failed', str(e))
+
     def health_check(self) -> Dict[str, Any]:
         """
         Check API health status.
@@ -318,13 +537,7 @@ class ZapierTriggersClient:
             health = client.health_check()
             print(f"API status: {health['status']}")
         """
-        try:
-            response = requests.get(f'{self.base_url}/health')
-            response.raise_for_status()
-            return response.json()
-        except requests.HTTPError as e:
-            print(f'Health check failed: {e.response.status_code} {e.response.reason}')
-            raise
+        return self._request('GET', self._health_url, authenticated=False)
 
 
 def main():
@@ -338,6 +551,8 @@ def main():
     - Processing events with custom logic
     - Error handling
     """
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
     # Initialize client with API key from environment variable
     api_key = os.getenv('ZAPIER_API_KEY')
 
@@ -363,7 +578,7 @@ def main():
                 'user_id': '12345',
                 'email': 'john.doe@example.com',
                 'name': 'John Doe',
-                'created_at': datetime.utcnow().isoformat(),
+                'created_at': datetime.now(timezone.utc).isoformat(),
                 'metadata': {
                     'signup_source': 'web',
                     'plan': 'premium',
@@ -405,21 +620,22 @@ def main():
 
         # 5. Display results
         print('\n5. Processing complete!')
-        successful = len([r for r in results if r['status'] == 'success'])
-        failed = len([r for r in results if r['status'] == 'failed'])
+        counts = Counter(r.status for r in results)
 
-        print(f'  ✓ Successful: {successful}')
-        print(f'  ✗ Failed: {failed}')
+        print(f"  ✓ Successful: {counts['success']}")
+        print(f"  ✗ Failed: {counts['failed']}")
 
-        if failed > 0:
+        if counts['failed'] > 0:
             print('\nFailed events:')
             for result in results:
-                if result['status'] == 'failed':
-                    print(f"  - {result['event_id']}: {result['error']}")
+                if result.status == 'failed':
+                    print(f"  - {result.event_id}: {result.error}")
 
     except Exception as e:
         print(f'\n❌ Error: {e}')
         exit(1)
+    finally:
+        client.close()
 
 
 if __name__ == '__main__':
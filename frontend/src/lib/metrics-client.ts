@@ -52,12 +52,8 @@ export async function fetchErrors(token: string): Promise<ErrorMetrics> {
 }
 
 export async function fetchAllMetrics(token: string): Promise<DashboardMetrics> {
-  const [summary, latency, throughput, errors] = await Promise.all([
-    fetchSummary(token),
-    fetchLatency(token),
-    fetchThroughput(token),
-    fetchErrors(token),
-  ])
+  // Single request: the backend computes all four metric groups from one scan
+  const { summary, latency, throughput, errors } = await fetchWithAuth('/metrics/all', { token })
 
   return {
     summary,
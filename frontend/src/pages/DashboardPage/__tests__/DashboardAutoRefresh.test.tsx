@@ -14,7 +14,13 @@ import { render, screen, act } from '@testing-library/react'
 import userEvent from '@testing-library/user-event'
 import { BrowserRouter } from 'react-router-dom'
 import DashboardPage from '../index'
-import type { EventSummary, LatencyMetrics, ThroughputMetrics } from '../../../lib/metrics-types'
+import type {
+  EventSummary,
+  LatencyMetrics,
+  ThroughputMetrics,
+  ErrorMetrics,
+  DashboardMetrics,
+} from '../../../lib/metrics-types'
 
 // Mock the auth hook
 vi.mock('../../../lib/useAuth', () => ({
@@ -27,9 +33,7 @@ vi.mock('../../../lib/useAuth', () => ({
 
 // Mock the metrics client
 vi.mock('../../../lib/metrics-client', () => ({
-  fetchSummary: vi.fn(),
-  fetchLatency: vi.fn(),
-  fetchThroughput: vi.fn(),
+  fetchAllMetrics: vi.fn(),
 }))
 
 // Import mocked functions for manipulation
@@ -61,6 +65,23 @@ const createMockThroughput = (overrides?: Partial<ThroughputMetrics>): Throughpu
   ...overrides,
 })
 
+const createMockErrors = (overrides?: Partial<ErrorMetrics>): ErrorMetrics => ({
+  total_errors: 10,
+  error_rate: 11.11,
+  failed_deliveries: 10,
+  pending_retries: 10,
+  ...overrides,
+})
+
+const createMockMetrics = (overrides?: Partial<DashboardMetrics>): DashboardMetrics => ({
+  summary: createMockSummary(),
+  latency: createMockLatency(),
+  throughput: createMockThroughput(),
+  errors: createMockErrors(),
+  last_updated: new Date().toISOString(),
+  ...overrides,
+})
+
 // Helper to render dashboard with router context
 const renderDashboard = () => {
   return render(
@@ -77,9 +98,7 @@ describe('Dashboard Auto-Refresh E2E Tests', () => {
     vi.useFakeTimers({ shouldAdvanceTime: true })
 
     // Set default mock implementations
-    vi.mocked(metricsClient.fetchSummary).mockResolvedValue(createMockSummary())
-    vi.mocked(metricsClient.fetchLatency).mockResolvedValue(createMockLatency())
-    vi.mocked(metricsClient.fetchThroughput).mockResolvedValue(createMockThroughput())
+    vi.mocked(metricsClient.fetchAllMetrics).mockResolvedValue(createMockMetrics())
   })
 
   afterEach(() => {
@@ -97,10 +116,8 @@ describe('Dashboard Auto-Refresh E2E Tests', () => {
       await vi.advanceTimersByTimeAsync(0)
 
       // Verify data was fetched
-      expect(metricsClient.fetchSummary).toHaveBeenCalledWith('mock-jwt-token')
-      expect(metricsClient.fetchLatency).toHaveBeenCalledWith('mock-jwt-token')
-      expect(metricsClient.fetchThroughput).toHaveBeenCalledWith('mock-jwt-token')
-      expect(metricsClient.fetchSummary).toHaveBeenCalledTimes(1)
+      expect(metricsClient.fetchAllMetrics).toHaveBeenCalledWith('mock-jwt-token')
+      expect(metricsClient.fetchAllMetrics).toHaveBeenCalledTimes(1)
     })
 
     it('should display initial metrics data', async () => {
@@ -136,31 +153,27 @@ describe('Dashboard Auto-Refresh E2E Tests', () => {
       })
 
       await vi.advanceTimersByTimeAsync(0)
-      expect(metricsClient.fetchSummary).toHaveBeenCalledTimes(1)
+      expect(metricsClient.fetchAllMetrics).toHaveBeenCalledTimes(1)
 
       // Advance time by 10 seconds
       await act(async () => {
         await vi.advanceTimersByTimeAsync(10000)
       })
 
-      expect(metricsClient.fetchSummary).toHaveBeenCalledTimes(2)
-      expect(metricsClient.fetchLatency).toHaveBeenCalledTimes(2)
-      expect(metricsClient.fetchThroughput).toHaveBeenCalledTimes(2)
+      expect(metricsClient.fetchAllMetrics).toHaveBeenCalledTimes(2)
 
       // Advance another 10 seconds
       await act(async () => {
         await vi.advanceTimersByTimeAsync(10000)
       })
 
-      expect(metricsClient.fetchSummary).toHaveBeenCalledTimes(3)
-      expect(metricsClient.fetchLatency).toHaveBeenCalledTimes(3)
-      expect(metricsClient.fetchThroughput).toHaveBeenCalledTimes(3)
+      expect(metricsClient.fetchAllMetrics).toHaveBeenCalledTimes(3)
     })
 
     it('should display updated data after auto-refresh', async () => {
       // Setup initial data
-      vi.mocked(metricsClient.fetchSummary).mockResolvedValue(
-        createMockSummary({ total: 100 })
+      vi.mocked(metricsClient.fetchAllMetrics).mockResolvedValue(
+        createMockMetrics({ summary: createMockSummary({ total: 100 }) })
       )
 
       await act(async () => {
@@ -171,8 +184,8 @@ describe('Dashboard Auto-Refresh E2E Tests', () => {
       expect(screen.getAllByText('100').length).toBeGreaterThan(0)
 
       // Change mock data for next refresh
-      vi.mocked(metricsClient.fetchSummary).mockResolvedValue(
-        createMockSummary({ total: 150 })
+      vi.mocked(metricsClient.fetchAllMetrics).mockResolvedValue(
+        createMockMetrics({ summary: createMockSummary({ total: 150 }) })
       )
 
       // Advance time to trigger refresh
@@ -203,7 +216,7 @@ describe('Dashboard Auto-Refresh E2E Tests', () => {
       })
 
       await vi.advanceTimersByTimeAsync(0)
-      expect(metricsClient.fetchSummary).toHaveBeenCalledTimes(1)
+      expect(metricsClient.fetchAllMetrics).toHaveBeenCalledTimes(1)
 
       // Find and click pause button
       const pauseButton = screen.getByRole('button', { name: /pause/i })
@@ -215,7 +228,7 @@ describe('Dashboard Auto-Refresh E2E Tests', () => {
       })
 
       // Verify no additional calls were made
-      expect(metricsClient.fetchSummary).toHaveBeenCalledTimes(1)
+      expect(metricsClient.fetchAllMetrics).toHaveBeenCalledTimes(1)
     })
 
     it('should resume auto-refresh when resumed', async () => {
@@ -226,7 +239,7 @@ describe('Dashboard Auto-Refresh E2E Tests', () => {
       })
 
       await vi.advanceTimersByTimeAsync(0)
-      const initialCalls = metricsClient.fetchSummary.mock.calls.length
+      const initialCalls = metricsClient.fetchAllMetrics.mock.calls.length
 
       // Pause
       const pauseButton = screen.getByRole('button', { name: /pause/i })
@@ -240,7 +253,7 @@ describe('Dashboard Auto-Refresh E2E Tests', () => {
         await user.click(resumeButton)
       })
 
-      const callsAfterResume = metricsClient.fetchSummary.mock.calls.length
+      const callsAfterResume = metricsClient.fetchAllMetrics.mock.calls.length
 
       // Advance time - should trigger refresh
       await act(async () => {
@@ -248,7 +261,7 @@ describe('Dashboard Auto-Refresh E2E Tests', () => {
       })
 
       // After advancing time, we should have at least one more call
-      expect(metricsClient.fetchSummary.mock.calls.length).toBeGreaterThan(callsAfterResume)
+      expect(metricsClient.fetchAllMetrics.mock.calls.length).toBeGreaterThan(callsAfterResume)
     })
 
     it('should hide auto-refresh interval text when paused', async () => {
@@ -302,7 +315,7 @@ describe('Dashboard Auto-Refresh E2E Tests', () => {
       })
 
       await vi.advanceTimersByTimeAsync(0)
-      expect(metricsClient.fetchSummary).toHaveBeenCalledTimes(1)
+      expect(metricsClient.fetchAllMetrics).toHaveBeenCalledTimes(1)
 
       // Click manual refresh
       const refreshButton = screen.getByRole('button', { name: /refresh/i })
@@ -312,9 +325,7 @@ describe('Dashboard Auto-Refresh E2E Tests', () => {
 
       await vi.advanceTimersByTimeAsync(0)
 
-      expect(metricsClient.fetchSummary).toHaveBeenCalledTimes(2)
-      expect(metricsClient.fetchLatency).toHaveBeenCalledTimes(2)
-      expect(metricsClient.fetchThroughput).toHaveBeenCalledTimes(2)
+      expect(metricsClient.fetchAllMetrics).toHaveBeenCalledTimes(2)
     })
 
     it('should work when auto-refresh is paused', async () => {
@@ -325,7 +336,7 @@ describe('Dashboard Auto-Refresh E2E Tests', () => {
       })
 
       await vi.advanceTimersByTimeAsync(0)
-      expect(metricsClient.fetchSummary).toHaveBeenCalledTimes(1)
+      expect(metricsClient.fetchAllMetrics).toHaveBeenCalledTimes(1)
 
       // Pause auto-refresh
       const pauseButton = screen.getByRole('button', { name: /pause/i })
@@ -339,13 +350,13 @@ describe('Dashboard Auto-Refresh E2E Tests', () => {
 
       await vi.advanceTimersByTimeAsync(0)
 
-      expect(metricsClient.fetchSummary).toHaveBeenCalledTimes(2)
+      expect(metricsClient.fetchAllMetrics).toHaveBeenCalledTimes(2)
     })
   })
 
   describe('Error Handling', () => {
     it('should display error message when metrics fetch fails', async () => {
-      vi.mocked(metricsClient.fetchSummary).mockRejectedValue(
+      vi.mocked(metricsClient.fetchAllMetrics).mockRejectedValue(
         new Error('API request failed: 500 Internal Server Error')
       )
 
@@ -361,12 +372,12 @@ describe('Dashboard Auto-Refresh E2E Tests', () => {
 
     it('should continue auto-refresh after error', async () => {
       // First call fails
-      vi.mocked(metricsClient.fetchSummary).mockRejectedValueOnce(
+      vi.mocked(metricsClient.fetchAllMetrics).mockRejectedValueOnce(
         new Error('Network error')
       )
 
       // Subsequent calls succeed
-      vi.mocked(metricsClient.fetchSummary).mockResolvedValue(createMockSummary())
+      vi.mocked(metricsClient.fetchAllMetrics).mockResolvedValue(createMockMetrics())
 
       await act(async () => {
         renderDashboard()
@@ -404,7 +415,7 @@ describe('Dashboard Auto-Refresh E2E Tests', () => {
       })
 
       // Wait for refresh to complete
-      expect(metricsClient.fetchSummary).toHaveBeenCalledTimes(2)
+      expect(metricsClient.fetchAllMetrics).toHaveBeenCalledTimes(2)
 
       // Timestamp should have updated
       const secondTimestamp = screen.getByText(/Updated/i).textContent
@@ -422,7 +433,7 @@ describe('Dashboard Auto-Refresh E2E Tests', () => {
       })
 
       await vi.advanceTimersByTimeAsync(0)
-      expect(metricsClient.fetchSummary).toHaveBeenCalledTimes(1)
+      expect(metricsClient.fetchAllMetrics).toHaveBeenCalledTimes(1)
 
       // Cycle through 5 refreshes
       for (let i = 2; i <= 6; i++) {
@@ -430,13 +441,11 @@ describe('Dashboard Auto-Refresh E2E Tests', () => {
           await vi.advanceTimersByTimeAsync(10000)
         })
 
-        expect(metricsClient.fetchSummary).toHaveBeenCalledTimes(i)
+        expect(metricsClient.fetchAllMetrics).toHaveBeenCalledTimes(i)
       }
 
       // Verify final call count
-      expect(metricsClient.fetchSummary).toHaveBeenCalledTimes(6)
-      expect(metricsClient.fetchLatency).toHaveBeenCalledTimes(6)
-      expect(metricsClient.fetchThroughput).toHaveBeenCalledTimes(6)
+      expect(metricsClient.fetchAllMetrics).toHaveBeenCalledTimes(6)
     })
 
     it('should maintain correct refresh interval across multiple cycles', async () => {
@@ -445,56 +454,35 @@ describe('Dashboard Auto-Refresh E2E Tests', () => {
       })
 
       await vi.advanceTimersByTimeAsync(0)
-      expect(metricsClient.fetchSummary).toHaveBeenCalledTimes(1)
+      expect(metricsClient.fetchAllMetrics).toHaveBeenCalledTimes(1)
 
       // Advance time by less than interval - should not refresh
       await act(async () => {
         await vi.advanceTimersByTimeAsync(9000) // 9 seconds
       })
 
-      expect(metricsClient.fetchSummary).toHaveBeenCalledTimes(1)
+      expect(metricsClient.fetchAllMetrics).toHaveBeenCalledTimes(1)
 
       // Advance remaining time - should refresh
       await act(async () => {
         await vi.advanceTimersByTimeAsync(1000) // 1 more second = 10 total
       })
 
-      expect(metricsClient.fetchSummary).toHaveBeenCalledTimes(2)
+      expect(metricsClient.fetchAllMetrics).toHaveBeenCalledTimes(2)
     })
   })
 
   describe('Data Consistency', () => {
-    it('should fetch all three metrics endpoints in parallel', async () => {
-      // Use mock implementations that track call order
-      const callOrder: string[] = []
-
-      vi.mocked(metricsClient.fetchSummary).mockImplementation(async () => {
-        callOrder.push('summary')
-        return createMockSummary()
-      })
-
-      vi.mocked(metricsClient.fetchLatency).mockImplementation(async () => {
-        callOrder.push('latency')
-        return createMockLatency()
-      })
-
-      vi.mocked(metricsClient.fetchThroughput).mockImplementation(async () => {
-        callOrder.push('throughput')
-        return createMockThroughput()
-      })
-
+    it('should fetch all metrics in a single request', async () => {
       await act(async () => {
         renderDashboard()
       })
 
       await vi.advanceTimersByTimeAsync(0)
 
-      expect(callOrder.length).toBe(3)
-
-      // All three should have been called (order doesn't matter for parallel calls)
-      expect(callOrder).toContain('summary')
-      expect(callOrder).toContain('latency')
-      expect(callOrder).toContain('throughput')
+      // Summary, latency and throughput all come from one /metrics/all call
+      expect(metricsClient.fetchAllMetrics).toHaveBeenCalledTimes(1)
+      expect(screen.getAllByText('100').length).toBeGreaterThan(0)
     })
 
     it('should maintain authentication token across refreshes', async () => {
@@ -504,7 +492,7 @@ describe('Dashboard Auto-Refresh E2E Tests', () => {
 
       // Initial load
       await vi.advanceTimersByTimeAsync(0)
-      expect(metricsClient.fetchSummary).toHaveBeenCalledWith('mock-jwt-token')
+      expect(metricsClient.fetchAllMetrics).toHaveBeenCalledWith('mock-jwt-token')
 
       // Trigger refresh
       await act(async () => {
@@ -512,8 +500,8 @@ describe('Dashboard Auto-Refresh E2E Tests', () => {
       })
 
       // Should still use same token
-      expect(metricsClient.fetchSummary).toHaveBeenCalledWith('mock-jwt-token')
-      expect(metricsClient.fetchSummary).toHaveBeenCalledTimes(2)
+      expect(metricsClient.fetchAllMetrics).toHaveBeenCalledWith('mock-jwt-token')
+      expect(metricsClient.fetchAllMetrics).toHaveBeenCalledTimes(2)
     })
   })
 })
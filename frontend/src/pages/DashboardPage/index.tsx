@@ -19,7 +19,7 @@ import { LifecycleFlow } from '../../components/dashboard/LifecycleFlow'
 import { MetricsCharts } from '../../components/dashboard/MetricsCharts'
 import { SendEventSheet } from '../../components/send-event/SendEventSheet'
 import { useAuth } from '../../lib/useAuth'
-import { fetchSummary, fetchLatency, fetchThroughput } from '../../lib/metrics-client'
+import { fetchAllMetrics } from '../../lib/metrics-client'
 import type { EventSummary, LatencyMetrics, ThroughputMetrics } from '../../lib/metrics-types'
 
 const REFRESH_INTERVAL = 10000 // 10 seconds
@@ -35,7 +35,7 @@ export default function DashboardPage() {
   const [isPaused, setIsPaused] = useState(false)
   const [lastUpdated, setLastUpdated] = useState<Date | null>(null)
 
-  // Fetch all metrics data in parallel
+  // Fetch all metrics data in a single request
   const loadMetrics = useCallback(async () => {
     if (!token) return
 
@@ -43,16 +43,11 @@ export default function DashboardPage() {
       setMetricsLoading(true)
       setMetricsError(null)
 
-      // Fetch all metrics in parallel
-      const [summaryData, latencyData, throughputData] = await Promise.all([
-        fetchSummary(token),
-        fetchLatency(token),
-        fetchThroughput(token),
-      ])
+      const metrics = await fetchAllMetrics(token)
 
-      setSummary(summaryData)
-      setLatency(latencyData)
-      setThroughput(throughputData)
+      setSummary(metrics.summary)
+      setLatency(metrics.latency)
+      setThroughput(metrics.throughput)
       setLastUpdated(new Date())
     } catch (err) {
       setMetricsError(err instanceof Error ? err.message : 'Failed to load metrics')